@@ -0,0 +1,198 @@
+from collections import Counter
+from datetime import date, datetime
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple, Union
+
+from homework import InfoMessage, read_package
+
+METRICS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+PERIODS: Dict[str, Callable[[date], str]] = {
+    'day': lambda day: day.isoformat(),
+    'week': lambda day: '{}-W{:02d}'.format(*day.isocalendar()[:2]),
+    'month': lambda day: f'{day.year}-{day.month:02d}',
+}
+
+Key = Tuple[Hashable, str, str, str]
+
+
+class Summary:
+    """Сумма, среднее, минимум и максимум показателей одной корзины.
+
+    Состояние корзины занимает O(1), добавление и удаление тренировки
+    тоже. Минимум и максимум при удалении не отзываются: после него
+    они остаются лишь границами оставшихся значений. С exact=True
+    корзина хранит мультимножество значений каждого показателя и
+    после удаления пересчитывает точные минимум и максимум. Значения
+    с плавающей точкой почти все различны, так что память такой
+    корзины растёт линейно с числом тренировок — и так в каждом из
+    трёх периодов.
+    """
+
+    __slots__ = ('count', 'sums', 'values', '_extremes')
+
+    def __init__(self, exact: bool = False) -> None:
+        self.count = 0
+        self.sums = dict.fromkeys(METRICS, 0.0)
+        self.values: Optional[Dict[str, Counter]] = (
+            {metric: Counter() for metric in METRICS} if exact else None)
+        self._extremes: Dict[str, Optional[Tuple[float, float]]] = (
+            dict.fromkeys(METRICS))
+
+    @property
+    def exact(self) -> bool:
+        return self.values is not None
+
+    def add(self, info: InfoMessage) -> None:
+        """Учесть тренировку."""
+        self.count += 1
+        for metric in METRICS:
+            value = getattr(info, metric)
+            self.sums[metric] += value
+            if self.values is not None:
+                self.values[metric][value] += 1
+            extremes = self._extremes[metric]
+            if extremes is not None:
+                self._extremes[metric] = (min(extremes[0], value),
+                                          max(extremes[1], value))
+            elif self.count == 1:
+                self._extremes[metric] = (value, value)
+
+    def remove(self, info: InfoMessage) -> None:
+        """Исключить ранее учтённую тренировку."""
+        if self.values is None:
+            if self.count < 1:
+                raise ValueError('Тренировка не была учтена.')
+        elif any(self.values[metric][getattr(info, metric)] < 1
+                 for metric in METRICS):
+            raise ValueError('Тренировка не была учтена.')
+        self.count -= 1
+        for metric in METRICS:
+            value = getattr(info, metric)
+            self.sums[metric] -= value
+            if self.values is None:
+                continue
+            counts = self.values[metric]
+            counts[value] -= 1
+            if counts[value] == 0:
+                del counts[value]
+                extremes = self._extremes[metric]
+                if extremes is not None and value in extremes:
+                    self._extremes[metric] = None
+
+    def merge(self, other: 'Summary') -> None:
+        """Добавить частичный итог другого обработчика."""
+        if other.exact != self.exact:
+            raise ValueError('Нельзя объединить точные и приближённые '
+                             'минимум и максимум.')
+        self.count += other.count
+        for metric in METRICS:
+            self.sums[metric] += other.sums[metric]
+            if self.values is not None:
+                self.values[metric].update(other.values[metric])
+                self._extremes[metric] = None
+                continue
+            extremes = self._extremes[metric]
+            others = other._extremes[metric]
+            if extremes is None or others is None:
+                self._extremes[metric] = extremes or others
+            else:
+                self._extremes[metric] = (min(extremes[0], others[0]),
+                                          max(extremes[1], others[1]))
+
+    def mean(self, metric: str) -> float:
+        return self.sums[metric] / self.count
+
+    def min(self, metric: str) -> float:
+        return self._get_extremes(metric)[0]
+
+    def max(self, metric: str) -> float:
+        return self._get_extremes(metric)[1]
+
+    def as_dict(self) -> dict:
+        """Получить все показатели корзины словарём."""
+        result: dict = {'count': self.count}
+        for metric in METRICS:
+            result[metric] = {'sum': self.sums[metric],
+                              'mean': self.mean(metric),
+                              'min': self.min(metric),
+                              'max': self.max(metric)}
+        return result
+
+    def _get_extremes(self, metric: str) -> Tuple[float, float]:
+        if self._extremes[metric] is None:
+            values = self.values[metric]
+            self._extremes[metric] = (min(values), max(values))
+        return self._extremes[metric]
+
+
+class Aggregator:
+    """Нарастающие итоги по пользователю, типу тренировки и периоду.
+
+    Каждая тренировка попадает в корзины дня, ISO-недели и месяца.
+    Итоги разных обработчиков объединяются методом merge. exact
+    включает точные минимум и максимум после удаления тренировок
+    ценой памяти, растущей с числом тренировок (см. Summary).
+    """
+
+    def __init__(self, exact: bool = False) -> None:
+        self.exact = exact
+        self.buckets: Dict[Key, Summary] = {}
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def add(self, user: Hashable, day: Union[date, datetime],
+            info: InfoMessage) -> None:
+        """Учесть результат тренировки пользователя."""
+        for key in self.keys(user, day, info.training_type):
+            summary = self.buckets.get(key)
+            if summary is None:
+                summary = self.buckets[key] = Summary(self.exact)
+            summary.add(info)
+
+    def add_package(self, user: Hashable, day: Union[date, datetime],
+                    workout_type: str, data: list) -> Optional[InfoMessage]:
+        """Посчитать пакет от датчиков и учесть результат."""
+        training = read_package(workout_type, data)
+        if training is None:
+            return None
+        info = training.show_training_info()
+        self.add(user, day, info)
+        return info
+
+    def remove(self, user: Hashable, day: Union[date, datetime],
+               info: InfoMessage) -> None:
+        """Исключить удалённую тренировку из итогов."""
+        keys = list(self.keys(user, day, info.training_type))
+        if any(key not in self.buckets for key in keys):
+            raise ValueError('Тренировка не была учтена.')
+        for key in keys:
+            summary = self.buckets[key]
+            summary.remove(info)
+            if not summary.count:
+                del self.buckets[key]
+
+    def merge(self, other: 'Aggregator') -> None:
+        """Добавить итоги другого обработчика."""
+        for key, summary in other.buckets.items():
+            if key not in self.buckets:
+                self.buckets[key] = Summary(self.exact)
+            self.buckets[key].merge(summary)
+
+    def get(self, user: Hashable, training_type: str, period: str,
+            bucket: str) -> Optional[Summary]:
+        """Получить итоги корзины, например недели '2024-W05'."""
+        return self.buckets.get((user, training_type, period, bucket))
+
+    def items(self, user: Hashable) -> Iterator[Tuple[Key, Summary]]:
+        """Перебрать все корзины пользователя."""
+        return ((key, summary) for key, summary in self.buckets.items()
+                if key[0] == user)
+
+    @staticmethod
+    def keys(user: Hashable, day: Union[date, datetime],
+             training_type: str) -> Iterator[Key]:
+        """Получить ключи корзин, в которые попадает тренировка."""
+        if isinstance(day, datetime):
+            day = day.date()
+        return ((user, training_type, period, bucket(day))
+                for period, bucket in PERIODS.items())
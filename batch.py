@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import (Callable, Dict, Hashable, Iterable, Iterator, Sequence,
+                    TextIO, Tuple, Type, Union)
+
+import numpy as np
+
+from homework import InfoMessage, Profile, Training, get_profile, registry
+
+Columns = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def object_columns(cls: Type[Training], *columns: np.ndarray) -> Columns:
+    """Посчитать столбцы через объекты для типов без своего ядра."""
+    infos = [cls(*row).show_training_info() for row in zip(*columns)]
+    return (np.array([info.distance for info in infos], dtype=np.float64),
+            np.array([info.speed for info in infos], dtype=np.float64),
+            np.array([info.calories for info in infos], dtype=np.float64))
+
+
+def kernel_for(cls: Type[Training]) -> Callable[..., Columns]:
+    """Найти столбцовое ядро класса тренировки.
+
+    Ядро берётся из Training.kernel, то есть считает по тем же
+    формулам, что и методы объектов; типам без полного ядра
+    достаётся расчёт через объекты.
+    """
+    columns = cls.kernel.columns
+    if columns is None:
+        return partial(object_columns, cls)
+    return columns
+
+
+def compute_group(cls: Type[Training], *columns: np.ndarray) -> Columns:
+    """Посчитать столбцы группы пакетов одного класса его ядром.
+
+    Через эту функцию считают группы все пакетные пути; её же
+    оборачивает инструментирование как этап batch.
+    """
+    return kernel_for(cls)(*columns)
+
+
+@dataclass
+class BatchResult:
+    """Столбцы с результатами тренировок в исходном порядке пакетов."""
+    training_type: np.ndarray
+    duration: np.ndarray
+    distance: np.ndarray
+    speed: np.ndarray
+    calories: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.training_type)
+
+    def rows(self) -> Iterator[tuple]:
+        """Вернуть поля сообщений кортежами по одному на пакет."""
+        return zip(self.training_type.tolist(),
+                   self.duration.tolist(),
+                   self.distance.tolist(),
+                   self.speed.tolist(),
+                   self.calories.tolist())
+
+    def messages(self) -> Iterator[InfoMessage]:
+        """Вернуть информационные сообщения по одному на пакет."""
+        for row in self.rows():
+            yield InfoMessage(*row)
+
+    def write_messages(self, buffer: TextIO) -> None:
+        """Записать текст сообщений в буфер, не создавая InfoMessage."""
+        template = InfoMessage.message
+        buffer.writelines(template.format(*row) + '\n'
+                          for row in self.rows())
+
+
+def compute_columns(workout_type: str,
+                    data: np.ndarray,
+                    profile: Union[str, Profile, None] = None,
+                    ) -> Columns:
+    """Посчитать показатели для матрицы пакетов одного типа тренировки."""
+    if profile is None:
+        cls = registry.types.get(workout_type)
+    else:
+        cls = get_profile(profile).get(workout_type)
+    if cls is None:
+        raise ValueError(f'Неизвестный тип тренировки: {workout_type}')
+    return compute_group(cls, *np.asarray(data, dtype=np.float64).T)
+
+
+def fill_result(size: int,
+                groups: Dict[Hashable, Tuple[Type[Training], list, list]],
+                ) -> BatchResult:
+    """Посчитать группы пакетов одного класса и разложить по позициям."""
+    result = BatchResult(np.empty(size, dtype=object),
+                         np.empty(size),
+                         np.empty(size),
+                         np.empty(size),
+                         np.empty(size))
+    for cls, positions, rows in groups.values():
+        data = np.array(rows, dtype=np.float64)
+        distance, speed, calories = compute_group(cls, *data.T)
+        index = np.array(positions, dtype=np.intp)
+        result.training_type[index] = cls.__name__
+        result.duration[index] = data[:, 1]
+        result.distance[index] = distance
+        result.speed[index] = speed
+        result.calories[index] = calories
+    return result
+
+
+def compute_batch(packages: Iterable[Tuple[str, Sequence[float]]],
+                  profile: Union[str, Profile, None] = None,
+                  ) -> BatchResult:
+    """Посчитать показатели для пакетов, сгруппировав их по типу.
+
+    Пакеты с неизвестным кодом обрабатываются по политике реестра;
+    пропущенные пакеты в результат не попадают. profile — профиль
+    коэффициентов для всех пакетов.
+    """
+    profile = get_profile(profile)
+    types = registry.types
+    groups: dict = {}
+    size = 0
+    for workout_type, data in packages:
+        group = groups.get(workout_type)
+        if group is None:
+            if workout_type not in types:
+                registry.get(workout_type)
+                continue
+            cls = (types[workout_type] if profile is None
+                   else profile.get(workout_type))
+            group = groups[workout_type] = (cls, [], [])
+        group[1].append(size)
+        group[2].append(data)
+        size += 1
+    return fill_result(size, groups)
+
+
+def compute_profiles(packages: Iterable[Tuple[Union[str, Profile, None], str,
+                                              Sequence[float]]],
+                     ) -> BatchResult:
+    """Посчитать пакеты разных партнёров за один проход.
+
+    Пакет — (профиль, код, данные); профиль None означает
+    коэффициенты по умолчанию. Пакеты группируются по паре
+    (профиль, тип тренировки), и каждая группа считается одним
+    вызовом ядра.
+    """
+    types = registry.types
+    groups: dict = {}
+    size = 0
+    for profile, workout_type, data in packages:
+        key = (profile, workout_type)
+        group = groups.get(key)
+        if group is None:
+            if workout_type not in types:
+                registry.get(workout_type)
+                continue
+            cls = (types[workout_type] if profile is None
+                   else get_profile(profile).get(workout_type))
+            group = groups[key] = (cls, [], [])
+        group[1].append(size)
+        group[2].append(data)
+        size += 1
+    return fill_result(size, groups)
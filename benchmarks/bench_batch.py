@@ -0,0 +1,75 @@
+"""Сравнение пообъектного и пакетного расчёта показателей тренировок."""
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from batch import compute_batch, compute_columns
+from homework import read_package
+
+
+def make_packages(size: int, seed: int = 0,
+                  workout_types: tuple = ('SWM', 'RUN', 'WLK')) -> list:
+    """Сгенерировать случайные пакеты заданных типов тренировок."""
+    rnd = random.Random(seed)
+    packages = []
+    for _ in range(size):
+        action = rnd.randint(100, 20000)
+        duration = rnd.uniform(0.2, 3)
+        weight = rnd.uniform(40, 120)
+        workout_type = rnd.choice(workout_types)
+        if workout_type == 'SWM':
+            data = [action, duration, weight,
+                    rnd.randint(10, 50), rnd.randint(1, 80)]
+        elif workout_type == 'WLK':
+            data = [action, duration, weight, rnd.uniform(140, 210)]
+        else:
+            data = [action, duration, weight]
+        packages.append((workout_type, data))
+    return packages
+
+
+def timed(func, *args) -> float:
+    """Замерить время одного вызова функции в секундах."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def per_object(packages: list) -> None:
+    """Посчитать пакеты через объекты тренировок."""
+    for workout_type, data in packages:
+        read_package(workout_type, data).show_training_info()
+
+
+def columnar(groups: dict) -> None:
+    """Посчитать заранее сгруппированные по типам столбцы."""
+    for workout_type, data in groups.items():
+        compute_columns(workout_type, data)
+
+
+def main(size: int) -> None:
+    """Главная функция."""
+    packages = make_packages(size)
+    groups = {}
+    for workout_type, data in packages:
+        groups.setdefault(workout_type, []).append(data)
+    groups = {key: np.array(rows) for key, rows in groups.items()}
+
+    reference = timed(per_object, packages)
+    from_lists = timed(compute_batch, packages)
+    from_columns = timed(columnar, groups)
+    print(f'пакетов: {size}')
+    print(f'read_package + show_training_info: {reference:.3f} с')
+    print(f'compute_batch из списков: {from_lists:.3f} с '
+          f'(x{reference / from_lists:.1f})')
+    print(f'compute_columns из столбцов: {from_columns:.3f} с '
+          f'(x{reference / from_columns:.1f})')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
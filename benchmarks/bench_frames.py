@@ -0,0 +1,39 @@
+"""Разбор двоичных кадров: через списки и сразу в столбцы."""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_batch import make_packages
+from batch import compute_batch
+from frames import compute_frames, iter_frames, pack_frames
+from homework import read_package
+
+
+def main(size: int) -> None:
+    """Главная функция."""
+    buffer = pack_frames(make_packages(size))
+    print(f'кадров: {size}, буфер: {len(buffer) / 2**20:.1f} МБ')
+
+    start = time.perf_counter()
+    for workout_type, data in iter_frames(buffer):
+        read_package(workout_type, data).show_training_info()
+    per_object = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_batch(iter_frames(buffer))
+    lists = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_frames(buffer)
+    columns = time.perf_counter() - start
+
+    for name, seconds in (('iter_unpack + объекты', per_object),
+                          ('iter_unpack + compute_batch', lists),
+                          ('compute_frames', columns)):
+        print(f'{name}: {seconds:.3f} с, {seconds / size * 1e9:.0f} нс/кадр')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,39 @@
+"""Память на одну тренировку: объекты против таблицы столбцов."""
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_batch import make_packages
+from homework import read_package
+from table import TrainingTable
+
+
+def measure(build, size: int) -> float:
+    """Посчитать прирост памяти на один элемент после вызова build."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / size
+
+
+def main(size: int) -> None:
+    """Главная функция."""
+    packages = make_packages(size)
+    objects = measure(
+        lambda: [read_package(*package) for package in packages], size)
+    messages = measure(
+        lambda: [read_package(*package).show_training_info()
+                 for package in packages], size)
+    table = measure(lambda: TrainingTable(packages), size)
+    print(f'тренировок: {size}')
+    print(f'объекты Training: {objects:.1f} байт')
+    print(f'объекты InfoMessage: {messages:.1f} байт')
+    print(f'TrainingTable: {table:.1f} байт')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
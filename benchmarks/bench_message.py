@@ -0,0 +1,54 @@
+"""Скорость оформления текстовых сообщений о тренировках."""
+import io
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from batch import compute_batch
+from bench_batch import make_packages
+from homework import InfoMessage, read_package, write_messages
+
+
+def timed(func, *args) -> float:
+    """Замерить время одного вызова функции в секундах."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def format_by_dict(messages: list) -> None:
+    """Оформить сообщения через asdict(), как прежний get_message."""
+    for info in messages:
+        info.message.format(*asdict(info).values())
+
+
+def get_message(messages: list) -> None:
+    """Оформить сообщения методом get_message."""
+    for info in messages:
+        info.get_message()
+
+
+def main(size: int) -> None:
+    """Главная функция."""
+    packages = make_packages(size)
+    messages = [read_package(*package).show_training_info()
+                for package in packages]
+    result = compute_batch(packages)
+    reference = timed(format_by_dict, messages)
+    print(f'сообщений: {size}')
+    print(f'format через asdict(): {reference:.3f} с')
+    for title, func, args in (
+            ('get_message', get_message, (messages,)),
+            ('write_messages', write_messages, (messages, io.StringIO())),
+            ('BatchResult.write_messages', result.write_messages,
+             (io.StringIO(),)),
+    ):
+        elapsed = timed(func, *args)
+        print(f'{title}: {elapsed:.3f} с (x{reference / elapsed:.1f})')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
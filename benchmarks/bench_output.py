@@ -0,0 +1,72 @@
+"""Вывод сообщений: print на каждую тренировку против BufferedWriter.
+
+Сообщения пишутся в канал, который вычитывает отдельный процесс,
+как при выводе в stdout, подключённый к сборщику логов.
+"""
+import os
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_batch import make_packages
+from homework import InfoMessage, read_package
+from output import BufferedWriter
+
+
+def to_pipe(write: Callable[[object, List[InfoMessage]], None],
+            infos: List[InfoMessage]) -> float:
+    """Засечь время записи сообщений в канал к процессу cat."""
+    reader = subprocess.Popen(['cat'], stdin=subprocess.PIPE,
+                              stdout=subprocess.DEVNULL)
+    pipe = os.fdopen(reader.stdin.fileno(), 'w', encoding='utf-8',
+                     closefd=False)
+    start = time.perf_counter()
+    write(pipe, infos)
+    pipe.flush()
+    elapsed = time.perf_counter() - start
+    reader.stdin.close()
+    reader.wait()
+    return elapsed
+
+
+def print_flush(pipe, infos: List[InfoMessage]) -> None:
+    for info in infos:
+        print(info.get_message(), file=pipe, flush=True)
+
+
+def print_buffered(pipe, infos: List[InfoMessage]) -> None:
+    with redirect_stdout(pipe):
+        for info in infos:
+            print(info.get_message())
+
+
+def buffered(pipe, infos: List[InfoMessage]) -> None:
+    with BufferedWriter(pipe) as writer:
+        writer.write_messages(infos)
+
+
+def background(pipe, infos: List[InfoMessage]) -> None:
+    with BufferedWriter(pipe, background=True) as writer:
+        writer.write_messages(infos)
+
+
+def main(size: int) -> None:
+    """Главная функция."""
+    infos = [read_package(*package).show_training_info()
+             for package in make_packages(size)]
+    for name, write in (('print, flush=True', print_flush),
+                        ('print', print_buffered),
+                        ('BufferedWriter', buffered),
+                        ('BufferedWriter, поток', background)):
+        seconds = to_pipe(write, infos)
+        print(f'{name}: {seconds:.3f} с, '
+              f'{size / seconds / 1e6:.2f} млн сообщений/с')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
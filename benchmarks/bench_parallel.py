@@ -0,0 +1,36 @@
+"""Масштабирование пула процессов по числу исполнителей."""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_batch import make_packages
+from parallel import compute_parallel
+from stream import compute
+
+
+def main(size: int) -> None:
+    """Главная функция."""
+    packages = make_packages(size)
+    start = time.perf_counter()
+    for _ in compute(packages):
+        pass
+    baseline = time.perf_counter() - start
+    print(f'пакетов: {size}, ядер: {os.cpu_count()}')
+    print(f'один процесс: {baseline:.3f} с')
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        for _ in compute_parallel(packages, workers):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f'исполнителей: {workers}: {elapsed:.3f} с '
+              f'(ускорение x{baseline / elapsed:.2f}, '
+              f'эффективность {baseline / elapsed / workers:.0%})')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
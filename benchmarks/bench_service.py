@@ -0,0 +1,58 @@
+"""Расчёт из многих потоков: read_package в каждом потоке против сервиса.
+
+Потоки имитируют обработчики запросов WSGI: каждый считает свою
+долю пакетов и ждёт результата каждого пакета.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_batch import make_packages
+from homework import read_package
+from service import ComputeService
+
+
+def in_threads(work: Callable[[list], None], packages: list,
+               threads: int) -> float:
+    """Засечь время обработки пакетов, поделённых между потоками."""
+    parts: List[list] = [packages[number::threads]
+                         for number in range(threads)]
+    workers = [threading.Thread(target=work, args=(part,))
+               for part in parts]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def direct(part: list) -> None:
+    for package in part:
+        read_package(*package).show_training_info()
+
+
+def main(size: int, threads: int = 16) -> None:
+    """Главная функция."""
+    packages = make_packages(size)
+    seconds = in_threads(direct, packages, threads)
+    print(f'read_package в {threads} потоках: {seconds:.3f} с')
+    for max_batch, max_wait in ((256, 0.001), (1024, 0.002), (4096, 0.005)):
+        with ComputeService(max_batch, max_wait) as service:
+            def submit(part: list) -> None:
+                futures = [service.submit(*package) for package in part]
+                for future in futures:
+                    future.result()
+
+            seconds = in_threads(submit, packages, threads)
+        print(f'ComputeService(max_batch={max_batch}, max_wait={max_wait}):'
+              f' {seconds:.3f} с, пачек {service.batches}, '
+              f'заполненность {service.fill_ratio:.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,71 @@
+"""Запись года истории и выборка тренировок одного пользователя."""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from index import HistoryIndex
+from storage import StorageReader, StorageWriter
+
+SECONDS_IN_YEAR = 365 * 24 * 3600
+
+
+def make_group(rng: np.random.Generator, workout_type: str, size: int,
+               users: int) -> tuple:
+    """Сгенерировать столбцы группы тренировок одного типа."""
+    fields = {'RUN': 3, 'WLK': 4, 'SWM': 5}[workout_type]
+    data = rng.uniform(1, 100, size=(size, fields))
+    data[:, 0] = rng.integers(100, 20000, size)
+    return (data, rng.integers(0, users, size),
+            np.sort(rng.integers(0, SECONDS_IN_YEAR, size)))
+
+
+def main(size: int, users: int = 1000) -> None:
+    """Главная функция."""
+    rng = np.random.default_rng(0)
+    path = Path(tempfile.mkdtemp()) / 'history.ftrk'
+    start = time.perf_counter()
+    with StorageWriter(path) as writer:
+        for workout_type in ('RUN', 'WLK', 'SWM'):
+            for _ in range(10):
+                writer.write(workout_type,
+                             *make_group(rng, workout_type, size // 30,
+                                         users))
+    written = time.perf_counter() - start
+    print(f'тренировок: {size}, файл: {path.stat().st_size / 2**20:.1f} МБ, '
+          f'запись: {written:.3f} с')
+
+    start = time.perf_counter()
+    with StorageReader(path) as reader:
+        calories = 0.0
+        sessions = 0
+        for group in reader.iter_groups():
+            mask = group.column('user') == 42
+            sessions += int(mask.sum())
+            calories += float(group.column('calories')[mask].sum())
+        del mask
+    scanned = time.perf_counter() - start
+    print(f'пользователь 42: {sessions} тренировок, {calories:.0f} ккал, '
+          f'открытие и выборка: {scanned * 1000:.1f} мс')
+
+    with StorageReader(path) as reader:
+        start = time.perf_counter()
+        index = HistoryIndex(reader)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        totals = index.totals(42, 0, SECONDS_IN_YEAR // 12, 'SWM')
+        queried = time.perf_counter() - start
+        print(f'индекс: {len(index.blocks)} блоков, '
+              f'построение {built * 1000:.1f} мс')
+        print(f'плавание пользователя 42 за январь: {totals["count"]} '
+              f'тренировок, {index.blocks_scanned} блоков прочитано, '
+              f'{queried * 1000:.2f} мс')
+        del index
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
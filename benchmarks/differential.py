@@ -0,0 +1,459 @@
+"""Дифференциальная проверка быстрых путей расчёта против эталона.
+
+Случайные корректные пакеты каждого типа считаются эталоном —
+методами get_* объектов тренировок — и каждым зарегистрированным
+путём (PATHS): объекты, кэш, пакетный расчёт, таблица, бинарные
+кадры, хранилище, выгрузка Arrow и Parquet, отсчёты датчиков, сервис,
+сервер, пул процессов. Числа сравниваются в ULP с допусками
+TOLERANCES: пути без NumPy должны совпадать с эталоном до бита, а
+пути через NumPy возводят в квадрат умножением, а не через pow, и
+калории ходьбы у них могут расходиться на NUMPY_CALORIES ULP. Текст
+сообщений сравнивается побайтно, в том числе у путей записи текста
+(RENDERERS). Исключение в пути считается расхождением, а не
+останавливает проверку.
+
+В режиме нагрузки (--cases) миллионы пакетов проверяются порциями,
+время каждого пути засекается, и отчёт показывает расхождения
+вместе с ускорением относительно пообъектного расчёта.
+"""
+import argparse
+import asyncio
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from batch import compute_batch, compute_profiles
+from cache import PackageCache
+from export import export
+from frames import compute_frames, pack_frames
+from homework import InfoMessage, read_package, registry, write_messages
+from output import BufferedWriter
+from parallel import compute_parallel
+from samples import COUNTERS, SEC_IN_HOUR, compute_samples, lookup
+from server import TrackerServer
+from service import ComputeService
+from storage import StorageReader, StorageWriter
+from table import TrainingTable
+
+Package = Tuple[str, list]
+Path_ = Callable[[List[Package]], List[InfoMessage]]
+
+METRICS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+TOLERANCES: Dict[str, int] = {
+    'duration': 0,
+    'distance': 0,
+    'speed': 0,
+    'calories': 0,
+}
+NUMPY_CALORIES = 2
+PATHS: Dict[str, Path_] = {}
+PATH_TOLERANCES: Dict[str, Dict[str, int]] = {}
+RENDERERS: Dict[str, Callable[[List[Package]], str]] = {}
+
+
+def random_package(rnd: random.Random, workout_type: str) -> Package:
+    """Сгенерировать корректный пакет, иногда с крайними значениями."""
+    edge = rnd.random() < 0.05
+    action = rnd.choice([0, 1, 10 ** 6]) if edge else rnd.randint(0, 50000)
+    duration = (rnd.choice([1e-3, 1, 24]) if edge
+                else rnd.choice([rnd.randint(1, 5), rnd.uniform(0.05, 5)]))
+    weight = rnd.choice([rnd.randint(30, 150), rnd.uniform(30, 150)])
+    if workout_type == 'WLK':
+        return workout_type, [action, duration, weight,
+                              rnd.uniform(120, 220)]
+    if workout_type == 'SWM':
+        return workout_type, [action, duration, weight,
+                              rnd.randint(10, 100),
+                              0 if edge else rnd.randint(1, 200)]
+    return workout_type, [action, duration, weight]
+
+
+def random_packages(size: int, seed: int = 0,
+                    workout_types: Sequence[str] = ('RUN', 'WLK', 'SWM'),
+                    ) -> List[Package]:
+    """Сгенерировать size случайных пакетов указанных типов."""
+    rnd = random.Random(seed)
+    return [random_package(rnd, rnd.choice(workout_types))
+            for _ in range(size)]
+
+
+def reference(packages: List[Package]) -> List[InfoMessage]:
+    """Посчитать пакеты методами get_* объектов тренировок."""
+    infos = []
+    for workout_type, data in packages:
+        training = registry.types[workout_type](*data)
+        infos.append(InfoMessage(type(training).__name__,
+                                 training.duration,
+                                 training.get_distance(),
+                                 training.get_mean_speed(),
+                                 training.get_spent_calories()))
+    return infos
+
+
+def path(name: str, **tolerances: int) -> Callable[[Path_], Path_]:
+    """Зарегистрировать быстрый путь расчёта для проверки.
+
+    tolerances заменяют допуски TOLERANCES для этого пути.
+    """
+    def decorator(func: Path_) -> Path_:
+        PATHS[name] = func
+        PATH_TOLERANCES[name] = {**TOLERANCES, **tolerances}
+        return func
+    return decorator
+
+
+def renderer(name: str) -> Callable:
+    """Зарегистрировать путь записи текста сообщений."""
+    def decorator(func: Callable[[List[Package]], str]) -> Callable:
+        RENDERERS[name] = func
+        return func
+    return decorator
+
+
+@path('object')
+def object_path(packages: List[Package]) -> List[InfoMessage]:
+    return [read_package(*package).show_training_info()
+            for package in packages]
+
+
+@path('cached')
+def cached_path(packages: List[Package]) -> List[InfoMessage]:
+    trainings = [read_package(*package) for package in packages]
+    for training in trainings:
+        training.show_training_info()
+    return [training.show_training_info() for training in trainings]
+
+
+@path('cache')
+def cache_path(packages: List[Package]) -> List[InfoMessage]:
+    cache = PackageCache(maxsize=len(packages) + 1)
+    return [cache.get(*package) for package in packages]
+
+
+@path('batch', calories=NUMPY_CALORIES)
+def batch_path(packages: List[Package]) -> List[InfoMessage]:
+    return list(compute_batch(packages).messages())
+
+
+@path('profiles', calories=NUMPY_CALORIES)
+def profiles_path(packages: List[Package]) -> List[InfoMessage]:
+    return list(compute_profiles(
+        (None, workout_type, data) for workout_type, data in packages
+    ).messages())
+
+
+@path('table', calories=NUMPY_CALORIES)
+def table_path(packages: List[Package]) -> List[InfoMessage]:
+    return list(TrainingTable(packages).compute().messages())
+
+
+@path('frames', calories=NUMPY_CALORIES)
+def frames_path(packages: List[Package]) -> List[InfoMessage]:
+    return list(compute_frames(pack_frames(packages)).messages())
+
+
+@path('storage', calories=NUMPY_CALORIES)
+def storage_path(packages: List[Package]) -> List[InfoMessage]:
+    """Записать пакеты в хранилище и собрать сообщения из его столбцов."""
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory) / 'sessions.trk'
+        groups: Dict[str, List[int]] = {}
+        for position, (workout_type, _) in enumerate(packages):
+            groups.setdefault(workout_type, []).append(position)
+        with StorageWriter(file) as writer:
+            for workout_type, positions in groups.items():
+                writer.write(workout_type,
+                             [packages[position][1] for position in positions],
+                             users=positions, timestamps=positions)
+        infos: List[Optional[InfoMessage]] = [None] * len(packages)
+        with StorageReader(file) as reader:
+            for workout_type, positions in groups.items():
+                name = registry.types[workout_type].__name__
+                columns = zip(*(reader.column(workout_type, metric).tolist()
+                                for metric in METRICS))
+                for position, row in zip(positions, columns):
+                    infos[position] = InfoMessage(name, *row)
+    return infos
+
+
+def exported(packages: List[Package],
+             file_format: str) -> List[InfoMessage]:
+    """Выгрузить пакеты в файл и собрать сообщения из его столбцов."""
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory) / f'sessions.{file_format}'
+        export(packages, file, file_format,
+               batch_size=max(1, len(packages) // 3))
+        if file_format == 'parquet':
+            table = pq.read_table(file)
+        else:
+            with pa.memory_map(str(file)) as source:
+                table = pa.ipc.open_file(source).read_all()
+        columns = [table.column(name).to_pylist()
+                   for name in ('training_type', *METRICS)]
+    return [InfoMessage(*row) for row in zip(*columns)]
+
+
+@path('export', calories=NUMPY_CALORIES)
+def export_path(packages: List[Package]) -> List[InfoMessage]:
+    return exported(packages, 'parquet')
+
+
+@path('export_arrow', calories=NUMPY_CALORIES)
+def export_arrow_path(packages: List[Package]) -> List[InfoMessage]:
+    return exported(packages, 'arrow')
+
+
+@path('samples', duration=1, speed=2, calories=12)
+def samples_path(packages: List[Package]) -> List[InfoMessage]:
+    """Подать каждый пакет сессии одним отсчётом длиной в его длительность.
+
+    Длительность сессии — interval / SEC_IN_HOUR, а не исходное число
+    часов: примерно у 6% длительностей нет interval, для которого это
+    деление точно, отсюда допуск в 1 ULP и его след в скорости и
+    калориях.
+    """
+    infos = []
+    for workout_type, data in packages:
+        fields = dict(zip(registry.fields[workout_type], data))
+        duration = fields.pop('duration')
+        for name in lookup(COUNTERS, registry.types[workout_type]):
+            fields[name] = [fields[name]]
+        infos.append(compute_samples(workout_type, duration * SEC_IN_HOUR,
+                                     **fields)[1])
+    return infos
+
+
+INVALID: Package = ('RUN', ['x', 1, 75])
+CLIENTS = 4
+
+
+async def send(host: str, port: int, lines: List[bytes]) -> List[dict]:
+    """Отправить строки одним соединением и прочитать ответы."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.writelines(lines)
+    sending = asyncio.ensure_future(writer.drain())
+    responses = [json.loads(await reader.readline()) for _ in lines]
+    await sending
+    writer.close()
+    return responses
+
+
+async def serve(lines: List[bytes]) -> List[dict]:
+    """Отправить строки серверу из CLIENTS соединений по очереди."""
+    server = TrackerServer()
+    await server.start()
+    host, port = server.address[:2]
+    try:
+        parts = await asyncio.gather(*(
+            send(host, port, lines[client::CLIENTS])
+            for client in range(CLIENTS)))
+    finally:
+        await server.stop()
+    return [parts[index % CLIENTS][index // CLIENTS]
+            for index in range(len(lines))]
+
+
+@path('server', calories=NUMPY_CALORIES)
+def server_path(packages: List[Package]) -> List[InfoMessage]:
+    """Посчитать пакеты сервером, подмешав в поток некорректный пакет.
+
+    На некорректный пакет должен прийти ответ с ошибкой, а пакеты
+    из того же окна — посчитаться. Ответ с ошибкой на корректный
+    пакет становится сообщением с типом 'error' и не совпадёт
+    с эталоном.
+    """
+    middle = len(packages) // 2
+    stream = [*packages[:middle], INVALID, *packages[middle:]]
+    responses = asyncio.run(serve([json.dumps(package).encode() + b'\n'
+                                   for package in stream]))
+    if 'error' not in responses.pop(middle):
+        raise AssertionError(f'нет ошибки на пакет {INVALID}')
+    infos = []
+    for record in responses:
+        if 'error' in record:
+            infos.append(InfoMessage('error', *[float('nan')] * 4))
+            continue
+        info = InfoMessage(*(record[name]
+                             for name in ('training_type', *METRICS)))
+        if record['message'] != info.get_message():
+            raise AssertionError(f'текст ответа: {record["message"]!r}')
+        infos.append(info)
+    return infos
+
+
+@path('service', calories=NUMPY_CALORIES)
+def service_path(packages: List[Package]) -> List[InfoMessage]:
+    with ComputeService() as service:
+        futures = [service.submit(*package) for package in packages]
+        return [future.result() for future in futures]
+
+
+@path('parallel')
+def parallel_path(packages: List[Package]) -> List[InfoMessage]:
+    return list(compute_parallel(packages, workers=2,
+                                 chunk_size=max(1, len(packages) // 4)))
+
+
+@renderer('get_message')
+def get_message_text(packages: List[Package]) -> str:
+    return ''.join(info.get_message() + '\n'
+                   for info in object_path(packages))
+
+
+@renderer('write_messages')
+def write_messages_text(packages: List[Package]) -> str:
+    buffer = io.StringIO()
+    write_messages(object_path(packages), buffer)
+    return buffer.getvalue()
+
+
+@renderer('batch_text')
+def batch_text(packages: List[Package]) -> str:
+    buffer = io.StringIO()
+    compute_batch(packages).write_messages(buffer)
+    return buffer.getvalue()
+
+
+@renderer('buffered')
+def buffered_text(packages: List[Package]) -> str:
+    buffer = io.StringIO()
+    with BufferedWriter(buffer, buffer_size=4096) as writer:
+        writer.write_messages(batch_path(packages))
+    return buffer.getvalue()
+
+
+def ulps(expected: Sequence[float], actual: Sequence[float]) -> np.ndarray:
+    """Получить расстояние между числами в единицах последнего разряда."""
+    def ordered(values: Sequence[float]) -> np.ndarray:
+        bits = np.asarray(values, dtype=np.float64).view(np.int64)
+        return np.where(bits < 0, np.int64(-2 ** 63) - bits, bits)
+    return np.abs(ordered(expected) - ordered(actual))
+
+
+@dataclass
+class PathReport:
+    """Итог проверки одного пути."""
+    cases: int = 0
+    seconds: float = 0.0
+    max_ulps: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(METRICS, 0))
+    mismatches: int = 0
+    examples: List[str] = field(default_factory=list)
+
+    def fail(self, message: str) -> None:
+        self.mismatches += 1
+        if len(self.examples) < 5:
+            self.examples.append(message)
+
+
+def compare(expected: List[InfoMessage], actual: List[InfoMessage],
+            packages: List[Package], report: PathReport,
+            tolerances: Dict[str, int] = TOLERANCES) -> None:
+    """Сравнить результаты пути с эталоном и учесть их в отчёте."""
+    if len(actual) != len(expected):
+        report.fail(f'{len(actual)} результатов вместо {len(expected)}')
+        return
+    for metric in METRICS:
+        distance = ulps([getattr(info, metric) for info in expected],
+                        [getattr(info, metric) for info in actual])
+        report.max_ulps[metric] = max(report.max_ulps[metric],
+                                      int(distance.max(initial=0)))
+        for index in np.flatnonzero(distance > tolerances[metric])[:5]:
+            report.fail(f'{packages[index]}: {metric} '
+                        f'{getattr(expected[index], metric)!r} != '
+                        f'{getattr(actual[index], metric)!r} '
+                        f'({distance[index]} ULP)')
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        if want.training_type != got.training_type or (
+                want.get_message() != got.get_message()):
+            report.fail(f'{packages[index]}: {got.get_message()!r}')
+
+
+def check(packages: List[Package],
+          paths: Optional[Sequence[str]] = None,
+          reports: Optional[Dict[str, PathReport]] = None,
+          ) -> Dict[str, PathReport]:
+    """Прогнать пакеты через эталон и пути, накапливая отчёты."""
+    reports = {} if reports is None else reports
+    start = time.perf_counter()
+    expected = reference(packages)
+    reports.setdefault('reference', PathReport())
+    reports['reference'].seconds += time.perf_counter() - start
+    reports['reference'].cases += len(packages)
+    expected_text = ''.join(info.get_message() + '\n' for info in expected)
+    for name in paths or list(PATHS) + list(RENDERERS):
+        report = reports.setdefault(name, PathReport())
+        report.cases += len(packages)
+        start = time.perf_counter()
+        try:
+            if name in PATHS:
+                actual = PATHS[name](packages)
+            else:
+                text = RENDERERS[name](packages)
+        except Exception as error:
+            report.fail(f'{type(error).__name__}: {error}')
+            continue
+        finally:
+            report.seconds += time.perf_counter() - start
+        if name in PATHS:
+            compare(expected, actual, packages, report,
+                    PATH_TOLERANCES.get(name, TOLERANCES))
+        elif text != expected_text:
+            report.fail('текст сообщений отличается от эталона')
+    return reports
+
+
+def format_report(reports: Dict[str, PathReport]) -> str:
+    """Оформить отчёт: время, ускорение, ULP и расхождения по путям."""
+    base = reports.get('object', reports['reference'])
+    lines = [f'{"путь":<16}{"пакетов":>10}{"с":>9}{"ускорение":>11}'
+             f'{"ULP калорий":>13}{"ошибок":>8}']
+    for name, report in reports.items():
+        speedup = (base.seconds / report.seconds * report.cases / base.cases
+                   if report.seconds else float('inf'))
+        lines.append(f'{name:<16}{report.cases:>10}{report.seconds:>9.3f}'
+                     f'{speedup:>10.1f}x{report.max_ulps["calories"]:>13}'
+                     f'{report.mismatches:>8}')
+        lines.extend(f'    {example}' for example in report.examples)
+    return '\n'.join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cases', type=int, default=100_000,
+                        help='число пакетов')
+    parser.add_argument('--chunk', type=int, default=50_000,
+                        help='пакетов в одной порции')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--paths', nargs='+',
+                        choices=[*PATHS, *RENDERERS])
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция: 0, если все пути совпали с эталоном."""
+    args = parse_args(argv)
+    reports: Dict[str, PathReport] = {}
+    done = 0
+    while done < args.cases:
+        size = min(args.chunk, args.cases - done)
+        check(random_packages(size, args.seed + done), args.paths, reports)
+        done += size
+    print(format_report(reports))
+    return int(any(report.mismatches for report in reports.values()))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
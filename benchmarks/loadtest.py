@@ -0,0 +1,78 @@
+"""Нагрузочный тест сервера приёма пакетов: задержки и пропускная способность.
+
+Без --port сервер поднимается в этом же процессе.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_batch import make_packages
+from server import TrackerServer
+
+
+async def client(host: str, port: int, lines: list, latencies: list) -> None:
+    """Отправлять пакеты по одному, дожидаясь каждого ответа."""
+    reader, writer = await asyncio.open_connection(host, port)
+    for line in lines:
+        start = time.perf_counter()
+        writer.write(line)
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+def percentile(values: list, share: float) -> float:
+    """Получить перцентиль отсортированного списка."""
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def measure(host: str, port: int, concurrency: int,
+                  requests: int) -> None:
+    """Прогнать нагрузку с заданным числом клиентов и вывести итог."""
+    lines = [json.dumps({'workout_type': workout_type,
+                         'data': data}).encode() + b'\n'
+             for workout_type, data in make_packages(requests)]
+    latencies: list = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, lines[index::concurrency], latencies)
+        for index in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f'клиентов: {concurrency:4d}  '
+          f'p50: {percentile(latencies, 0.5) * 1000:7.2f} мс  '
+          f'p99: {percentile(latencies, 0.99) * 1000:7.2f} мс  '
+          f'пакетов/с: {len(latencies) / elapsed:9.0f}')
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Главная функция."""
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        server = TrackerServer(window=args.window_ms / 1000)
+        await server.start(host)
+        host, port = server.address[:2]
+    for concurrency in args.concurrency:
+        await measure(host, port, concurrency, args.requests)
+    if server is not None:
+        await server.stop()
+        print(f'средний размер пакетного расчёта: '
+              f'{server.packages / server.batches:.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--window-ms', type=float, default=2.0)
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=[1, 10, 100])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,139 @@
+"""Набор замеров по типам тренировок и этапам обработки пакета.
+
+Результат — JSON со временем одной операции в наносекундах по ключам
+`<тип>.<этап>.<число пакетов>`. С --compare результаты сравниваются
+с прошлым запуском, и при замедлении любого этапа больше чем на
+--threshold процентов скрипт завершается с кодом 1.
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_batch import make_packages
+from homework import main as show, read_package, registry
+
+STAGES = (
+    'construction',
+    'get_distance',
+    'get_mean_speed',
+    'get_spent_calories',
+    'show_training_info',
+    'get_message',
+    'end_to_end',
+)
+
+
+def stage_runner(stage: str, workout_type: str,
+                 packages: list) -> Callable[[], None]:
+    """Подготовить данные этапа и вернуть функцию для замера."""
+    training = registry.types[workout_type]
+    datas = [data for _, data in packages]
+    if stage == 'construction':
+        return lambda: [training(*data) for data in datas]
+    if stage == 'end_to_end':
+        def run() -> None:
+            with redirect_stdout(io.StringIO()):
+                for code, data in packages:
+                    show(read_package(code, data))
+        return run
+    if stage == 'show_training_info':
+        return lambda: [training(*data).show_training_info()
+                        for data in datas]
+    trainings = [training(*data) for data in datas]
+    if stage == 'get_message':
+        infos = [item.show_training_info() for item in trainings]
+        return lambda: [info.get_message() for info in infos]
+    method = getattr(training, stage)
+    return lambda: [method(item) for item in trainings]
+
+
+def measure(func: Callable[[], None], size: int,
+            repeat: int = 3, min_time: float = 0.05) -> float:
+    """Получить лучшее время одной операции в наносекундах."""
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    loops = max(1, int(min_time / max(first, 1e-9)))
+    best = first
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best / size * 1e9
+
+
+def run_suite(sizes: List[int], workout_types: List[str],
+              stages: List[str]) -> Dict[str, float]:
+    """Прогнать все этапы для всех типов и размеров."""
+    results = {}
+    for workout_type in workout_types:
+        name = registry.types[workout_type].__name__
+        for size in sizes:
+            packages = make_packages(size, workout_types=(workout_type,))
+            for stage in stages:
+                func = stage_runner(stage, workout_type, packages)
+                key = f'{name}.{stage}.{size}'
+                results[key] = measure(func, size)
+                print(f'{key}: {results[key]:.1f} нс', file=sys.stderr)
+    return results
+
+
+def find_regressions(baseline: Dict[str, float],
+                     current: Dict[str, float],
+                     threshold: float) -> Dict[str, float]:
+    """Найти этапы, замедлившиеся больше чем на threshold процентов."""
+    regressions = {}
+    for key, value in current.items():
+        if key not in baseline:
+            continue
+        change = (value / baseline[key] - 1) * 100
+        if change > threshold:
+            regressions[key] = change
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1, 10_000, 1_000_000])
+    parser.add_argument('--types', nargs='+', default=list(registry.types))
+    parser.add_argument('--stages', nargs='+', choices=STAGES,
+                        default=list(STAGES))
+    parser.add_argument('--output', help='файл для результатов JSON')
+    parser.add_argument('--compare', help='результаты прошлого запуска')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='допустимое замедление, проценты')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.types, args.stages)
+    report = {'python': platform.python_version(),
+              'machine': platform.machine(),
+              'unit': 'ns/op',
+              'results': results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    else:
+        print(text)
+    if not args.compare:
+        return 0
+    baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+    regressions = find_regressions(baseline['results'], results,
+                                   args.threshold)
+    for key, change in regressions.items():
+        print(f'замедление {key}: +{change:.1f}%', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Sequence, Tuple
+
+from homework import InfoMessage, TrainingMeta, read_package
+
+Key = Tuple[str, Tuple[Hashable, ...]]
+
+
+class PackageCache:
+    """Ограниченный LRU-кэш результатов read_package + show_training_info.
+
+    Ключ — (workout_type, tuple(data)). Кэш целиком сбрасывается, если
+    после заполнения изменились атрибуты классов тренировок. Результаты
+    общие для всех вызывающих, изменять их нельзя.
+    """
+
+    def __init__(self,
+                 maxsize: int = 1024,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 ) -> None:
+        if maxsize < 1:
+            raise ValueError('Размер кэша должен быть положительным.')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: 'OrderedDict[Key, Tuple[float, InfoMessage]]' = (
+            OrderedDict())
+        self._version = TrainingMeta.version
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self,
+            workout_type: str,
+            data: Sequence[float],
+            ) -> Optional[InfoMessage]:
+        """Вернуть результат пакета из кэша или посчитать его."""
+        key = (workout_type, tuple(data))
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None
+                                      or entry[0] > self.clock()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = self._version
+        training = read_package(workout_type, data)
+        if training is None:
+            return None
+        info = training.show_training_info()
+        expires = self.clock() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            if version == self._version == TrainingMeta.version:
+                self._entries[key] = (expires, info)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return info
+
+    def clear(self) -> None:
+        """Очистить кэш, сохранив счётчики."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Вернуть счётчики кэша."""
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'invalidations': self.invalidations,
+                    'size': len(self._entries)}
+
+    def _check_version(self) -> None:
+        if self._version != TrainingMeta.version:
+            self._entries.clear()
+            self._version = TrainingMeta.version
+            self.invalidations += 1
@@ -0,0 +1,145 @@
+"""Выгрузка результатов тренировок в Arrow и Parquet.
+
+Нужен пакет pyarrow. Каждая пачка пакетов становится одним
+RecordBatch (в Parquet — одной группой строк) и записывается сразу,
+поэтому выгрузка любого размера идёт в постоянной памяти.
+
+Столбцы: training_type и workout_type со словарным кодированием,
+посчитанные duration, distance, speed, calories и исходные поля
+пакетов по параметрам конструкторов; поля, которых нет у типа
+тренировки, пустые (null).
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from batch import compute_columns
+from homework import registry
+from stream import chunked
+
+FORMATS = ('parquet', 'arrow')
+RESULTS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+INDEX = pa.int16()
+
+Package = Tuple[str, Sequence[float]]
+
+
+def input_names() -> List[str]:
+    """Получить исходные поля всех типов, кроме уже посчитанных."""
+    names: List[str] = []
+    for fields in registry.fields.values():
+        names.extend(name for name in fields
+                     if name not in names and name not in RESULTS)
+    return names
+
+
+def make_schema() -> pa.Schema:
+    """Построить схему выгрузки по зарегистрированным типам."""
+    return pa.schema([
+        pa.field('training_type', pa.dictionary(INDEX, pa.string()),
+                 nullable=False),
+        *(pa.field(name, pa.float64(), nullable=False) for name in RESULTS),
+        pa.field('workout_type', pa.dictionary(INDEX, pa.string()),
+                 nullable=False),
+        *(pa.field(name, pa.float64()) for name in input_names()),
+    ])
+
+
+def record_batch(packages: Iterable[Package],
+                 schema: pa.Schema) -> pa.RecordBatch:
+    """Посчитать пачку пакетов и собрать из неё RecordBatch.
+
+    Словари типов одинаковы во всех пачках: индексы — номера кодов
+    в реестре. Пакеты с неизвестным кодом обрабатываются по политике
+    реестра и в выгрузку не попадают.
+    """
+    codes = list(registry.types)
+    numbers = {code: number for number, code in enumerate(codes)}
+    groups: Dict[str, Tuple[List[int], list]] = {}
+    size = 0
+    for workout_type, data in packages:
+        if workout_type not in numbers:
+            registry.get(workout_type)
+            continue
+        positions, rows = groups.setdefault(workout_type, ([], []))
+        positions.append(size)
+        rows.append(data)
+        size += 1
+
+    indices = np.empty(size, dtype=np.int16)
+    results = {name: np.empty(size) for name in RESULTS}
+    first_input = schema.get_field_index('workout_type') + 1
+    inputs = {name: np.zeros(size) for name in schema.names[first_input:]}
+    present = {name: np.zeros(size, dtype=bool) for name in inputs}
+    for workout_type, (positions, rows) in groups.items():
+        index = np.array(positions, dtype=np.intp)
+        data = np.array(rows, dtype=np.float64)
+        indices[index] = numbers[workout_type]
+        results['duration'][index] = data[:, 1]
+        (results['distance'][index],
+         results['speed'][index],
+         results['calories'][index]) = compute_columns(workout_type, data)
+        for column, name in enumerate(registry.fields[workout_type]):
+            if name in inputs:
+                inputs[name][index] = data[:, column]
+                present[name][index] = True
+
+    names = pa.array([registry.types[code].__name__ for code in codes])
+    return pa.RecordBatch.from_arrays([
+        pa.DictionaryArray.from_arrays(indices, names),
+        *(pa.array(results[name]) for name in RESULTS),
+        pa.DictionaryArray.from_arrays(indices, pa.array(codes)),
+        *(pa.array(inputs[name], mask=~present[name]) for name in inputs),
+    ], schema=schema)
+
+
+class SessionWriter:
+    """Потоковая запись пачек тренировок в файл Parquet или Arrow IPC."""
+
+    def __init__(self, path: Union[str, Path],
+                 file_format: str = 'parquet') -> None:
+        if file_format not in FORMATS:
+            raise ValueError(f'Неизвестный формат: {file_format}')
+        self.path = Path(path)
+        self.schema = make_schema()
+        self.rows = 0
+        self._sink = None
+        if file_format == 'parquet':
+            self._writer = pq.ParquetWriter(str(self.path), self.schema)
+        else:
+            self._sink = pa.OSFile(str(self.path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def __enter__(self) -> 'SessionWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, packages: Iterable[Package]) -> int:
+        """Посчитать и записать одну пачку пакетов."""
+        batch = record_batch(packages, self.schema)
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+        return batch.num_rows
+
+    def close(self) -> None:
+        """Дописать метаданные и закрыть файл."""
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def export(packages: Iterable[Package],
+           path: Union[str, Path],
+           file_format: str = 'parquet',
+           batch_size: int = 65536,
+           ) -> int:
+    """Выгрузить поток пакетов пачками по batch_size строк."""
+    with SessionWriter(path, file_format) as writer:
+        for chunk in chunked(packages, batch_size):
+            writer.write(chunk)
+        return writer.rows
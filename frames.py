@@ -0,0 +1,105 @@
+"""Двоичные кадры пакетов от трекеров.
+
+Кадр занимает 48 байт, все числа little-endian:
+
+    код тренировки: 4 байта ASCII, дополненные нулями (b'RUN\\0')
+    число полей пакета u32
+    5 полей f8 в порядке параметров конструктора класса тренировки,
+    неиспользуемые поля заполнены нулями
+
+Кадры всех типов одной длины, поэтому буфер из многих кадров
+читается через numpy.frombuffer одним массивом без разбора по кадрам
+и без копирования.
+"""
+import struct
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from batch import BatchResult, compute_group
+from homework import registry
+
+MAX_FIELDS = 5
+FRAME = struct.Struct(f'<4sI{MAX_FIELDS}d')
+DTYPE = np.dtype([('code', 'S4'),
+                  ('count', '<u4'),
+                  ('fields', '<f8', (MAX_FIELDS,))])
+
+Buffer = Union[bytes, bytearray, memoryview]
+Package = Tuple[str, Sequence[float]]
+
+
+def pack_frames(packages: Iterable[Package]) -> bytearray:
+    """Упаковать пакеты в буфер двоичных кадров."""
+    packages = list(packages)
+    buffer = bytearray(FRAME.size * len(packages))
+    for number, (workout_type, data) in enumerate(packages):
+        if workout_type not in registry.arity:
+            raise ValueError(f'Неизвестный тип тренировки: {workout_type}')
+        if len(data) != registry.arity[workout_type]:
+            raise ValueError(f'Пакет {workout_type} должен содержать '
+                             f'{registry.arity[workout_type]} значений.')
+        fields = (*data, *(0.0,) * (MAX_FIELDS - len(data)))
+        FRAME.pack_into(buffer, number * FRAME.size,
+                        workout_type.encode('ascii'), len(data), *fields)
+    return buffer
+
+
+def decode_frames(buffer: Buffer) -> np.ndarray:
+    """Получить кадры буфера структурным массивом без копирования."""
+    view = memoryview(buffer)
+    if view.nbytes % FRAME.size:
+        raise ValueError(f'Длина буфера не кратна размеру кадра '
+                         f'{FRAME.size} байт.')
+    return np.frombuffer(view, dtype=DTYPE)
+
+
+def iter_frames(buffer: Buffer) -> Iterator[Package]:
+    """Перебрать кадры буфера пакетами для read_package."""
+    for code, count, *fields in FRAME.iter_unpack(memoryview(buffer)):
+        yield code.rstrip(b'\0').decode('ascii'), fields[:count]
+
+
+def compute_frames(buffer: Buffer) -> BatchResult:
+    """Посчитать показатели кадров буфера по столбцам.
+
+    Столбцы ядер — срезы массива поверх буфера. Кадры с неизвестным
+    кодом обрабатываются по политике реестра и в результат не
+    попадают; порядок остальных кадров сохраняется.
+    """
+    frames = decode_frames(buffer)
+    codes = frames['code']
+    fields = frames['fields']
+    size = len(frames)
+    result = BatchResult(np.empty(size, dtype=object),
+                         fields[:, 1].copy(),
+                         np.empty(size),
+                         np.empty(size),
+                         np.empty(size))
+    unique = np.unique(codes).tolist()
+    known: Optional[np.ndarray] = None
+    for code in unique:
+        workout_type = code.decode('ascii', 'replace')
+        rows = slice(None) if len(unique) == 1 else codes == code
+        cls = registry.types.get(workout_type)
+        if cls is None:
+            unknown = codes == code
+            for _ in range(np.count_nonzero(unknown)):
+                registry.get(workout_type)
+            known = ~unknown if known is None else known & ~unknown
+            continue
+        arity = registry.arity[workout_type]
+        if (frames['count'][rows] != arity).any():
+            raise ValueError(f'Кадр {workout_type} должен содержать '
+                             f'{arity} значений.')
+        distance, speed, calories = compute_group(
+            cls, *(fields[rows, index] for index in range(arity)))
+        result.training_type[rows] = cls.__name__
+        result.distance[rows] = distance
+        result.speed[rows] = speed
+        result.calories[rows] = calories
+    if known is None:
+        return result
+    return BatchResult(*(column[known] for column in (
+        result.training_type, result.duration, result.distance,
+        result.speed, result.calories)))
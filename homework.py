@@ -1,31 +1,191 @@
-from dataclasses import asdict, dataclass
-from typing import Type
+import inspect
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import (Callable, ClassVar, Dict, Iterable, Mapping, NamedTuple,
+                    Optional, TextIO, Tuple, Type, Union)
 
 
 @dataclass
 class InfoMessage:
     """Информационное сообщение о тренировке."""
+    __slots__ = ('training_type', 'duration', 'distance', 'speed', 'calories')
     training_type: str
     duration: float
     distance: float
     speed: float
     calories: float
-    message: str = ('Тип тренировки: {}; '
-                    'Длительность: {:.3f} ч.; '
-                    'Дистанция: {:.3f} км; '
-                    'Ср. скорость: {:.3f} км/ч; '
-                    'Потрачено ккал: {:.3f}.')
+    message: ClassVar[str] = ('Тип тренировки: {}; '
+                              'Длительность: {:.3f} ч.; '
+                              'Дистанция: {:.3f} км; '
+                              'Ср. скорость: {:.3f} км/ч; '
+                              'Потрачено ккал: {:.3f}.')
 
     def get_message(self) -> str:
-        return self.message.format(*asdict(self).values())
-
-
-class Training:
-    """Базовый класс тренировки."""
+        return self.message.format(self.training_type,
+                                   self.duration,
+                                   self.distance,
+                                   self.speed,
+                                   self.calories)
+
+
+def write_messages(messages: Iterable[InfoMessage], buffer: TextIO) -> None:
+    """Записать сообщения в буфер построчно без промежуточных объектов."""
+    for info in messages:
+        buffer.write(info.message.format(info.training_type,
+                                         info.duration,
+                                         info.distance,
+                                         info.speed,
+                                         info.calories))
+        buffer.write('\n')
+
+
+class Kernel(NamedTuple):
+    """Скомпилированные формулы класса тренировки.
+
+    Константы класса прочитаны один раз при сборке ядра, порядок
+    операций — как в методах get_*. columns(*поля пакета) возвращает
+    дистанцию, скорость и калории; по нему считают show_training_info,
+    пакетные пути и отсчёты датчиков. На числах результаты совпадают
+    с методами get_* до последнего разряда. На массивах NumPy
+    возводит в квадрат умножением, а не через pow, поэтому калории
+    ходьбы могут расходиться на пару ULP. columns равен None, если
+    формулы класса неполны или методы get_* переопределены.
+    """
+    columns: Optional[Callable[..., Tuple[float, float, float]]] = None
+
+
+KERNEL_METHODS = frozenset(('get_distance', 'get_mean_speed',
+                            'get_spent_calories'))
+
+
+def kernel_methods(klass: type) -> Dict[str, object]:
+    """Получить методы get_*, определённые в самом классе."""
+    return {name: value for name, value in vars(klass).items()
+            if name in KERNEL_METHODS}
+
+
+class TrainingMeta(type):
+    """Метакласс тренировок, отмечающий изменения их атрибутов.
+
+    version растёт при изменении или удалении атрибута существующего
+    класса и регистрации типа: по нему кэши понимают, что посчитанные
+    ранее результаты устарели. Создание подкласса не меняет ни одного
+    посчитанного результата, поэтому version не трогает: профили
+    создают свои подклассы, не сбрасывая кэши. Ядро класса собирается
+    при его создании и пересобирается вместе с ядрами подклассов,
+    когда меняется атрибут класса. Класс с compile_kernel запоминает
+    свои методы get_*: если какой-нибудь метод get_* в иерархии
+    заменён или переопределён подклассом, ядро столбцов не
+    используется.
+    """
+
+    version: int = 0
+
+    def __init__(cls, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if 'compile_kernel' in vars(cls):
+            type.__setattr__(cls, '_kernel_methods', kernel_methods(cls))
+        cls.rebuild_kernel()
+
+    def __setattr__(cls, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        TrainingMeta.version += 1
+        cls.rebuild_kernel()
+
+    def __delattr__(cls, name: str) -> None:
+        super().__delattr__(name)
+        TrainingMeta.version += 1
+        cls.rebuild_kernel()
+
+    def rebuild_kernel(cls) -> None:
+        """Собрать ядро класса и его подклассов заново."""
+        kernel = cls.compile_kernel()
+        if any(kernel_methods(klass) != vars(klass).get('_kernel_methods', {})
+               for klass in cls.__mro__):
+            kernel = kernel._replace(columns=None)
+        type.__setattr__(cls, 'kernel', kernel)
+        for subclass in cls.__subclasses__():
+            subclass.rebuild_kernel()
+
+
+class WorkoutRegistry:
+    """Реестр классов тренировок по кодам датчиков.
+
+    Политика для неизвестных кодов: 'raise' — ValueError,
+    'skip' — вернуть None, 'count' — вернуть None и посчитать код.
+    """
+
+    POLICIES = ('raise', 'skip', 'count')
+
+    def __init__(self, policy: str = 'skip') -> None:
+        self.types: dict[str, Type['Training']] = {}
+        self.fields: dict[str, tuple[str, ...]] = {}
+        self.arity: dict[str, int] = {}
+        self.unknown: Counter = Counter()
+        self.policy = policy
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy: str) -> None:
+        if policy not in self.POLICIES:
+            raise ValueError(f'Неизвестная политика: {policy}')
+        self._policy = policy
+
+    def register(self, code: str) -> Callable[[Type['Training']],
+                                              Type['Training']]:
+        """Зарегистрировать класс тренировки под кодом датчика."""
+        def decorator(training: Type['Training']) -> Type['Training']:
+            self.types[code] = training
+            self.fields[code] = tuple(inspect.signature(training).parameters)
+            self.arity[code] = len(self.fields[code])
+            TrainingMeta.version += 1
+            return training
+        return decorator
+
+    def get(self, workout_type: str) -> Optional[Type['Training']]:
+        """Найти класс тренировки по коду с учётом политики."""
+        training = self.types.get(workout_type)
+        if training is None:
+            if self.policy == 'raise':
+                raise ValueError(
+                    f'Неизвестный тип тренировки: {workout_type}')
+            if self.policy == 'count':
+                self.unknown[workout_type] += 1
+        return training
+
+
+registry = WorkoutRegistry()
+
+
+class Training(metaclass=TrainingMeta):
+    """Базовый класс тренировки.
+
+    INPUTS — атрибуты экземпляра, от которых зависят показатели, в
+    порядке параметров конструктора: по ним же считает kernel.columns.
+    Посчитанные show_training_info значения хранятся вместе с ними
+    и TrainingMeta.version и пересчитываются, когда изменился
+    какой-нибудь из атрибутов или константы классов.
+    """
 
     LEN_STEP: float = 0.65
     M_IN_KM: int = 1000
     SEC_IN_MIN: int = 60
+    INPUTS: ClassVar[Tuple[str, ...]] = ('action', 'duration', 'weiht')
+    _inputs: ClassVar[Callable[['Training'], tuple]] = attrgetter(*INPUTS)
+    kernel: ClassVar[Kernel]
+    _metrics: Optional[tuple] = None
+
+    def __init_subclass__(cls, code: Optional[str] = None, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if 'INPUTS' in vars(cls):
+            cls._inputs = attrgetter(*cls.INPUTS)
+        if code is not None:
+            registry.register(code)(cls)
 
     def __init__(self,
                  action: int,
@@ -36,6 +196,14 @@ class Training:
         self.duration = duration
         self.weiht = weight
 
+    @classmethod
+    def compile_kernel(cls) -> Kernel:
+        """Собрать формулы класса с текущими значениями констант.
+
+        У базового класса нет формулы калорий, поэтому нет и ядра.
+        """
+        return Kernel()
+
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
         return self.action * self.LEN_STEP / self.M_IN_KM
@@ -49,20 +217,53 @@ class Training:
         raise NotImplementedError(self.__class__.__name__)
 
     def show_training_info(self) -> InfoMessage:
-        """Вернуть информационное сообщение о выполненной тренировке."""
-        return InfoMessage(self.__class__.__name__,
-                           self.duration,
+        """Вернуть информационное сообщение о выполненной тренировке.
+
+        Показатели считаются за один проход ядром класса по значениям
+        INPUTS при первом вызове; пока они не менялись, повторные
+        вызовы берут их из кэша. Классы без полного ядра считают
+        через методы get_*.
+        """
+        key = (TrainingMeta.version, self._inputs(self))
+        metrics = self._metrics
+        if metrics is None or metrics[0] != key:
+            columns = self.kernel.columns
+            if columns is None:
+                metrics = (key,
                            self.get_distance(),
                            self.get_mean_speed(),
-                           self.get_spent_calories(),)
+                           self.get_spent_calories())
+            else:
+                metrics = (key, *columns(*key[1]))
+            self._metrics = metrics
+        return InfoMessage(self.__class__.__name__,
+                           self.duration,
+                           *metrics[1:])
 
 
-class Running(Training):
+class Running(Training, code='RUN'):
     """Тренировка: бег."""
 
     CALORIES_MEAN_SPEED_MULTIPLIER: float = 18
     CALORIES_MEAN_SPEED_SHIFT: float = 1.79
 
+    @classmethod
+    def compile_kernel(cls) -> Kernel:
+        len_step = cls.LEN_STEP
+        multiplier = cls.CALORIES_MEAN_SPEED_MULTIPLIER
+        shift = cls.CALORIES_MEAN_SPEED_SHIFT
+        m_in_km = cls.M_IN_KM
+        sec_in_min = cls.SEC_IN_MIN
+
+        def columns(action, duration, weight):
+            distance = action * len_step / m_in_km
+            speed = distance / duration
+            return distance, speed, ((multiplier * speed + shift)
+                                     * weight / m_in_km
+                                     * (duration * sec_in_min))
+
+        return Kernel(columns)
+
     def get_spent_calories(self) -> float:
         duration_in_min = self.duration * self.SEC_IN_MIN
         return ((
@@ -72,12 +273,13 @@ class Running(Training):
         )
 
 
-class SportsWalking(Training):
+class SportsWalking(Training, code='WLK'):
     """Тренировка: спортивная ходьба."""
     COEF_1: float = 0.035
     COEF_2: float = 0.029
     CM_IN_M: int = 100
     DIV_FAC: float = 0.278
+    INPUTS = (*Training.INPUTS, 'height')
 
     def __init__(self, action: int,
                  duration: float,
@@ -87,6 +289,25 @@ class SportsWalking(Training):
         super().__init__(action, duration, weight)
         self.height = height
 
+    @classmethod
+    def compile_kernel(cls) -> Kernel:
+        len_step, m_in_km = cls.LEN_STEP, cls.M_IN_KM
+        coef_1, coef_2 = cls.COEF_1, cls.COEF_2
+        div_fac = cls.DIV_FAC
+        cm_in_m = cls.CM_IN_M
+        sec_in_min = cls.SEC_IN_MIN
+
+        def columns(action, duration, weight, height):
+            distance = action * len_step / m_in_km
+            speed = distance / duration
+            return distance, speed, ((coef_1 * weight
+                                      + ((speed * div_fac)**2
+                                         / (height / cm_in_m))
+                                      * coef_2 * weight)
+                                     * (duration * sec_in_min))
+
+        return Kernel(columns)
+
     def get_spent_calories(self) -> float:
         mean_speed_in_m = self.get_mean_speed() * self.DIV_FAC
         height_in_m = self.height / self.CM_IN_M
@@ -96,12 +317,13 @@ class SportsWalking(Training):
                 * self.COEF_2 * self.weiht) * duration_in_min)
 
 
-class Swimming(Training):
+class Swimming(Training, code='SWM'):
     """Тренировка: плавание."""
 
     LEN_STEP: float = 1.38
     COEF_1: float = 1.1
     COEF_2: int = 2
+    INPUTS = (*Training.INPUTS, 'length_pool', 'count_pool')
 
     def __init__(self, action: int,
                  duration: float,
@@ -113,6 +335,19 @@ class Swimming(Training):
         self.length_pool = length_pool
         self.count_pool = count_pool
 
+    @classmethod
+    def compile_kernel(cls) -> Kernel:
+        len_step, m_in_km = cls.LEN_STEP, cls.M_IN_KM
+        shift = cls.COEF_1
+        multiplier = cls.COEF_2
+
+        def columns(action, duration, weight, length_pool, count_pool):
+            speed = length_pool * count_pool / m_in_km / duration
+            return (action * len_step / m_in_km, speed,
+                    (speed + shift) * multiplier * weight * duration)
+
+        return Kernel(columns)
+
     def get_mean_speed(self) -> float:
         return (self.length_pool
                 * self.count_pool
@@ -126,15 +361,89 @@ class Swimming(Training):
                 * self.duration)
 
 
-def read_package(workout_type: str, data: list) -> Training:
+class Profile:
+    """Именованный набор коэффициентов партнёрского приложения.
+
+    overrides — константы классов по кодам тренировок, например
+    {'RUN': {'CALORIES_MEAN_SPEED_MULTIPLIER': 20}}. Для каждого кода
+    один раз создаётся подкласс с этими константами; его ядро
+    собирает TrainingMeta, а исходные классы не меняются, поэтому
+    профили можно использовать из разных потоков одновременно.
+    """
+
+    def __init__(self, name: str,
+                 overrides: Mapping[str, Mapping[str, float]]) -> None:
+        self.name = name
+        self.overrides = {code: dict(constants)
+                          for code, constants in overrides.items()}
+        self._classes: Dict[str, Tuple[Type[Training],
+                                       Type[Training]]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'Profile({self.name!r})'
+
+    def get(self, workout_type: str) -> Optional[Type[Training]]:
+        """Найти класс тренировки с коэффициентами профиля."""
+        training = registry.get(workout_type)
+        if training is None or workout_type not in self.overrides:
+            return training
+        cached = self._classes.get(workout_type)
+        if cached is not None and cached[0] is training:
+            return cached[1]
+        with self._lock:
+            cached = self._classes.get(workout_type)
+            if cached is None or cached[0] is not training:
+                cached = training, self._derive(workout_type, training)
+                self._classes[workout_type] = cached
+        return cached[1]
+
+    def _derive(self, workout_type: str,
+                training: Type[Training]) -> Type[Training]:
+        constants = self.overrides[workout_type]
+        for name in constants:
+            if not name.isupper() or not hasattr(training, name):
+                raise ValueError(
+                    f'У {training.__name__} нет коэффициента {name}.')
+        return TrainingMeta(training.__name__, (training,), {
+            **constants,
+            '__module__': training.__module__,
+            '__qualname__': training.__qualname__,
+            '__doc__': training.__doc__,
+        })
+
+
+profiles: Dict[str, Profile] = {}
+
+
+def get_profile(profile: Union[str, Profile, None]) -> Optional[Profile]:
+    """Найти профиль по имени; объект Profile и None возвращаются как есть."""
+    if profile is None or isinstance(profile, Profile):
+        return profile
+    try:
+        return profiles[profile]
+    except KeyError:
+        raise ValueError(f'Неизвестный профиль: {profile}') from None
+
+
+def add_profile(name: str,
+                overrides: Mapping[str, Mapping[str, float]]) -> Profile:
+    """Создать профиль и зарегистрировать его под именем."""
+    profiles[name] = Profile(name, overrides)
+    return profiles[name]
+
+
+def read_package(workout_type: str,
+                 data: list,
+                 profile: Union[str, Profile, None] = None,
+                 ) -> Optional[Training]:
     """Прочитать данные полученные от датчиков."""
-    training: dict[str, Type[Training]] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking,
-    }
-    if workout_type in training:
-        return training[workout_type](*data)
+    if profile is None:
+        training = registry.get(workout_type)
+    else:
+        training = get_profile(profile).get(workout_type)
+    if training is not None:
+        return training(*data)
 
 
 def main(training: Training) -> None:
@@ -143,6 +452,47 @@ def main(training: Training) -> None:
     print(info.get_message())
 
 
+LAZY: dict[str, str] = {
+    'BatchResult': 'batch',
+    'compute_batch': 'batch',
+    'compute_profiles': 'batch',
+    'TrainingTable': 'table',
+    'PackageCache': 'cache',
+    'validate': 'validate',
+    'compute_frames': 'frames',
+    'SampleSession': 'samples',
+    'compute_samples': 'samples',
+    'StorageReader': 'storage',
+    'StorageWriter': 'storage',
+    'HistoryIndex': 'index',
+    'Aggregator': 'aggregates',
+    'SessionStats': 'sketches',
+    'compute_parallel': 'parallel',
+    'TrackerServer': 'server',
+    'ComputeService': 'service',
+    'Instrumentation': 'instrument',
+}
+
+
+def __getattr__(name: str) -> object:
+    """Загрузить подсистему при первом обращении к её имени.
+
+    NumPy, asyncio и прочие тяжёлые модули не нужны для расчёта одного
+    пакета, поэтому `import homework` их не импортирует.
+    """
+    if name not in LAZY:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}')
+    from importlib import import_module
+    value = getattr(import_module(LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *LAZY})
+
+
 if __name__ == '__main__':
     packages: list[tuple[str, list[int]]] = [
         ('SWM', [720, 1, 80, 25, 40]),
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from batch import BatchResult
+from storage import METRICS, StorageReader
+
+
+class Block(NamedTuple):
+    """Блок подряд идущих строк группы с границами времени."""
+    group: int
+    start: int
+    stop: int
+    first: int
+    last: int
+
+
+@dataclass
+class Sessions(BatchResult):
+    """Результаты найденных тренировок вместе со временем."""
+    timestamp: np.ndarray
+
+
+def concat(parts: List[np.ndarray], dtype: type) -> np.ndarray:
+    """Склеить части столбца; без частей вернуть пустой массив."""
+    if not parts:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(parts)
+
+
+class HistoryIndex:
+    """Индекс тренировок по времени и пользователям.
+
+    Группы строк файла делятся на блоки по block_size строк. Для
+    каждого блока хранятся минимальное и максимальное время, для
+    каждого пользователя — номера блоков с его тренировками. Запросы
+    читают только блоки, которые могут содержать подходящие строки.
+    """
+
+    def __init__(self, reader: StorageReader, block_size: int = 4096) -> None:
+        self.reader = reader
+        self.block_size = block_size
+        self.blocks: List[Block] = []
+        self.blocks_scanned = 0
+        users: Dict[int, List[int]] = {}
+        for number, group in enumerate(reader.groups):
+            timestamps = group.column('timestamp')
+            user_column = group.column('user')
+            for start in range(0, len(group), block_size):
+                stop = min(start + block_size, len(group))
+                block = len(self.blocks)
+                self.blocks.append(Block(number, start, stop,
+                                         int(timestamps[start:stop].min()),
+                                         int(timestamps[start:stop].max())))
+                for user in np.unique(user_column[start:stop]).tolist():
+                    users.setdefault(user, []).append(block)
+        self.users: Dict[int, np.ndarray] = {
+            user: np.array(blocks) for user, blocks in users.items()}
+
+    def candidates(self, user: int, start: int, end: int,
+                   workout_type: Optional[str] = None) -> Iterator[Block]:
+        """Перебрать блоки, где могут быть тренировки за [start, end)."""
+        for number in self.users.get(user, ()):
+            block = self.blocks[number]
+            if block.last < start or block.first >= end:
+                continue
+            group = self.reader.groups[block.group]
+            if workout_type is not None and (
+                    group.workout_type != workout_type):
+                continue
+            yield block
+
+    def sessions(self, user: int, start: int, end: int,
+                 workout_type: Optional[str] = None) -> Sessions:
+        """Найти тренировки пользователя за период без создания Training."""
+        types: List[np.ndarray] = []
+        timestamps: List[np.ndarray] = []
+        metrics: Dict[str, List[np.ndarray]] = {
+            name: [] for name in ('duration', *METRICS)}
+        for block, mask in self._scan(user, start, end, workout_type):
+            group = self.reader.groups[block.group]
+            rows = slice(block.start, block.stop)
+            types.append(np.full(int(mask.sum()), group.training_type,
+                                 dtype=object))
+            timestamps.append(group.column('timestamp')[rows][mask])
+            for name, values in metrics.items():
+                values.append(group.column(name)[rows][mask])
+        return Sessions(concat(types, object),
+                        *(concat(values, np.float64)
+                          for values in metrics.values()),
+                        concat(timestamps, np.int64))
+
+    def totals(self, user: int, start: int, end: int,
+               workout_type: Optional[str] = None) -> Dict[str, float]:
+        """Посчитать число тренировок и суммы показателей за период."""
+        totals = dict.fromkeys(('duration', *METRICS), 0.0)
+        count = 0
+        for block, mask in self._scan(user, start, end, workout_type):
+            group = self.reader.groups[block.group]
+            count += int(mask.sum())
+            for name in totals:
+                column = group.column(name)[block.start:block.stop]
+                totals[name] += float(column[mask].sum())
+        return {'count': count, **totals}
+
+    def _scan(self, user: int, start: int, end: int,
+              workout_type: Optional[str]) -> Iterator[tuple]:
+        for block in self.candidates(user, start, end, workout_type):
+            self.blocks_scanned += 1
+            group = self.reader.groups[block.group]
+            timestamps = group.column('timestamp')[block.start:block.stop]
+            mask = ((group.column('user')[block.start:block.stop] == user)
+                    & (timestamps >= start) & (timestamps < end))
+            if mask.any():
+                yield block, mask
@@ -0,0 +1,263 @@
+import cProfile
+import json
+import pstats
+import sys
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from functools import wraps
+from io import StringIO
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from homework import InfoMessage, Training, WorkoutRegistry, registry
+
+BUCKETS: Tuple[float, ...] = (
+    1e-7, 2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 1e-4, 1e-3, 1e-2,
+)
+METHODS: Tuple[str, ...] = (
+    'get_distance', 'get_mean_speed', 'get_spent_calories',
+    'show_training_info',
+)
+BATCH_MODULES: Tuple[str, ...] = ('batch', 'frames', 'table')
+UNKNOWN = 'unknown'
+
+
+class Histogram:
+    """Гистограмма задержек с границами корзин BUCKETS."""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Учесть одно измерение."""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Получить накопленные счётчики по границам корзин."""
+        bounds = [repr(bound) for bound in BUCKETS] + ['+Inf']
+        result = []
+        running = 0
+        for bound, count in zip(bounds, self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+def code_name(workout_type: str) -> str:
+    """Получить имя класса тренировки по коду.
+
+    Неизвестные коды приходят с датчиков как есть, поэтому все они
+    учитываются под одним именем UNKNOWN.
+    """
+    training = registry.types.get(workout_type)
+    return training.__name__ if training is not None else UNKNOWN
+
+
+def label(value: str) -> str:
+    """Экранировать значение метки для текстового формата Prometheus."""
+    return (value.replace('\\', '\\\\')
+            .replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def method_type(args: tuple) -> str:
+    return type(args[0]).__name__
+
+
+def message_type(args: tuple) -> str:
+    return args[0].training_type
+
+
+def dispatch_type(args: tuple) -> str:
+    return code_name(args[1])
+
+
+def batch_type(args: tuple) -> str:
+    return args[0].__name__
+
+
+class Instrumentation:
+    """Счётчики и гистограммы задержек по этапам и типам тренировок.
+
+    Пока инструментирование не включено, горячий путь не меняется:
+    обёртки ставятся на методы классов только внутри блока with.
+    show_training_info и пакетные пути считают показатели ядром
+    класса, а не методами get_*, поэтому расчёт каждого класса
+    учитывается ещё и как этап kernel. Время этапа включает
+    вложенные этапы; ядро, пересобранное из-за изменения констант
+    внутри блока, больше не учитывается. Если задан profile_window,
+    раз в profile_interval секунд на profile_window секунд
+    включается cProfile. Счётчики не защищены блокировкой.
+    """
+
+    active: Optional['Instrumentation'] = None
+
+    def __init__(self,
+                 profile_window: float = 0.0,
+                 profile_interval: float = 60.0,
+                 ) -> None:
+        self.profile_window = profile_window
+        self.profile_interval = profile_interval
+        self.stages: Dict[str, Dict[str, Histogram]] = defaultdict(
+            lambda: defaultdict(Histogram))
+        self._originals: List[Tuple[Any, str, Any]] = []
+        self._profiler: Optional[cProfile.Profile] = None
+        self._profile_stats: Optional[pstats.Stats] = None
+        self._next_profile = 0.0
+        self._profile_until = 0.0
+
+    def __enter__(self) -> 'Instrumentation':
+        self.install()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.uninstall()
+
+    def install(self) -> None:
+        """Поставить обёртки на этапы обработки пакета."""
+        if Instrumentation.active is not None:
+            raise RuntimeError('Инструментирование уже включено.')
+        Instrumentation.active = self
+        self._next_profile = time.perf_counter()
+        self._patch(WorkoutRegistry, 'get', 'dispatch', dispatch_type)
+        self._patch(InfoMessage, 'get_message', 'get_message', message_type)
+        for cls in {Training, *registry.types.values()}:
+            for name in METHODS:
+                if name in vars(cls):
+                    self._patch(cls, name, name, method_type)
+            self._patch_kernel(cls)
+        for module_name in BATCH_MODULES:
+            module = sys.modules.get(module_name)
+            if module is not None and 'compute_group' in vars(module):
+                self._patch(module, 'compute_group', 'batch', batch_type)
+
+    def uninstall(self) -> None:
+        """Снять обёртки и остановить профилирование."""
+        kernels = []
+        while self._originals:
+            owner, name, original = self._originals.pop()
+            if name == 'kernel':
+                kernels.append(owner)
+            else:
+                self._set(owner, name, original)
+        # Ядро могло устареть, пока стояла обёртка, а пересобирать его
+        # можно только после того, как сняты обёртки методов get_*.
+        for owner in kernels:
+            owner.rebuild_kernel()
+        self._stop_profile()
+        Instrumentation.active = None
+
+    def snapshot(self) -> dict:
+        """Получить срез счётчиков в виде словаря."""
+        snapshot: dict = {}
+        for stage, types in self.stages.items():
+            for training_type, histogram in types.items():
+                snapshot.setdefault(stage, {})[training_type] = {
+                    'count': histogram.count,
+                    'sum': histogram.total,
+                    'buckets': dict(histogram.cumulative()),
+                }
+        return snapshot
+
+    def to_json(self) -> str:
+        """Получить срез счётчиков в JSON."""
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def to_prometheus(self, name: str = 'tracker_stage_seconds') -> str:
+        """Получить срез счётчиков в текстовом формате Prometheus."""
+        lines = [f'# HELP {name} Время этапа обработки пакета.',
+                 f'# TYPE {name} histogram']
+        for stage, types in self.stages.items():
+            for training_type, histogram in types.items():
+                labels = (f'stage="{label(stage)}",'
+                          f'training_type="{label(training_type)}"')
+                for bound, count in histogram.cumulative():
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{{labels}}} {histogram.total!r}')
+                lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def profile_stats(self) -> Optional[pstats.Stats]:
+        """Получить накопленную статистику cProfile."""
+        self._stop_profile()
+        return self._profile_stats
+
+    def profile_report(self, limit: int = 20) -> str:
+        """Получить текстовый отчёт cProfile по самым дорогим функциям."""
+        stats = self.profile_stats()
+        if stats is None:
+            return ''
+        stream = StringIO()
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    def _wrap(self, original: Callable, stage: str,
+              type_of: Callable[[tuple], str]) -> Callable:
+        histograms = self.stages[stage]
+        sample = self._sample
+
+        @wraps(original)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                histograms[type_of(args)].observe(end - start)
+                sample(end)
+
+        return wrapper
+
+    def _patch(self, owner: Any, name: str, stage: str,
+               type_of: Callable[[tuple], str]) -> None:
+        original = vars(owner)[name]
+        self._originals.append((owner, name, original))
+        self._set(owner, name, self._wrap(original, stage, type_of))
+
+    def _patch_kernel(self, cls: type) -> None:
+        kernel = cls.kernel
+        if kernel.columns is None:
+            return
+        name = cls.__name__
+        columns = self._wrap(kernel.columns, 'kernel', lambda args: name)
+        self._originals.append((cls, 'kernel', kernel))
+        self._set(cls, 'kernel', kernel._replace(columns=columns))
+
+    @staticmethod
+    def _set(owner: Any, name: str, value: Any) -> None:
+        if isinstance(owner, type):
+            # Обход TrainingMeta: обёртка не меняет результатов,
+            # поэтому сбрасывать кэши незачем.
+            type.__setattr__(owner, name, value)
+        else:
+            setattr(owner, name, value)
+
+    def _sample(self, now: float) -> None:
+        if not self.profile_window:
+            return
+        if self._profiler is not None:
+            if now >= self._profile_until:
+                self._stop_profile()
+        elif now >= self._next_profile:
+            self._profiler = cProfile.Profile()
+            self._profile_until = now + self.profile_window
+            self._next_profile = now + self.profile_interval
+            self._profiler.enable()
+
+    def _stop_profile(self) -> None:
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        if self._profile_stats is None:
+            self._profile_stats = pstats.Stats(self._profiler)
+        else:
+            self._profile_stats.add(self._profiler)
+        self._profiler = None
@@ -0,0 +1,207 @@
+"""Буферизованный вывод сообщений о тренировках.
+
+BufferedWriter копит строки и пишет их в приёмник крупными блоками,
+при background=True — из отдельного потока. Приёмник — любой
+текстовый файл; open_output открывает файл с ротацией и сжатием.
+"""
+import gzip
+import io
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, TextIO, Union
+
+from homework import InfoMessage, write_messages
+
+
+def open_text(path: Union[str, Path],
+              compression: Optional[str] = None) -> TextIO:
+    """Открыть текстовый файл для записи, при необходимости со сжатием."""
+    if compression is None:
+        return open(path, 'w', encoding='utf-8')
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as error:
+            raise RuntimeError(
+                'Для сжатия zstd установите пакет zstandard.') from error
+        stream = zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    raise ValueError(f'Неизвестное сжатие: {compression}')
+
+
+class RotatingFile(io.TextIOBase):
+    """Текстовый файл, который переименовывается при достижении размера.
+
+    Как в logging.RotatingFileHandler: path становится path.1,
+    path.1 — path.2 и так далее до backup_count. Размер считается
+    по несжатому тексту в UTF-8; блок, начатый в файле, в нём и
+    заканчивается.
+    """
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 max_bytes: int,
+                 backup_count: int = 5,
+                 compression: Optional[str] = None,
+                 ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compression = compression
+        self.size = 0
+        self._file = open_text(self.path, compression)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if self.size and self.size >= self.max_bytes:
+            self.rotate()
+        self._file.write(text)
+        self.size += len(text.encode('utf-8'))
+        return len(text)
+
+    def rotate(self) -> None:
+        """Закрыть текущий файл и начать новый."""
+        self._file.close()
+        for number in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f'{self.path.name}.{number}')
+            if source.exists():
+                os.replace(source, source.with_name(
+                    f'{self.path.name}.{number + 1}'))
+        if self.backup_count:
+            os.replace(self.path,
+                       self.path.with_name(f'{self.path.name}.1'))
+        self._file = open_text(self.path, self.compression)
+        self.size = 0
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            super().close()
+        finally:
+            self._file.close()
+
+
+def open_output(path: Union[str, Path],
+                compression: Optional[str] = None,
+                max_bytes: int = 0,
+                backup_count: int = 5,
+                ) -> TextIO:
+    """Открыть файл для результатов; max_bytes > 0 включает ротацию."""
+    if max_bytes > 0:
+        return RotatingFile(path, max_bytes, backup_count, compression)
+    return open_text(path, compression)
+
+
+class BufferedWriter:
+    """Запись текста в приёмник крупными блоками.
+
+    Строки копятся, пока их размер не превысит buffer_size символов,
+    и уходят в sink одним вызовом write. При background=True блоки
+    пишет отдельный поток, а в очереди ждут не больше max_pending
+    блоков: память ограничена примерно (max_pending + 1) * buffer_size.
+    Ошибка записи в потоке поднимается при следующем вызове writer.
+    Закрывать sink должен тот, кто его открыл.
+    """
+
+    def __init__(self,
+                 sink: TextIO,
+                 buffer_size: int = 1 << 20,
+                 background: bool = False,
+                 max_pending: int = 4,
+                 ) -> None:
+        self.sink = sink
+        self.buffer_size = buffer_size
+        self.closed = False
+        self._parts: List[str] = []
+        self._size = 0
+        self._error: Optional[BaseException] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue(max_pending)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def __enter__(self) -> 'BufferedWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, text: str) -> int:
+        """Добавить текст в буфер."""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self._emit()
+        return len(text)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.write(line)
+
+    def write_messages(self, messages: Iterable[InfoMessage]) -> None:
+        """Добавить текст сообщений о тренировках построчно."""
+        write_messages(messages, self)
+
+    def flush(self) -> None:
+        """Дописать буфер и дождаться, пока sink его примет."""
+        self._emit()
+        if self._queue is not None:
+            self._queue.join()
+        self._check()
+        self.sink.flush()
+
+    def close(self) -> None:
+        """Дописать буфер и остановить поток записи; sink остаётся открыт."""
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self.closed = True
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+
+    def _emit(self) -> None:
+        self._check()
+        if not self._parts:
+            return
+        block = ''.join(self._parts)
+        self._parts = []
+        self._size = 0
+        if self._queue is None:
+            self.sink.write(block)
+        else:
+            self._queue.put(block)
+
+    def _check(self) -> None:
+        if self.closed:
+            raise ValueError('Запись в закрытый BufferedWriter.')
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            block = self._queue.get()
+            try:
+                if block is None:
+                    return
+                if self._error is None:
+                    self.sink.write(block)
+            except BaseException as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
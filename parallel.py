@@ -0,0 +1,98 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import (Deque, Dict, Iterable, Iterator, List, Optional, Tuple,
+                    Union)
+
+from homework import InfoMessage, Profile, get_profile, read_package, registry
+from stream import Package, chunked
+
+
+Row = Tuple[str, float, float, float, float]
+Constants = Dict[str, Dict[str, float]]
+
+_profiles: Dict[str, Profile] = {}
+
+
+def coefficients(profile: Union[str, Profile, None] = None) -> Constants:
+    """Снять текущие коэффициенты всех зарегистрированных типов.
+
+    Учитываются константы, изменённые во время работы, и профиль:
+    по этому снимку исполнители считают так же, как родительский
+    процесс, при любом способе запуска процессов.
+    """
+    profile = get_profile(profile)
+    snapshot = {}
+    for code, training in registry.types.items():
+        if profile is not None:
+            training = profile.get(code)
+        snapshot[code] = {
+            name: value for name in dir(training)
+            if name.isupper()
+            and isinstance(value := getattr(training, name), (int, float))
+            and not isinstance(value, bool)}
+    return snapshot
+
+
+def chunk_profile(constants: Constants) -> Profile:
+    """Получить профиль исполнителя для снимка коэффициентов.
+
+    Профиль создаётся один раз на процесс и снимок, поэтому классы
+    с коэффициентами строятся только для первой порции.
+    """
+    key = repr(constants)
+    profile = _profiles.get(key)
+    if profile is None:
+        profile = _profiles[key] = Profile('parallel', constants)
+    return profile
+
+
+def compute_chunk(chunk: List[Package], constants: Constants) -> List[Row]:
+    """Посчитать результаты одной порции пакетов в процессе-исполнителе.
+
+    Результаты возвращаются кортежами: их передача между процессами
+    заметно дешевле, чем сериализация объектов InfoMessage.
+    """
+    profile = chunk_profile(constants)
+    rows = []
+    for workout_type, data in chunk:
+        training = read_package(workout_type, data, profile)
+        if training is not None:
+            info = training.show_training_info()
+            rows.append((info.training_type, info.duration, info.distance,
+                         info.speed, info.calories))
+    return rows
+
+
+def compute_parallel(packages: Iterable[Package],
+                     workers: Optional[int] = None,
+                     chunk_size: int = 10000,
+                     profile: Union[str, Profile, None] = None,
+                     mp_context: Optional[BaseContext] = None,
+                     ) -> Iterator[InfoMessage]:
+    """Посчитать результаты в пуле процессов, сохраняя порядок пакетов.
+
+    В работе одновременно не больше двух порций на исполнителя,
+    поэтому поток пакетов читается по мере обработки. Коэффициенты
+    классов и профиля снимаются при вызове и передаются с каждой
+    порцией: исполнители, запущенные через spawn или forkserver,
+    не видят изменений констант в родительском процессе. Пакеты с
+    неизвестным кодом обрабатываются по политике реестра ещё в
+    родительском процессе: у исполнителей свой реестр.
+    """
+    workers = workers or os.cpu_count() or 1
+    constants = coefficients(profile)
+    known = (package for package in packages
+             if registry.get(package[0]) is not None)
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=mp_context) as executor:
+        for chunk in chunked(known, chunk_size):
+            if len(pending) >= 2 * workers:
+                for row in pending.popleft().result():
+                    yield InfoMessage(*row)
+            pending.append(executor.submit(compute_chunk, chunk, constants))
+        while pending:
+            for row in pending.popleft().result():
+                yield InfoMessage(*row)
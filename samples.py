@@ -0,0 +1,168 @@
+"""Расчёт тренировок по посекундным отсчётам датчиков.
+
+Новые датчики присылают не итоговый пакет, а отсчёты: число шагов
+или гребков (и для плавания — пройденных бассейнов) за каждый
+интервал. Счётчики накапливаются np.cumsum, а показатели на каждом
+отсчёте считает ядро класса тренировки (Training.kernel) — те же
+формулы, что у read_package и пакетного расчёта.
+
+SampleSession принимает отсчёты частями и обновляет показатели,
+не пересчитывая уже принятые; compute_samples считает всю запись
+сразу.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Type
+
+import numpy as np
+
+from homework import InfoMessage, Swimming, Training, registry
+
+SEC_IN_HOUR = 3600
+COUNTERS: Dict[Type[Training], Tuple[str, ...]] = {
+    Training: ('action',),
+    Swimming: ('action', 'count_pool'),
+}
+SPLITS: Dict[Type[Training], str] = {
+    Training: 'distance',
+    Swimming: 'count_pool',
+}
+
+
+def lookup(table: dict, cls: Type[Training]):
+    """Найти значение для класса или ближайшего его предка."""
+    for klass in cls.__mro__:
+        if klass in table:
+            return table[klass]
+    raise KeyError(cls.__name__)
+
+
+@dataclass
+class SampleResult:
+    """Показатели на каждом отсчёте части записи.
+
+    duration, distance, speed и calories — накопленные с начала
+    тренировки значения; splits — длительности отрезков (км или
+    бассейнов), завершившихся в этой части, в часах.
+    """
+    duration: np.ndarray
+    distance: np.ndarray
+    speed: np.ndarray
+    calories: np.ndarray
+    splits: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+
+class SampleSession:
+    """Тренировка, показатели которой обновляются по мере прихода отсчётов.
+
+    Счётчики (COUNTERS: шаги, гребки, бассейны) передаются в update
+    массивами отсчётов за interval секунд; остальные поля
+    конструктора класса — вес, рост, длина бассейна — задаются один
+    раз при создании. Отрезки (SPLITS) считаются по дистанции в км,
+    а для плавания — по числу бассейнов.
+    """
+
+    def __init__(self,
+                 workout_type: str,
+                 interval: float = 1.0,
+                 **params: float) -> None:
+        self.cls = registry.types.get(workout_type)
+        if self.cls is None:
+            raise ValueError(f'Неизвестный тип тренировки: {workout_type}')
+        if self.cls.kernel.columns is None:
+            raise ValueError(
+                f'Для {self.cls.__name__} нет ядра для расчёта по отсчётам.')
+        self.workout_type = workout_type
+        self.interval = interval
+        self.fields = registry.fields[workout_type]
+        self.counters = lookup(COUNTERS, self.cls)
+        self.split_by = lookup(SPLITS, self.cls)
+        expected = set(self.fields) - {'duration', *self.counters}
+        if set(params) != expected:
+            raise TypeError(
+                f'Нужны поля {", ".join(sorted(expected))}, '
+                f'получены {", ".join(sorted(params))}.')
+        self.params = params
+        self.totals = dict.fromkeys(self.counters, 0.0)
+        self.count = 0
+        self.splits: List[float] = []
+        self._split_start = 0.0
+        self._next_split = 1
+        self._last = (0.0, 0.0, 0.0)
+
+    @property
+    def duration(self) -> float:
+        """Длительность принятой записи в часах."""
+        return self.count * self.interval / SEC_IN_HOUR
+
+    def update(self, **samples: np.ndarray) -> SampleResult:
+        """Принять очередную часть отсчётов по всем счётчикам."""
+        if set(samples) != set(self.counters):
+            raise TypeError(
+                f'Нужны отсчёты по полям: {", ".join(self.counters)}.')
+        cumulative = {}
+        for name in self.counters:
+            values = np.asarray(samples[name], dtype=np.float64)
+            if values.ndim != 1:
+                raise ValueError(f'Отсчёты {name} должны быть одномерными.')
+            cumulative[name] = np.cumsum(values) + self.totals[name]
+        size = len(cumulative[self.counters[0]])
+        if any(len(values) != size for values in cumulative.values()):
+            raise ValueError('Число отсчётов должно совпадать у счётчиков.')
+        duration = ((np.arange(1, size + 1, dtype=np.float64) + self.count)
+                    * self.interval / SEC_IN_HOUR)
+        arguments = [duration if name == 'duration'
+                     else cumulative.get(name, self.params.get(name))
+                     for name in self.fields]
+        distance, speed, calories = self.cls.kernel.columns(*arguments)
+        splits = self._update_splits(
+            distance if self.split_by == 'distance'
+            else cumulative[self.split_by], duration)
+
+        if size:
+            self.count += size
+            for name in self.counters:
+                self.totals[name] = float(cumulative[name][-1])
+            self._last = (float(distance[-1]), float(speed[-1]),
+                          float(calories[-1]))
+        return SampleResult(duration, distance, speed, calories, splits)
+
+    def _update_splits(self, progress: np.ndarray,
+                       duration: np.ndarray) -> np.ndarray:
+        if not len(progress) or progress[-1] < self._next_split:
+            return np.empty(0)
+        bounds = np.arange(self._next_split, np.floor(progress[-1]) + 1)
+        ends = duration[np.searchsorted(progress, bounds)]
+        splits = np.diff(ends, prepend=self._split_start)
+        self._split_start = float(ends[-1])
+        self._next_split += len(bounds)
+        self.splits.extend(splits.tolist())
+        return splits
+
+    def show_training_info(self) -> InfoMessage:
+        """Вернуть сообщение по всей принятой записи."""
+        return InfoMessage(self.cls.__name__, self.duration, *self._last)
+
+
+def compute_samples(workout_type: str,
+                    interval: float = 1.0,
+                    **fields: np.ndarray) -> Tuple[SampleResult, InfoMessage]:
+    """Посчитать показатели по полной записи отсчётов.
+
+    Счётчики передаются массивами, остальные поля — числами:
+    compute_samples('RUN', action=steps, weight=75).
+    """
+    cls = registry.types.get(workout_type)
+    if cls is None:
+        raise ValueError(f'Неизвестный тип тренировки: {workout_type}')
+    counters = lookup(COUNTERS, cls)
+    session = SampleSession(
+        workout_type, interval,
+        **{name: value for name, value in fields.items()
+           if name not in counters})
+    result = session.update(
+        **{name: value for name, value in fields.items()
+           if name in counters})
+    return result, session.show_training_info()
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import json
+import signal
+from typing import Any, List, Optional, Set, Tuple
+
+from batch import compute_batch
+from homework import InfoMessage, read_package, registry
+from stream import info_record
+from validate import check_group
+
+Request = Tuple[str, list, Any, asyncio.Future]
+
+
+def parse_request(line: bytes) -> Tuple[str, list, Any]:
+    """Разобрать строку JSON с пакетом и проверить его.
+
+    Строка — объект {"workout_type": ..., "data": [...], "id": ...}
+    или пара [workout_type, data]; поле id необязательно. Типы и
+    диапазоны значений проверяются так же, как в validate, чтобы
+    некорректный пакет не попал в общий пакетный расчёт.
+    """
+    record = json.loads(line)
+    if isinstance(record, dict):
+        workout_type, data = record['workout_type'], record['data']
+        request_id = record.get('id')
+    else:
+        (workout_type, data), request_id = record, None
+    if workout_type not in registry.types:
+        raise ValueError(f'Неизвестный тип тренировки: {workout_type}')
+    if not isinstance(data, list) or (
+            len(data) != registry.arity[workout_type]):
+        raise ValueError(f'Пакет {workout_type} должен содержать '
+                         f'{registry.arity[workout_type]} значений.')
+    for _, reason, field in check_group(workout_type, [0], [data]):
+        raise ValueError(f'Пакет {workout_type}: недопустимое значение '
+                         f'поля {field} ({reason}).')
+    return workout_type, data, request_id
+
+
+def encode(record: dict) -> bytes:
+    """Оформить ответ строкой JSON; NaN и бесконечность — ошибка."""
+    return json.dumps(record, ensure_ascii=False,
+                      allow_nan=False).encode() + b'\n'
+
+
+def respond(info: InfoMessage, request_id: Any) -> bytes:
+    """Оформить ответ с результатом расчёта пакета."""
+    record = info_record(info)
+    record['message'] = info.get_message()
+    if request_id is not None:
+        record['id'] = request_id
+    return encode(record)
+
+
+class TrackerServer:
+    """Асинхронный сервер приёма пакетов от трекеров.
+
+    Пакеты, пришедшие за window секунд, считаются одним пакетным
+    расчётом; если он не удался, пакеты окна считаются по одному,
+    и ошибку получают только вызвавшие её пакеты. Ответы в каждом
+    соединении идут в порядке запросов.
+    Одновременно в работе не больше max_in_flight пакетов: пока
+    ответы не отправлены, новые строки из сокетов не читаются.
+    """
+
+    def __init__(self,
+                 window: float = 0.002,
+                 max_batch: int = 4096,
+                 max_in_flight: int = 10000,
+                 ) -> None:
+        self.window = window
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self.batches = 0
+        self.packages = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._readers: Set[asyncio.Task] = set()
+        self._handlers: Set[asyncio.Task] = set()
+
+    async def start(self,
+                    host: str = '127.0.0.1',
+                    port: int = 0,
+                    path: Optional[str] = None,
+                    ) -> None:
+        """Начать приём соединений по TCP или через Unix-сокет."""
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._batcher = asyncio.ensure_future(self._batch())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle, host, port)
+
+    @property
+    def address(self) -> Any:
+        """Адрес, на котором сервер принимает соединения."""
+        return self._server.sockets[0].getsockname()
+
+    async def stop(self) -> None:
+        """Остановиться, дописав ответы на уже принятые пакеты."""
+        self._server.close()
+        for reader in list(self._readers):
+            reader.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._queue.put_nowait(None)
+        await self._batcher
+
+    async def serve_forever(self) -> None:
+        """Работать до SIGINT или SIGTERM, затем остановиться."""
+        loop = asyncio.get_running_loop()
+        stopping = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopping.set)
+        await stopping.wait()
+        await self.stop()
+
+    async def _handle(self,
+                      reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter,
+                      ) -> None:
+        self._handlers.add(asyncio.current_task())
+        responses: asyncio.Queue = asyncio.Queue()
+        reading = asyncio.ensure_future(self._read(reader, responses))
+        self._readers.add(reading)
+        reading.add_done_callback(self._readers.discard)
+        reading.add_done_callback(lambda _: responses.put_nowait(None))
+        try:
+            while True:
+                future = await responses.get()
+                if future is None:
+                    break
+                try:
+                    writer.write(await future)
+                    await writer.drain()
+                finally:
+                    self._slots.release()
+        except ConnectionError:
+            pass
+        finally:
+            reading.cancel()
+            while not responses.empty():
+                if responses.get_nowait() is not None:
+                    self._slots.release()
+            writer.close()
+            self._handlers.discard(asyncio.current_task())
+
+    async def _read(self,
+                    reader: asyncio.StreamReader,
+                    responses: asyncio.Queue,
+                    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                line = await reader.readline()
+            except (ValueError, ConnectionError):
+                return
+            if not line:
+                return
+            if not line.strip():
+                continue
+            await self._slots.acquire()
+            future = loop.create_future()
+            responses.put_nowait(future)
+            try:
+                workout_type, data, request_id = parse_request(line)
+            except (ValueError, KeyError, TypeError) as error:
+                future.set_result(encode({'error': str(error)}))
+                continue
+            self._queue.put_nowait((workout_type, data, request_id, future))
+
+    async def _batch(self) -> None:
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            if self.window:
+                await asyncio.sleep(self.window)
+            requests = [first]
+            stopping = False
+            while len(requests) < self.max_batch and not self._queue.empty():
+                request = self._queue.get_nowait()
+                if request is None:
+                    stopping = True
+                    break
+                requests.append(request)
+            self._compute(requests)
+            if stopping:
+                return
+
+    def _compute(self, requests: List[Request]) -> None:
+        self.batches += 1
+        self.packages += len(requests)
+        try:
+            infos = list(compute_batch(
+                (workout_type, data) for workout_type, data, _, _ in requests
+            ).messages())
+        except Exception:
+            infos = None
+        if infos is not None and len(infos) != len(requests):
+            infos = None
+        for index, (workout_type, data, request_id, future) in enumerate(
+                requests):
+            try:
+                info = (infos[index] if infos is not None else
+                        read_package(workout_type, data).show_training_info())
+                response = respond(info, request_id)
+            except Exception as error:
+                response = encode({'error': str(error)})
+            if not future.done():
+                future.set_result(response)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Сервер приёма пакетов фитнес-трекера.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='путь к Unix-сокету вместо TCP')
+    parser.add_argument('--window-ms', type=float, default=2.0,
+                        help='окно накопления пакетов, мс')
+    parser.add_argument('--max-batch', type=int, default=4096)
+    parser.add_argument('--max-in-flight', type=int, default=10000)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Запустить сервер с параметрами командной строки."""
+    server = TrackerServer(args.window_ms / 1000, args.max_batch,
+                           args.max_in_flight)
+    await server.start(args.host, args.port, args.unix)
+    await server.serve_forever()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,256 @@
+"""Встраиваемый сервис расчёта для многопоточных приложений.
+
+Потоки обработчиков запросов вызывают submit и получают BatchFuture,
+а один рабочий поток собирает пакеты из всех потоков в пачки и
+считает их через compute_profiles. Пачка уходит в расчёт, когда
+в ней max_batch пакетов или когда первый пакет ждёт max_wait секунд.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from batch import BatchResult, compute_profiles
+from homework import InfoMessage, Profile, read_package, registry
+
+Task = Tuple[Union[str, Profile, None], str, Sequence[float]]
+
+
+class MicroBatch:
+    """Пакеты одной пачки, их результаты и событие готовности.
+
+    Одно событие на пачку вместо условия на каждый пакет: ожидающие
+    потоки просыпаются вместе, когда пачка посчитана.
+    """
+
+    __slots__ = ('tasks', 'results', 'errors', 'created', 'ready')
+
+    def __init__(self) -> None:
+        self.tasks: List[Task] = []
+        self.results: List[Optional[InfoMessage]] = []
+        self.errors: Dict[int, BaseException] = {}
+        self.created = time.monotonic()
+        self.ready = threading.Event()
+
+
+class BatchFuture:
+    """Результат одного пакета из пачки.
+
+    Повторяет основные методы concurrent.futures.Future: result,
+    exception и done.
+    """
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: MicroBatch, index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    def done(self) -> bool:
+        return self._batch.ready.is_set()
+
+    def exception(self, timeout: Optional[float] = None,
+                  ) -> Optional[BaseException]:
+        """Дождаться пачки и вернуть ошибку расчёта пакета или None."""
+        if not self._batch.ready.wait(timeout):
+            raise TimeoutError('Пачка не посчитана за отведённое время.')
+        return self._batch.errors.get(self._index)
+
+    def result(self, timeout: Optional[float] = None,
+               ) -> Optional[InfoMessage]:
+        """Дождаться пачки и вернуть сообщение о тренировке."""
+        error = self.exception(timeout)
+        if error is not None:
+            raise error
+        return self._batch.results[self._index]
+
+
+def finished(result: Any = None,
+             error: Optional[BaseException] = None) -> BatchFuture:
+    """Получить готовый результат для пакета, не попавшего в пачку."""
+    batch = MicroBatch()
+    batch.results.append(result)
+    if error is not None:
+        batch.errors[0] = error
+    batch.ready.set()
+    return BatchFuture(batch, 0)
+
+
+def finite(result: BatchResult) -> bool:
+    """Проверить, что все посчитанные показатели конечны."""
+    return bool(np.isfinite(result.distance).all()
+                and np.isfinite(result.speed).all()
+                and np.isfinite(result.calories).all())
+
+
+class ComputeService:
+    """Рабочий поток, считающий пакеты из разных потоков пачками.
+
+    Пакет с неизвестным кодом обрабатывается по политике реестра
+    сразу в submit: результат — None или ошибка; так же сразу
+    отклоняются пакеты с неверным числом значений. Если пачка не
+    посчиталась целиком или в ней есть бесконечность или NaN (так
+    NumPy отвечает на деление на ноль), её пакеты считаются по
+    одному, и ошибка достаётся только тем пакетам, которые её
+    вызвали. При
+    max_queue > 0 submit ждёт, пока в очереди не освободится место.
+
+    Метрики для подбора max_batch и max_wait: queue_depth — пакеты
+    в очереди, peak_queue_depth — наибольшая очередь перед сбором
+    пачки, fill_ratio — средняя заполненность пачек.
+    """
+
+    def __init__(self,
+                 max_batch: int = 1024,
+                 max_wait: float = 0.002,
+                 max_queue: int = 0,
+                 ) -> None:
+        if max_batch < 1:
+            raise ValueError('Размер пачки должен быть положительным.')
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.batches = 0
+        self.packages = 0
+        self.peak_queue_depth = 0
+        self.closed = False
+        self._pending = 0
+        self._queue: Deque[MicroBatch] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._space = threading.Condition(self._lock)
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='compute-service')
+        self._thread.start()
+
+    def __enter__(self) -> 'ComputeService':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def queue_depth(self) -> int:
+        """Число пакетов, ждущих расчёта."""
+        return self._pending
+
+    @property
+    def fill_ratio(self) -> float:
+        """Средняя доля заполнения пачек от max_batch."""
+        if not self.batches:
+            return 0.0
+        return self.packages / (self.batches * self.max_batch)
+
+    def metrics(self) -> dict:
+        """Получить срез метрик сервиса."""
+        with self._lock:
+            return {'queue_depth': self._pending,
+                    'peak_queue_depth': self.peak_queue_depth,
+                    'batches': self.batches,
+                    'packages': self.packages,
+                    'fill_ratio': self.fill_ratio}
+
+    def submit(self,
+               workout_type: str,
+               data: Sequence[float],
+               profile: Union[str, Profile, None] = None,
+               ) -> BatchFuture:
+        """Поставить пакет в очередь и вернуть его будущий результат."""
+        if workout_type not in registry.types:
+            try:
+                registry.get(workout_type)
+            except ValueError as error:
+                return finished(error=error)
+            return finished()
+        if len(data) != registry.arity[workout_type]:
+            return finished(error=ValueError(
+                f'Пакет {workout_type} должен содержать '
+                f'{registry.arity[workout_type]} значений.'))
+        with self._lock:
+            while self.max_queue and self._pending >= self.max_queue:
+                if self.closed:
+                    break
+                self._space.wait()
+            if self.closed:
+                raise RuntimeError('Сервис расчёта остановлен.')
+            queue = self._queue
+            if not queue or len(queue[-1].tasks) >= self.max_batch:
+                queue.append(MicroBatch())
+            batch = queue[-1]
+            batch.tasks.append((profile, workout_type, data))
+            self._pending += 1
+            size = len(batch.tasks)
+            if size == 1 or size == self.max_batch:
+                self._wakeup.notify()
+        return BatchFuture(batch, size - 1)
+
+    def compute(self,
+                workout_type: str,
+                data: Sequence[float],
+                profile: Union[str, Profile, None] = None,
+                timeout: Optional[float] = None,
+                ) -> Optional[InfoMessage]:
+        """Посчитать пакет и дождаться результата."""
+        return self.submit(workout_type, data, profile).result(timeout)
+
+    def close(self) -> None:
+        """Досчитать принятые пакеты и остановить рабочий поток."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._wakeup.notify()
+            self._space.notify_all()
+        self._thread.join()
+
+    def _next_batch(self) -> Optional[MicroBatch]:
+        with self._lock:
+            while not self._queue:
+                if self.closed:
+                    return None
+                self._wakeup.wait()
+            self.peak_queue_depth = max(self.peak_queue_depth,
+                                        self._pending)
+            first = self._queue[0]
+            deadline = first.created + self.max_wait
+            while len(first.tasks) < self.max_batch and not self.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wakeup.wait(remaining)
+            batch = self._queue.popleft()
+            self._pending -= len(batch.tasks)
+            self.batches += 1
+            self.packages += len(batch.tasks)
+            self._space.notify_all()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._compute(batch)
+            finally:
+                batch.ready.set()
+
+    @staticmethod
+    def _compute(batch: MicroBatch) -> None:
+        try:
+            with np.errstate(all='ignore'):
+                result = compute_profiles(batch.tasks)
+        except Exception:
+            result = None
+        if result is not None and finite(result):
+            batch.results = list(result.messages())
+            return
+        batch.results = [None] * len(batch.tasks)
+        for index, (profile, workout_type, data) in enumerate(batch.tasks):
+            try:
+                batch.results[index] = read_package(
+                    workout_type, data, profile).show_training_info()
+            except Exception as error:
+                batch.errors[index] = error
@@ -0,0 +1,380 @@
+"""Приближённая потоковая статистика по результатам тренировок.
+
+QuantileSketch — скетч KLL для квантилей, HeavyHitters — Space-Saving
+для лидеров по сумме значения. Оба занимают ограниченную память,
+объединяются методом merge и сохраняются в словарь для JSON
+(to_dict / from_dict), поэтому итоги отдельных процессов можно
+собирать вместе. SessionStats считает на них p50/p90/p99 скорости
+и калорий по типам тренировок и лидеров недели по дистанции.
+"""
+import heapq
+import math
+import random
+from datetime import date, datetime
+from itertools import count
+from typing import (Dict, Hashable, Iterable, List, Optional, Sequence,
+                    Tuple, Union)
+
+import numpy as np
+
+from aggregates import PERIODS
+from batch import BatchResult
+from homework import InfoMessage
+
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+QUANTILE_METRICS: Tuple[str, ...] = ('speed', 'calories')
+SHRINK = 2 / 3
+
+
+class QuantileSketch:
+    """Скетч KLL: квантили потока значений в памяти O(k).
+
+    Ошибка по рангу — порядка 1.7 / k от числа значений: при k=200
+    p99 выборки из миллиона значений попадает между истинными
+    p98 и p100. Уровень h хранит значения с весом 2**h; переполненный
+    уровень сортируется, и каждое второе значение со случайным
+    сдвигом переходит на уровень выше.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError('Точность k должна быть не меньше 8.')
+        self.k = k
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._pending: List[float] = []
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.count + len(self._pending)
+
+    def add(self, value: float) -> None:
+        """Учесть одно значение."""
+        self._pending.append(value)
+        if len(self._pending) >= self.k:
+            self._flush()
+
+    def update(self, values: Union[Sequence[float], np.ndarray]) -> None:
+        """Учесть массив значений за один проход."""
+        self._flush()
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Добавить скетч другого обработчика с тем же k."""
+        if other.k != self.k:
+            raise ValueError('Объединять можно скетчи с одинаковым k.')
+        self._flush()
+        other._flush()
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def quantile(self, q: Union[float, Sequence[float]],
+                 ) -> Union[float, np.ndarray]:
+        """Получить приближённые квантили q из отрезка [0, 1]."""
+        self._flush()
+        if not self.count:
+            raise ValueError('Скетч пуст.')
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        ranks = np.cumsum(weights[order])
+        targets = np.asarray(q, dtype=np.float64) * self.count
+        index = np.minimum(np.searchsorted(ranks, targets), len(values) - 1)
+        result = values[index]
+        result = np.where(np.asarray(q) <= 0, self.min, result)
+        result = np.where(np.asarray(q) >= 1, self.max, result)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def to_dict(self) -> dict:
+        """Сохранить скетч в словарь из чисел и списков."""
+        self._flush()
+        return {'k': self.k, 'count': self.count,
+                'min': self.min, 'max': self.max,
+                'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'QuantileSketch':
+        """Восстановить скетч из словаря to_dict."""
+        sketch = cls(state['k'])
+        sketch.count = state['count']
+        sketch.min = state['min']
+        sketch.max = state['max']
+        sketch.levels = [np.array(items, dtype=np.float64)
+                         for items in state['levels']]
+        return sketch
+
+    def capacity(self, level: int) -> int:
+        """Получить вместимость уровня: чем ниже уровень, тем меньше."""
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * SHRINK ** depth))
+
+    def _flush(self) -> None:
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.update(pending)
+
+    def _compress(self) -> None:
+        while sum(map(len, self.levels)) > sum(
+                map(self.capacity, range(len(self.levels)))):
+            level = next(level for level, items in enumerate(self.levels)
+                         if len(items) > self.capacity(level))
+            items = np.sort(self.levels[level])
+            odd = len(items) % 2
+            promoted = items[odd + self._random.randrange(2)::2]
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = items[:odd]
+            self.levels[level + 1] = np.concatenate(
+                [self.levels[level + 1], promoted])
+
+
+class HeavyHitters:
+    """Space-Saving: ключи с наибольшей суммой весов в памяти O(capacity).
+
+    Для каждого ключа хранится оценка суммы сверху и её возможное
+    завышение error. Ключ с суммой больше total / capacity
+    гарантированно есть в скетче. Новый ключ в заполненном скетче
+    вытесняет ключ с наименьшей суммой и наследует её как ошибку.
+    """
+
+    def __init__(self, capacity: int = 100) -> None:
+        if capacity < 1:
+            raise ValueError('Вместимость должна быть положительной.')
+        self.capacity = capacity
+        self.total = 0.0
+        self.counts: Dict[Hashable, float] = {}
+        self.errors: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._order = count()
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, key: Hashable, weight: float = 1.0) -> None:
+        """Добавить вес ключу."""
+        self.total += weight
+        counts = self.counts
+        if key in counts:
+            counts[key] += weight
+        elif len(counts) < self.capacity:
+            counts[key] = weight
+            self.errors[key] = 0.0
+        else:
+            minimum, victim = self._pop_min()
+            del counts[victim], self.errors[victim]
+            counts[key] = minimum + weight
+            self.errors[key] = minimum
+        heapq.heappush(self._heap, (counts[key], next(self._order), key))
+        if len(self._heap) > 4 * self.capacity + 64:
+            self._rebuild()
+
+    def update(self, keys: Iterable[Hashable],
+               weights: Optional[Iterable[float]] = None) -> None:
+        """Добавить веса пачке ключей, сложив повторы заранее."""
+        totals: Dict[Hashable, float] = {}
+        if weights is None:
+            for key in keys:
+                totals[key] = totals.get(key, 0.0) + 1.0
+        else:
+            for key, weight in zip(keys, weights):
+                totals[key] = totals.get(key, 0.0) + weight
+        for key, weight in totals.items():
+            self.add(key, weight)
+
+    def minimum(self) -> float:
+        """Получить наименьшую сумму, если скетч заполнен, иначе 0."""
+        if len(self.counts) < self.capacity:
+            return 0.0
+        return min(self.counts.values())
+
+    def top(self, n: int = 10) -> List[Tuple[Hashable, float, float]]:
+        """Получить n ключей с наибольшими суммами: (ключ, сумма, ошибка)."""
+        keys = heapq.nlargest(n, self.counts, key=self.counts.__getitem__)
+        return [(key, self.counts[key], self.errors[key]) for key in keys]
+
+    def merge(self, other: 'HeavyHitters') -> None:
+        """Добавить скетч другого обработчика.
+
+        Ключу, которого нет в одном из скетчей, добавляется его
+        минимум: сумма по-прежнему оценивается сверху.
+        """
+        own, foreign = self.minimum(), other.minimum()
+        counts: Dict[Hashable, float] = {}
+        errors: Dict[Hashable, float] = {}
+        for key in {**self.counts, **other.counts}:
+            counts[key] = (self.counts.get(key, own)
+                           + other.counts.get(key, foreign))
+            errors[key] = (self.errors.get(key, own)
+                           + other.errors.get(key, foreign))
+        keys = heapq.nlargest(self.capacity, counts, key=counts.__getitem__)
+        self.counts = {key: counts[key] for key in keys}
+        self.errors = {key: errors[key] for key in keys}
+        self.total += other.total
+        self._rebuild()
+
+    def to_dict(self) -> dict:
+        """Сохранить скетч в словарь из чисел и списков."""
+        return {'capacity': self.capacity, 'total': self.total,
+                'items': [[key, self.counts[key], self.errors[key]]
+                          for key in self.counts]}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'HeavyHitters':
+        """Восстановить скетч из словаря to_dict."""
+        sketch = cls(state['capacity'])
+        sketch.total = state['total']
+        for key, value, error in state['items']:
+            sketch.counts[key] = value
+            sketch.errors[key] = error
+        sketch._rebuild()
+        return sketch
+
+    def _pop_min(self) -> Tuple[float, Hashable]:
+        while True:
+            value, _, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == value:
+                return value, key
+
+    def _rebuild(self) -> None:
+        self._heap = [(value, next(self._order), key)
+                      for key, value in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+class SessionStats:
+    """Квантили показателей по типам тренировок и лидеры недели.
+
+    Принимает сообщения show_training_info (add) и результаты
+    пакетного расчёта (add_batch). Лидеры считаются по сумме
+    дистанции пользователя за ISO-неделю, если переданы
+    пользователь и дата тренировки.
+    """
+
+    def __init__(self,
+                 k: int = 200,
+                 capacity: int = 100,
+                 metrics: Tuple[str, ...] = QUANTILE_METRICS,
+                 ) -> None:
+        self.k = k
+        self.capacity = capacity
+        self.metrics = metrics
+        self.quantiles: Dict[Tuple[str, str], QuantileSketch] = {}
+        self.leaders: Dict[str, HeavyHitters] = {}
+
+    def add(self, info: InfoMessage,
+            user: Optional[Hashable] = None,
+            day: Union[date, datetime, None] = None) -> None:
+        """Учесть одно сообщение о тренировке."""
+        for metric in self.metrics:
+            self._quantiles(info.training_type, metric).add(
+                getattr(info, metric))
+        if user is not None:
+            self._leaders(day).add(user, info.distance)
+
+    def add_batch(self, result: BatchResult,
+                  users: Optional[Sequence[Hashable]] = None,
+                  days: Optional[Sequence[Union[date, datetime]]] = None,
+                  ) -> None:
+        """Учесть результат пакетного расчёта одним проходом на тип."""
+        types = result.training_type
+        for training_type in set(types.tolist()):
+            mask = types == training_type
+            for metric in self.metrics:
+                self._quantiles(training_type, metric).update(
+                    getattr(result, metric)[mask])
+        if users is None:
+            return
+        weeks: Dict[str, Tuple[list, list]] = {}
+        for user, day, distance in zip(users, days,
+                                       result.distance.tolist()):
+            keys, weights = weeks.setdefault(week_of(day), ([], []))
+            keys.append(user)
+            weights.append(distance)
+        for week, (keys, weights) in weeks.items():
+            self._leaders(week).update(keys, weights)
+
+    def quantile(self, training_type: str, metric: str,
+                 q: Union[float, Sequence[float]] = QUANTILES,
+                 ) -> Union[float, np.ndarray]:
+        """Получить квантили показателя, по умолчанию p50, p90 и p99."""
+        sketch = self.quantiles.get((training_type, metric))
+        if sketch is None:
+            raise KeyError((training_type, metric))
+        return sketch.quantile(q)
+
+    def top_users(self, week: Union[str, date, datetime],
+                  n: int = 10) -> List[Tuple[Hashable, float, float]]:
+        """Получить лидеров недели: (пользователь, дистанция, ошибка)."""
+        sketch = self.leaders.get(
+            week if isinstance(week, str) else week_of(week))
+        return [] if sketch is None else sketch.top(n)
+
+    def merge(self, other: 'SessionStats') -> None:
+        """Добавить статистику другого обработчика."""
+        for key, sketch in other.quantiles.items():
+            self._quantiles(*key).merge(sketch)
+        for week, sketch in other.leaders.items():
+            self._leaders(week).merge(sketch)
+
+    def to_dict(self) -> dict:
+        """Сохранить статистику в словарь для JSON."""
+        return {'k': self.k, 'capacity': self.capacity,
+                'metrics': list(self.metrics),
+                'quantiles': [[training_type, metric, sketch.to_dict()]
+                              for (training_type, metric), sketch
+                              in self.quantiles.items()],
+                'leaders': {week: sketch.to_dict()
+                            for week, sketch in self.leaders.items()}}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'SessionStats':
+        """Восстановить статистику из словаря to_dict."""
+        stats = cls(state['k'], state['capacity'], tuple(state['metrics']))
+        for training_type, metric, sketch in state['quantiles']:
+            stats.quantiles[training_type, metric] = (
+                QuantileSketch.from_dict(sketch))
+        for week, sketch in state['leaders'].items():
+            stats.leaders[week] = HeavyHitters.from_dict(sketch)
+        return stats
+
+    def _quantiles(self, training_type: str, metric: str) -> QuantileSketch:
+        sketch = self.quantiles.get((training_type, metric))
+        if sketch is None:
+            sketch = self.quantiles[training_type, metric] = (
+                QuantileSketch(self.k))
+        return sketch
+
+    def _leaders(self, day: Union[str, date, datetime, None],
+                 ) -> HeavyHitters:
+        week = day if isinstance(day, str) else week_of(day)
+        sketch = self.leaders.get(week)
+        if sketch is None:
+            sketch = self.leaders[week] = HeavyHitters(self.capacity)
+        return sketch
+
+
+def week_of(day: Union[date, datetime, None]) -> str:
+    """Получить ISO-неделю даты, например '2024-W05'."""
+    if day is None:
+        raise ValueError('Для лидеров недели нужна дата тренировки.')
+    if isinstance(day, datetime):
+        day = day.date()
+    return PERIODS['week'](day)
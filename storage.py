@@ -0,0 +1,187 @@
+"""Двоичный столбцовый формат для истории тренировок.
+
+Устройство файла (все числа little-endian):
+
+    b'FTRK' | версия u16 | 2 байта резерва
+    группы строк: столбцы фиксированной ширины, выровненные по 8 байт
+    оглавление в JSON (UTF-8)
+    длина оглавления u64 | b'FTRK'
+
+Группа строк содержит тренировки одного типа, записанные одним
+вызовом StorageWriter.write, упорядоченные по timestamp. В оглавлении
+для каждой группы указаны код и класс тренировки, число строк
+и смещение каждого столбца.
+Столбцы группы: user (u64), timestamp (i64, секунды Unix), исходные
+поля пакета по параметрам конструктора класса (f8) и посчитанные
+distance, speed, calories (f8).
+"""
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from batch import compute_columns
+from homework import registry
+
+MAGIC = b'FTRK'
+VERSION = 1
+HEADER = struct.Struct('<4sHxx')
+TRAILER = struct.Struct('<Q4s')
+ALIGN = 8
+METRICS = ('distance', 'speed', 'calories')
+DTYPES = {'user': '<u8', 'timestamp': '<i8'}
+
+
+def input_fields(workout_type: str) -> List[str]:
+    """Получить имена полей пакета по конструктору класса тренировки."""
+    return list(registry.fields[workout_type])
+
+
+class StorageWriter:
+    """Запись тренировок в двоичный столбцовый файл группами строк."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.groups: List[dict] = []
+        self._file: BinaryIO = open(self.path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def __enter__(self) -> 'StorageWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self,
+              workout_type: str,
+              data: Sequence[Sequence[float]],
+              users: Sequence[int],
+              timestamps: Sequence[int],
+              ) -> None:
+        """Посчитать и записать группу тренировок одного типа.
+
+        Строки группы упорядочиваются по времени тренировки.
+        """
+        if workout_type not in registry.types:
+            raise ValueError(f'Неизвестный тип тренировки: {workout_type}')
+        fields = input_fields(workout_type)
+        matrix = np.asarray(data, dtype=np.float64).reshape(-1, len(fields))
+        if not len(matrix) == len(users) == len(timestamps):
+            raise ValueError('Длины столбцов не совпадают.')
+        timestamps = np.asarray(timestamps, dtype=DTYPES['timestamp'])
+        order = np.argsort(timestamps, kind='stable')
+        matrix = matrix[order]
+        columns: Dict[str, np.ndarray] = {
+            'user': np.asarray(users, dtype=DTYPES['user'])[order],
+            'timestamp': timestamps[order],
+        }
+        for index, name in enumerate(fields):
+            columns[name] = matrix[:, index]
+        columns.update(zip(METRICS, compute_columns(workout_type, matrix)))
+        self.write_columns(workout_type, columns)
+
+    def write_columns(self, workout_type: str,
+                      columns: Dict[str, np.ndarray]) -> None:
+        """Записать группу из готовых столбцов."""
+        group = {'workout_type': workout_type,
+                 'training_type': registry.types[workout_type].__name__,
+                 'rows': len(columns['user']),
+                 'columns': {}}
+        for name, values in columns.items():
+            dtype = DTYPES.get(name, '<f8')
+            values = np.ascontiguousarray(values, dtype=dtype)
+            padding = -self._file.tell() % ALIGN
+            self._file.write(b'\0' * padding)
+            group['columns'][name] = {'offset': self._file.tell(),
+                                      'dtype': dtype}
+            self._file.write(values.tobytes())
+        self.groups.append(group)
+
+    def close(self) -> None:
+        """Дописать оглавление и закрыть файл."""
+        if self._file.closed:
+            return
+        footer = json.dumps({'version': VERSION,
+                             'groups': self.groups}).encode()
+        self._file.write(footer)
+        self._file.write(TRAILER.pack(len(footer), MAGIC))
+        self._file.close()
+
+
+class Group:
+    """Группа строк файла со столбцами в виде массивов без копирования."""
+
+    def __init__(self, buffer: mmap.mmap, meta: dict) -> None:
+        self.buffer = buffer
+        self.workout_type: str = meta['workout_type']
+        self.training_type: str = meta['training_type']
+        self.rows: int = meta['rows']
+        self.meta = meta['columns']
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.meta)
+
+    def column(self, name: str) -> np.ndarray:
+        """Получить столбец как массив NumPy поверх отображения файла."""
+        meta = self.meta[name]
+        return np.frombuffer(self.buffer, dtype=meta['dtype'],
+                             count=self.rows, offset=meta['offset'])
+
+
+class StorageReader:
+    """Чтение двоичного столбцового файла через mmap.
+
+    Массивы столбцов ссылаются на отображение файла, поэтому закрыть
+    читателя можно только после того, как они освобождены.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with open(self.path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = HEADER.unpack_from(self.buffer, 0)
+        length, tail = TRAILER.unpack_from(
+            self.buffer, len(self.buffer) - TRAILER.size)
+        if magic != MAGIC or tail != MAGIC:
+            raise ValueError(f'{self.path} не является файлом истории.')
+        if version != VERSION:
+            raise ValueError(f'Неподдерживаемая версия формата: {version}')
+        start = len(self.buffer) - TRAILER.size - length
+        footer = json.loads(self.buffer[start:start + length])
+        self.groups = [Group(self.buffer, meta) for meta in footer['groups']]
+
+    def __enter__(self) -> 'StorageReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self.groups)
+
+    def iter_groups(self, workout_type: Optional[str] = None,
+                    ) -> Iterator[Group]:
+        """Перебрать группы строк, при необходимости одного типа."""
+        return (group for group in self.groups
+                if workout_type is None or group.workout_type == workout_type)
+
+    def column(self, workout_type: str, name: str) -> np.ndarray:
+        """Собрать столбец по всем группам одного типа."""
+        parts = [group.column(name)
+                 for group in self.iter_groups(workout_type)]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return np.empty(0, dtype=DTYPES.get(name, '<f8'))
+        return np.concatenate(parts)
+
+    def close(self) -> None:
+        """Закрыть отображение файла."""
+        self.buffer.close()
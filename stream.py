@@ -0,0 +1,249 @@
+import argparse
+import csv
+import json
+import sys
+from itertools import islice
+from typing import (TYPE_CHECKING, Callable, Iterable, Iterator, List,
+                    Optional, TextIO, Tuple, TypeVar, Union)
+
+from homework import InfoMessage, read_package
+
+if TYPE_CHECKING:
+    from cache import PackageCache
+    from validate import Reject
+
+Package = Tuple[str, List[float]]
+T = TypeVar('T')
+
+
+def parse_number(value: str) -> Union[float, str]:
+    """Прочитать число из текстового поля пакета.
+
+    Нечисловое поле остаётся строкой: его отбракует проверка пакетов.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def read_jsonl(lines: Iterable[str], strict: bool = True,
+               ) -> Iterator[Package]:
+    """Прочитать пакеты из строк JSONL.
+
+    Строка — объект {"workout_type": "RUN", "data": [...]}
+    или пара ["RUN", [...]]. При strict=False строка, которую не
+    удалось разобрать, отдаётся как validate.Malformed, чтобы
+    проверка отправила её в dead-letter.
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict):
+                workout_type, data = record['workout_type'], record['data']
+            else:
+                workout_type, data = record
+        except (ValueError, KeyError, TypeError):
+            if strict:
+                raise
+            from validate import Malformed
+            yield Malformed(line.rstrip('\r\n'))
+            continue
+        yield workout_type, data
+
+
+def read_csv(lines: Iterable[str], strict: bool = True,
+             ) -> Iterator[Package]:
+    """Прочитать пакеты из строк CSV вида `RUN,15000,1,75`.
+
+    При strict=False строка, которую не разобрал модуль csv,
+    отдаётся как validate.Malformed.
+    """
+    rows = csv.reader(lines)
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except csv.Error as error:
+            if strict:
+                raise
+            from validate import Malformed
+            yield Malformed(str(error))
+            continue
+        if not row:
+            continue
+        workout_type, *data = row
+        yield workout_type, [parse_number(value) for value in data]
+
+
+def format_text(info: InfoMessage) -> str:
+    """Оформить результат текстовым сообщением."""
+    return info.get_message()
+
+
+def info_record(info: InfoMessage) -> dict:
+    """Собрать словарь с полями сообщения."""
+    return {'training_type': info.training_type,
+            'duration': info.duration,
+            'distance': info.distance,
+            'speed': info.speed,
+            'calories': info.calories}
+
+
+def format_jsonl(info: InfoMessage) -> str:
+    """Оформить результат строкой JSON с полями сообщения."""
+    return json.dumps(info_record(info), ensure_ascii=False)
+
+
+READERS: dict[str, Callable[..., Iterator[Package]]] = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+FORMATTERS: dict[str, Callable[[InfoMessage], str]] = {
+    'text': format_text,
+    'jsonl': format_jsonl,
+}
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Разбить поток на порции не длиннее size."""
+    if size < 1:
+        raise ValueError('Размер порции должен быть положительным.')
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validated(packages: Iterable[Package],
+              reject: Callable[['Reject'], None],
+              chunk_size: int = 1000,
+              ) -> Iterator[Package]:
+    """Проверить поток пакетов порциями и пропустить только корректные."""
+    from validate import validate
+    start = 0
+    for chunk in chunked(packages, chunk_size):
+        yield from validate(chunk, reject, start)
+        start += len(chunk)
+
+
+def compute(packages: Iterable[Package],
+            cache: Optional['PackageCache'] = None,
+            ) -> Iterator[InfoMessage]:
+    """Посчитать результаты тренировок для потока пакетов.
+
+    Пакеты с неизвестным кодом обрабатываются по политике реестра.
+    """
+    for workout_type, data in packages:
+        if cache is not None:
+            info = cache.get(workout_type, data)
+            if info is not None:
+                yield info
+            continue
+        training = read_package(workout_type, data)
+        if training is not None:
+            yield training.show_training_info()
+
+
+def process(packages: Iterable[Package],
+            sink: TextIO,
+            output_format: str = 'text',
+            chunk_size: int = 1000,
+            workers: int = 1,
+            cache: Optional['PackageCache'] = None,
+            dead_letter: Optional[Callable[['Reject'], None]] = None,
+            ) -> int:
+    """Обработать поток пакетов порциями и записать результаты в sink.
+
+    Если задан dead_letter, пакеты сначала проверяются, а
+    некорректные передаются в него вместо расчёта.
+    """
+    formatter = FORMATTERS[output_format]
+    if dead_letter is not None:
+        packages = validated(packages, dead_letter, chunk_size)
+    if workers > 1:
+        from parallel import compute_parallel
+        results = compute_parallel(packages, workers, chunk_size)
+    else:
+        results = compute(packages, cache)
+    count = 0
+    for chunk in chunked(results, chunk_size):
+        sink.writelines(formatter(info) + '\n' for info in chunk)
+        count += len(chunk)
+    return count
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Потоковая обработка пакетов фитнес-трекера.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='файл с пакетами, `-` — stdin')
+    parser.add_argument('-o', '--output', default='-',
+                        help='файл для результатов, `-` — stdout')
+    parser.add_argument('--input-format', choices=READERS, default='jsonl')
+    parser.add_argument('--output-format', choices=FORMATTERS,
+                        default='text')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='число процессов для расчёта')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='размер кэша повторных пакетов, 0 — без кэша')
+    parser.add_argument('--dead-letter',
+                        help='файл JSONL для некорректных пакетов')
+    parser.add_argument('--compression', choices=('gzip', 'zstd'),
+                        help='сжатие файла результатов')
+    parser.add_argument('--rotate-bytes', type=int, default=0,
+                        help='размер файла результатов для ротации')
+    parser.add_argument('--background-writer', action='store_true',
+                        help='писать результаты из отдельного потока')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Главная функция."""
+    from output import BufferedWriter, open_output
+    args = parse_args(argv)
+    source = (sys.stdin if args.input == '-'
+              else open(args.input, encoding='utf-8', newline=''))
+    sink = (sys.stdout if args.output == '-'
+            else open_output(args.output, args.compression,
+                             args.rotate_bytes))
+    cache = None
+    if args.cache_size:
+        from cache import PackageCache
+        cache = PackageCache(args.cache_size)
+    rejects = dead_letter = None
+    if args.dead_letter:
+        from validate import DeadLetter
+        rejects = open(args.dead_letter, 'w', encoding='utf-8')
+        dead_letter = DeadLetter(rejects)
+    try:
+        with BufferedWriter(sink,
+                            background=args.background_writer) as writer:
+            packages = READERS[args.input_format](
+                source, strict=dead_letter is None)
+            process(packages, writer,
+                    args.output_format, args.chunk_size, args.workers,
+                    cache, dead_letter)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        if rejects is not None:
+            rejects.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+from array import array
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from batch import BatchResult, compute_group
+from homework import InfoMessage, Training, registry
+
+ATTRIBUTES: dict[str, str] = {'weight': 'weiht'}
+
+
+def table_fields(workout_type: str) -> Tuple[str, ...]:
+    """Получить столбцы таблицы для полей пакета из реестра.
+
+    Столбцы называются как атрибуты объектов тренировок, а не как
+    параметры конструктора: вес хранится в атрибуте weiht.
+    """
+    return tuple(ATTRIBUTES.get(name, name)
+                 for name in registry.fields[workout_type])
+
+
+class TrainingRow:
+    """Лёгкое представление одной тренировки из таблицы."""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'TrainingTable', index: int) -> None:
+        self.table = table
+        self.index = index
+
+    def __getattr__(self, name: str) -> float:
+        try:
+            column = self.table.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return column[self.index]
+
+    @property
+    def workout_type(self) -> str:
+        return self.table.types[self.table.codes[self.index]]
+
+    @property
+    def data(self) -> List[float]:
+        """Получить пакет в том виде, в котором он пришёл от датчиков."""
+        return [self.table.columns[name][self.index]
+                for name in table_fields(self.workout_type)]
+
+    def training(self) -> Training:
+        """Построить полноценный объект тренировки."""
+        return registry.types[self.workout_type](*self.data)
+
+    def show_training_info(self) -> InfoMessage:
+        """Вернуть информационное сообщение без создания Training.
+
+        Типы без ядра столбцов считаются через объект тренировки.
+        """
+        cls = registry.types[self.workout_type]
+        columns = cls.kernel.columns
+        if columns is None:
+            return cls(*self.data).show_training_info()
+        distance, speed, calories = columns(*self.data)
+        return InfoMessage(cls.__name__, self.duration,
+                           distance, speed, calories)
+
+
+class TrainingTable:
+    """Таблица тренировок с типизированными столбцами вместо объектов.
+
+    Столбцы и коды типов берутся из реестра: тип, зарегистрированный
+    позже, добавляет свои столбцы при первом пакете. Поля, которые
+    тип тренировки не использует, хранятся нулями. Пока снаружи
+    удерживается массив из column(), таблицу нельзя дополнять.
+    """
+
+    def __init__(self, packages: Iterable[Tuple[str, Sequence[float]]] = (),
+                 ) -> None:
+        self.codes = array('B')
+        self.types: List[str] = []
+        self.columns: dict[str, array] = {}
+        for workout_type in registry.types:
+            self.add_type(workout_type)
+        self.extend(packages)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> TrainingRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Номер тренировки вне таблицы.')
+        return TrainingRow(self, index)
+
+    def __iter__(self) -> Iterator[TrainingRow]:
+        return (TrainingRow(self, index) for index in range(len(self)))
+
+    def add_type(self, workout_type: str) -> int:
+        """Завести код и недостающие столбцы для типа из реестра."""
+        for name in table_fields(workout_type):
+            if name not in self.columns:
+                self.columns[name] = array('d', bytes(8 * len(self)))
+        self.types.append(workout_type)
+        return len(self.types) - 1
+
+    def append(self, workout_type: str, data: Sequence[float]) -> None:
+        """Добавить тренировку в конец таблицы."""
+        if workout_type not in registry.types:
+            raise ValueError(f'Неизвестный тип тренировки: {workout_type}')
+        fields = table_fields(workout_type)
+        if len(data) != len(fields):
+            raise ValueError(f'Пакет {workout_type} должен содержать '
+                             f'{len(fields)} значений.')
+        if workout_type in self.types:
+            code = self.types.index(workout_type)
+        else:
+            code = self.add_type(workout_type)
+        values = dict(zip(fields, data))
+        self.codes.append(code)
+        for name, column in self.columns.items():
+            column.append(values.get(name, 0.0))
+
+    def extend(self, packages: Iterable[Tuple[str, Sequence[float]]],
+               ) -> None:
+        """Добавить тренировки из потока пакетов."""
+        for workout_type, data in packages:
+            self.append(workout_type, data)
+
+    def column(self, name: str) -> np.ndarray:
+        """Получить столбец как массив NumPy без копирования."""
+        if name == 'code':
+            return np.frombuffer(self.codes, dtype=np.uint8)
+        return np.frombuffer(self.columns[name], dtype=np.float64)
+
+    def compute(self) -> BatchResult:
+        """Посчитать показатели всех тренировок таблицы по столбцам."""
+        codes = self.column('code')
+        size = len(self)
+        result = BatchResult(np.empty(size, dtype=object),
+                             self.column('duration').copy(),
+                             np.empty(size),
+                             np.empty(size),
+                             np.empty(size))
+        for code, workout_type in enumerate(self.types):
+            mask = codes == code
+            if not mask.any():
+                continue
+            cls = registry.types[workout_type]
+            distance, speed, calories = compute_group(
+                cls, *(self.column(name)[mask]
+                       for name in table_fields(workout_type)))
+            result.training_type[mask] = cls.__name__
+            result.distance[mask] = distance
+            result.speed[mask] = speed
+            result.calories[mask] = calories
+        return result
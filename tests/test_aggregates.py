@@ -0,0 +1,89 @@
+from datetime import date, datetime
+
+import pytest
+
+import homework
+from aggregates import Aggregator
+
+RUN_1 = homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+RUN_2 = homework.read_package('RUN', [9000, 1.5, 70]).show_training_info()
+SWIM = homework.read_package(
+    'SWM', [720, 1, 80, 25, 40]).show_training_info()
+
+
+def test_rolling_totals():
+    aggregator = Aggregator()
+    aggregator.add('u1', date(2024, 1, 29), RUN_1)
+    aggregator.add('u1', datetime(2024, 2, 2, 7, 30), RUN_2)
+    aggregator.add('u1', date(2024, 2, 2), SWIM)
+    aggregator.add('u2', date(2024, 2, 2), RUN_1)
+
+    week = aggregator.get('u1', 'Running', 'week', '2024-W05')
+    assert week.count == 2
+    assert week.sums['distance'] == RUN_1.distance + RUN_2.distance
+    assert week.mean('duration') == 1.25
+    assert week.min('calories') == min(RUN_1.calories, RUN_2.calories)
+    assert week.max('speed') == max(RUN_1.speed, RUN_2.speed)
+    assert aggregator.get('u1', 'Running', 'month', '2024-01').count == 1
+    assert aggregator.get('u1', 'Running', 'day', '2024-02-02').count == 1
+    assert aggregator.get('u1', 'Swimming', 'month', '2024-02').count == 1
+    assert len(list(aggregator.items('u2'))) == 3
+
+
+def test_remove_session():
+    aggregator = Aggregator(exact=True)
+    aggregator.add('u1', date(2024, 2, 1), RUN_1)
+    aggregator.add('u1', date(2024, 2, 2), RUN_2)
+    aggregator.remove('u1', date(2024, 2, 1), RUN_1)
+    month = aggregator.get('u1', 'Running', 'month', '2024-02')
+    assert month.count == 1
+    assert month.max('distance') == RUN_2.distance, (
+        'После удаления максимум должен пересчитываться.'
+    )
+    assert aggregator.get('u1', 'Running', 'day', '2024-02-01') is None
+    with pytest.raises(ValueError):
+        aggregator.remove('u1', date(2024, 2, 1), RUN_1)
+
+
+def test_remove_keeps_constant_state():
+    aggregator = Aggregator()
+    aggregator.add('u1', date(2024, 2, 1), RUN_1)
+    aggregator.add('u1', date(2024, 2, 2), RUN_2)
+    aggregator.remove('u1', date(2024, 2, 1), RUN_1)
+    month = aggregator.get('u1', 'Running', 'month', '2024-02')
+    assert month.values is None, (
+        'По умолчанию корзина не должна хранить значения тренировок.'
+    )
+    assert month.count == 1
+    assert month.sums['distance'] == pytest.approx(RUN_2.distance)
+    assert month.max('distance') == RUN_1.distance, (
+        'Без exact максимум после удаления не отзывается.'
+    )
+    with pytest.raises(ValueError):
+        aggregator.remove('u1', date(2024, 2, 1), RUN_1)
+
+
+@pytest.mark.parametrize('exact', [False, True])
+def test_merge_shards(exact):
+    sessions = [('u1', date(2024, 2, 1), RUN_1),
+                ('u1', date(2024, 2, 3), RUN_2),
+                ('u1', date(2024, 2, 3), SWIM)]
+    whole, first, second = (Aggregator(exact), Aggregator(exact),
+                            Aggregator(exact))
+    for index, session in enumerate(sessions):
+        whole.add(*session)
+        (first if index % 2 else second).add(*session)
+    first.merge(second)
+    assert {key: summary.as_dict() for key, summary in first.buckets.items()
+            } == {key: summary.as_dict()
+                  for key, summary in whole.buckets.items()}
+
+
+def test_add_package():
+    aggregator = Aggregator()
+    info = aggregator.add_package('u1', date(2024, 2, 1),
+                                  'WLK', [9000, 1, 75, 180])
+    summary = aggregator.get('u1', 'SportsWalking', 'day', '2024-02-01')
+    assert summary.sums['calories'] == info.calories
+    assert aggregator.add_package('u1', date(2024, 2, 1),
+                                  'XXX', [1, 1, 1]) is None
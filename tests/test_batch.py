@@ -0,0 +1,140 @@
+import io
+import math
+
+import numpy as np
+import pytest
+
+import batch
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('SWM', [420, 4, 20, 42, 4]),
+]
+
+
+def test_compute_batch_matches_per_object():
+    result = batch.compute_batch(PACKAGES)
+    assert len(result) == len(PACKAGES), (
+        '`compute_batch` должна вернуть по строке на каждый пакет.'
+    )
+    for info, (workout_type, data) in zip(result.messages(), PACKAGES):
+        expected = homework.read_package(workout_type, data)
+        expected = expected.show_training_info()
+        assert info.training_type == expected.training_type, (
+            '`compute_batch` должна сохранять исходный порядок пакетов.'
+        )
+        for field in ('duration', 'distance', 'speed', 'calories'):
+            assert math.isclose(getattr(info, field),
+                                getattr(expected, field),
+                                rel_tol=1e-12), (
+                f'Поле `{field}` в `compute_batch` расходится '
+                'с расчётом через объекты тренировок.'
+            )
+        assert info.get_message() == expected.get_message()
+
+
+def test_compute_columns_uses_class_constants(monkeypatch):
+    monkeypatch.setattr(homework.Running, 'CALORIES_MEAN_SPEED_SHIFT', 0)
+    _, _, calories = batch.compute_columns('RUN', [[9000, 1, 75]])
+    expected = homework.Running(9000, 1, 75).get_spent_calories()
+    assert calories[0] == pytest.approx(expected), (
+        '`compute_columns` должна брать коэффициенты из классов тренировок.'
+    )
+
+
+@pytest.mark.parametrize('workout_type, rows', [
+    ('RUN', [[15000, 1, 75], [1206, 12, 6]]),
+    ('WLK', [[9000, 1, 75, 180], [3000.33, 2.512, 75.8, 180.1],
+             [43882, 1.7288755563904825, 135, 137.06702285692953]]),
+    ('SWM', [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4]]),
+])
+def test_kernel_scalars_match_arrays(workout_type, rows):
+    cls = homework.registry.types[workout_type]
+    columns = cls.kernel.columns(*np.array(rows, dtype=np.float64).T)
+    for index, row in enumerate(rows):
+        training = cls(*row)
+        expected = (training.get_distance(),
+                    training.get_mean_speed(),
+                    training.get_spent_calories())
+        assert cls.kernel.columns(*row) == expected, (
+            'Ядро должно давать на числах те же результаты, '
+            'что и методы объекта.'
+        )
+        np.testing.assert_array_max_ulp(
+            np.array([column[index] for column in columns]),
+            np.array(expected), maxulp=2)
+
+
+def test_compute_batch_unknown_workout(monkeypatch):
+    monkeypatch.setattr(homework.registry, 'policy', 'skip')
+    result = batch.compute_batch([('XXX', [1]), ('RUN', [15000, 1, 75])])
+    assert list(result.training_type) == ['Running'], (
+        '`compute_batch` должна пропускать пакеты с неизвестным кодом.'
+    )
+    monkeypatch.setattr(homework.registry, 'policy', 'raise')
+    with pytest.raises(ValueError):
+        batch.compute_batch([('XXX', [1, 1, 1])])
+
+
+def test_compute_batch_falls_back_to_objects(monkeypatch):
+    class Rowing(homework.Training):
+        def get_spent_calories(self):
+            return self.weiht * self.duration
+
+    monkeypatch.setitem(homework.registry.types, 'ROW', Rowing)
+    result = batch.compute_batch([('ROW', [3000, 2, 80])])
+    info = Rowing(3000, 2, 80).show_training_info()
+    assert list(result.messages()) == [info], (
+        'Для типов без столбцового ядра `compute_batch` должна считать '
+        'через объекты тренировок.'
+    )
+
+
+def test_compute_profiles_mixed_tenants():
+    profile = homework.Profile('partner', {
+        'RUN': {'CALORIES_MEAN_SPEED_MULTIPLIER': 20},
+        'WLK': {'DIV_FAC': 0.3},
+    })
+    packages = [(tenant, workout_type, data)
+                for tenant in (None, profile)
+                for workout_type, data in PACKAGES]
+    result = batch.compute_profiles(packages)
+    expected = [homework.read_package(workout_type, data, tenant)
+                .show_training_info()
+                for tenant, workout_type, data in packages]
+    assert list(result.messages()) == expected
+    assert list(batch.compute_batch(PACKAGES, profile).messages()) == (
+        expected[len(PACKAGES):])
+
+
+def test_compute_profiles_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    tenants = [homework.Profile(str(number), {
+        'RUN': {'CALORIES_MEAN_SPEED_SHIFT': number}}) for number in range(8)]
+    expected = [list(batch.compute_batch(PACKAGES, tenant).rows())
+                for tenant in tenants]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(
+            lambda tenant: list(batch.compute_batch(PACKAGES, tenant).rows()),
+            tenants * 10))
+    assert results == expected * 10, (
+        'Профили должны считаться в разных потоках без взаимного влияния.'
+    )
+
+
+def test_compute_batch_empty():
+    assert len(batch.compute_batch([])) == 0
+
+
+def test_write_messages_matches_get_message():
+    result = batch.compute_batch(PACKAGES)
+    buffer = io.StringIO()
+    result.write_messages(buffer)
+    assert buffer.getvalue().splitlines() == [
+        info.get_message() for info in result.messages()
+    ]
@@ -0,0 +1,38 @@
+import sys
+
+import pytest
+
+from conftest import BASE_DIR
+
+sys.path.append(str(BASE_DIR / 'benchmarks'))
+
+import suite
+
+
+@pytest.mark.parametrize('stage', suite.STAGES)
+def test_stages_run(stage):
+    results = suite.run_suite([1], ['RUN', 'WLK', 'SWM'], [stage])
+    assert len(results) == 3
+    assert all(value > 0 for value in results.values())
+
+
+def test_find_regressions():
+    baseline = {'Running.get_distance.1': 100.0,
+                'Running.get_message.1': 100.0}
+    current = {'Running.get_distance.1': 109.0,
+               'Running.get_message.1': 125.0,
+               'Swimming.get_message.1': 500.0}
+    assert suite.find_regressions(baseline, current, 10) == {
+        'Running.get_message.1': 25.0,
+    }
+
+
+def test_main_fails_on_regression(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(
+        '{"results": {"Running.get_distance.1": 0.001}}', encoding='utf-8')
+    exit_code = suite.main(['--sizes', '1', '--types', 'RUN',
+                            '--stages', 'get_distance',
+                            '--output', str(tmp_path / 'current.json'),
+                            '--compare', str(baseline)])
+    assert exit_code == 1
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+import homework
+from cache import PackageCache
+
+
+def test_hits_and_misses():
+    cache = PackageCache(maxsize=2)
+    first = cache.get('RUN', [15000, 1, 75])
+    second = cache.get('RUN', (15000, 1, 75))
+    assert first is second, 'Повторный пакет должен браться из кэша.'
+    assert first == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info()
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0,
+                             'invalidations': 0, 'size': 1}
+
+
+def test_lru_eviction():
+    cache = PackageCache(maxsize=2)
+    cache.get('RUN', [1, 1, 1])
+    cache.get('RUN', [2, 1, 1])
+    cache.get('RUN', [1, 1, 1])
+    cache.get('RUN', [3, 1, 1])
+    assert cache.evictions == 1
+    cache.get('RUN', [1, 1, 1])
+    assert cache.hits == 2, 'Вытесняться должен давно не читавшийся пакет.'
+
+
+def test_ttl():
+    now = [0.0]
+    cache = PackageCache(ttl=10, clock=lambda: now[0])
+    cache.get('WLK', [9000, 1, 75, 180])
+    now[0] = 5
+    cache.get('WLK', [9000, 1, 75, 180])
+    now[0] = 11
+    cache.get('WLK', [9000, 1, 75, 180])
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.parametrize('cls, name, package', [
+    (homework.Running, 'CALORIES_MEAN_SPEED_MULTIPLIER',
+     ('RUN', [15000, 1, 75])),
+    (homework.Swimming, 'COEF_1', ('SWM', [720, 1, 80, 25, 40])),
+])
+def test_invalidated_by_coefficient_change(monkeypatch, cls, name, package):
+    cache = PackageCache()
+    before = cache.get(*package)
+    monkeypatch.setattr(cls, name, getattr(cls, name) * 2)
+    after = cache.get(*package)
+    assert after.calories != before.calories, (
+        'Кэш должен сбрасываться при изменении коэффициентов классов.'
+    )
+    assert cache.invalidations == 1
+
+
+def test_unknown_workout_not_cached():
+    cache = PackageCache()
+    assert cache.get('XXX', [1, 1, 1]) is None
+    assert len(cache) == 0
+
+
+def test_thread_safety():
+    cache = PackageCache(maxsize=8)
+
+    def work():
+        for action in range(200):
+            cache.get('RUN', [action % 16, 1, 75])
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.hits + cache.misses == 1600
+    assert len(cache) <= 8
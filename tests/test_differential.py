@@ -0,0 +1,105 @@
+import sys
+
+import pytest
+
+from conftest import BASE_DIR
+
+sys.path.append(str(BASE_DIR / 'benchmarks'))
+
+import differential
+import homework
+import server
+from homework import InfoMessage
+
+PACKAGES = differential.random_packages(3000, seed=7)
+
+
+@pytest.mark.parametrize(
+    'name', [*differential.PATHS, *differential.RENDERERS])
+def test_path_matches_reference(name):
+    reports = differential.check(PACKAGES, [name])
+    report = reports[name]
+    assert report.cases == len(PACKAGES)
+    assert report.mismatches == 0, report.examples
+    if name in differential.PATHS:
+        for metric, tolerance in differential.PATH_TOLERANCES[name].items():
+            assert report.max_ulps[metric] <= tolerance
+
+
+def test_reference_matches_original_formulas():
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [15000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180])]
+    assert [info.get_message() for info in
+            differential.reference(packages)] == [
+        info.get_message() for info in
+        differential.object_path(packages)]
+
+
+def test_reference_uses_object_methods(monkeypatch):
+    monkeypatch.setattr(homework.Running, 'get_spent_calories',
+                        lambda self: 1.0)
+    [info] = differential.reference([('RUN', [15000, 1, 75])])
+    assert info.calories == 1.0, (
+        'Эталон должен считаться методами `get_*` объектов.'
+    )
+
+
+@pytest.mark.parametrize('name', ['object', 'cached', 'cache', 'parallel'])
+def test_scalar_paths_are_exact(name):
+    assert set(differential.PATH_TOLERANCES[name].values()) == {0}, (
+        'Пути без NumPy должны совпадать с эталоном до бита.'
+    )
+
+
+def test_ulps():
+    assert differential.ulps([1.0, 0.0, -1.0], [1.0, -0.0, -1.0]).tolist() == [
+        0, 0, 0]
+    assert differential.ulps([1.0], [1.0000000000000002]).tolist() == [1]
+    assert differential.ulps([5e-324], [-5e-324]).tolist() == [2]
+
+
+def test_drifting_path_is_detected(monkeypatch):
+    def drifting(packages):
+        infos = differential.object_path(packages)
+        return [InfoMessage(info.training_type, info.duration,
+                            info.distance, info.speed,
+                            info.calories * (1 + 1e-9))
+                for info in infos]
+
+    monkeypatch.setitem(differential.PATHS, 'drifting', drifting)
+    reports = differential.check(PACKAGES[:200], ['drifting'])
+    report = reports['drifting']
+    assert report.mismatches > 0
+    assert report.max_ulps['calories'] > differential.TOLERANCES['calories']
+    assert report.examples
+    assert 'drifting' in differential.format_report(reports)
+
+
+def test_failing_path_is_reported(monkeypatch):
+    def failing(packages):
+        raise RuntimeError('сбой пути')
+
+    monkeypatch.setitem(differential.PATHS, 'failing', failing)
+    report = differential.check(PACKAGES[:10], ['failing', 'object'])
+    assert report['failing'].examples == ['RuntimeError: сбой пути']
+    assert report['object'].mismatches == 0
+
+
+def test_server_path_detects_shared_failure(monkeypatch):
+    def broken(packages):
+        raise RuntimeError('сбой пакетного расчёта')
+
+    monkeypatch.setattr(server, 'compute_batch', broken)
+    monkeypatch.setattr(server, 'read_package', broken)
+    report = differential.check(PACKAGES[:50], ['server'])['server']
+    assert report.mismatches > 0
+
+
+def test_main(capsys):
+    assert differential.main(
+        ['--cases', '300', '--chunk', '120',
+         '--paths', 'object', 'batch', 'batch_text']) == 0
+    output = capsys.readouterr().out
+    assert 'batch_text' in output
+    assert '300' in output
@@ -0,0 +1,68 @@
+import math
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import batch
+import export
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+]
+
+
+def test_record_batch_columns():
+    schema = export.make_schema()
+    record = export.record_batch(PACKAGES, schema)
+    assert schema.names == [
+        'training_type', 'duration', 'distance', 'speed', 'calories',
+        'workout_type', 'action', 'weight', 'height', 'length_pool',
+        'count_pool']
+    assert pa.types.is_dictionary(schema.field('training_type').type)
+    expected = batch.compute_batch(PACKAGES)
+    assert record.column('training_type').to_pylist() == list(
+        expected.training_type)
+    for name in ('duration', 'distance', 'speed', 'calories'):
+        assert record.column(name).to_pylist() == getattr(
+            expected, name).tolist(), (
+            f'Столбец `{name}` должен совпадать с расчётом без округления.'
+        )
+    assert record.column('workout_type').to_pylist() == [
+        code for code, _ in PACKAGES]
+    assert record.column('height').to_pylist() == [
+        None, None, 180, None, 180.1]
+    assert record.column('action').to_pylist() == [
+        data[0] for _, data in PACKAGES]
+
+
+def test_record_batch_unknown_code(monkeypatch):
+    monkeypatch.setattr(homework.registry, 'policy', 'skip')
+    record = export.record_batch([('XXX', [1]), *PACKAGES[:1]],
+                                 export.make_schema())
+    assert record.num_rows == 1
+    assert export.record_batch([], export.make_schema()).num_rows == 0
+
+
+@pytest.mark.parametrize('file_format', export.FORMATS)
+def test_export_batches(tmp_path, file_format):
+    path = tmp_path / f'sessions.{file_format}'
+    rows = export.export(iter(PACKAGES * 3), path, file_format,
+                         batch_size=4)
+    assert rows == len(PACKAGES) * 3
+    if file_format == 'parquet':
+        assert pq.ParquetFile(path).num_row_groups == 4
+        table = pq.read_table(path)
+    else:
+        with pa.ipc.open_file(path) as reader:
+            assert reader.num_record_batches == 4
+            table = reader.read_all()
+    info = homework.read_package(*PACKAGES[0]).show_training_info()
+    assert table.column('training_type')[0].as_py() == 'Swimming'
+    assert math.isclose(table.column('calories')[0].as_py(), info.calories)
+    assert table.column('calories')[0].as_py() == info.calories
@@ -0,0 +1,73 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import batch
+import frames
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('SWM', [420, 4, 20, 42, 4]),
+]
+
+
+def test_frame_layout():
+    buffer = frames.pack_frames([('RUN', [15000, 1, 75])])
+    assert len(buffer) == frames.FRAME.size == frames.DTYPE.itemsize == 48
+    assert buffer[:8] == b'RUN\0\x03\0\0\0'
+    assert np.frombuffer(buffer, '<f8', offset=8).tolist() == [
+        15000, 1, 75, 0, 0]
+
+
+def test_decode_frames_is_zero_copy():
+    buffer = frames.pack_frames(PACKAGES)
+    decoded = frames.decode_frames(buffer)
+    assert not decoded.flags.owndata
+    buffer[8:16] = np.float64(1.0).tobytes()
+    assert decoded['fields'][0, 0] == 1.0, (
+        '`decode_frames` должна читать кадры из буфера без копирования.'
+    )
+
+
+def test_iter_frames_feeds_read_package():
+    buffer = frames.pack_frames(PACKAGES)
+    for (workout_type, data), expected in zip(
+            frames.iter_frames(memoryview(buffer)), PACKAGES):
+        assert (workout_type, data) == expected
+        assert homework.read_package(workout_type, data).show_training_info(
+        ) == homework.read_package(*expected).show_training_info()
+
+
+@pytest.mark.parametrize('packages', [PACKAGES, PACKAGES[1:2] * 3])
+def test_compute_frames_matches_batch(packages):
+    result = frames.compute_frames(bytes(frames.pack_frames(packages)))
+    expected = batch.compute_batch(packages)
+    assert list(result.rows()) == list(expected.rows()), (
+        '`compute_frames` должна давать те же результаты, '
+        'что и `compute_batch`.'
+    )
+
+
+def test_compute_frames_unknown_code(monkeypatch):
+    buffer = frames.pack_frames(PACKAGES[:2])
+    buffer[:4] = b'XXX\0'
+    monkeypatch.setattr(homework.registry, 'policy', 'count')
+    monkeypatch.setattr(homework.registry, 'unknown', Counter())
+    result = frames.compute_frames(buffer)
+    assert result.training_type.tolist() == ['Running']
+    assert homework.registry.unknown['XXX'] == 1
+
+
+def test_compute_frames_rejects_bad_frames():
+    buffer = frames.pack_frames(PACKAGES[:2])
+    with pytest.raises(ValueError):
+        frames.compute_frames(buffer[:-1])
+    buffer[52] = 4
+    with pytest.raises(ValueError):
+        frames.compute_frames(buffer)
@@ -2,6 +2,7 @@ import re
 import pytest
 import types
 import inspect
+from io import StringIO
 from collections import namedtuple
 from conftest import Capturing
 
@@ -451,3 +452,214 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+def test_write_messages():
+    messages = [
+        homework.read_package(*package).show_training_info()
+        for package in [('SWM', [720, 1, 80, 25, 40]),
+                        ('RUN', [15000, 1, 75])]
+    ]
+    buffer = StringIO()
+    homework.write_messages(messages, buffer)
+    assert buffer.getvalue().splitlines() == [
+        info.get_message() for info in messages
+    ], (
+        '`write_messages` должна записывать сообщения построчно.'
+    )
+
+
+def test_registry_dispatch():
+    assert homework.registry.types == {
+        'RUN': homework.Running,
+        'WLK': homework.SportsWalking,
+        'SWM': homework.Swimming,
+    }, (
+        'Классы тренировок должны регистрироваться под кодами датчиков.'
+    )
+    assert homework.registry.arity == {'RUN': 3, 'WLK': 4, 'SWM': 5}
+
+
+def test_registry_register_subclass(monkeypatch):
+    monkeypatch.setattr(homework, 'registry', homework.WorkoutRegistry())
+
+    class Cycling(homework.Training, code='CYC'):
+        def get_spent_calories(self):
+            return 0.0
+
+    assert homework.read_package('CYC', [100, 1, 70]).__class__ is Cycling
+    assert homework.registry.arity['CYC'] == 3
+
+
+@pytest.mark.parametrize('policy, expected_unknown', [
+    ('skip', 0),
+    ('count', 2),
+])
+def test_registry_unknown_policy(monkeypatch, policy, expected_unknown):
+    monkeypatch.setattr(homework, 'registry', homework.WorkoutRegistry())
+    homework.registry.policy = policy
+    assert homework.read_package('XXX', [1, 1, 1]) is None
+    assert homework.read_package('XXX', [1, 1, 1]) is None
+    assert homework.registry.unknown['XXX'] == expected_unknown
+
+
+def test_registry_raise_policy(monkeypatch):
+    monkeypatch.setattr(homework.registry, 'policy', 'raise')
+    with pytest.raises(ValueError):
+        homework.read_package('XXX', [1, 1, 1])
+    with pytest.raises(ValueError):
+        homework.registry.policy = 'ignore'
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_show_training_info_cached(monkeypatch, workout_type, data):
+    training = homework.read_package(workout_type, data)
+    expected = (training.get_distance(),
+                training.get_mean_speed(),
+                training.get_spent_calories())
+    info = training.show_training_info()
+    assert (info.distance, info.speed, info.calories) == expected
+
+    calls = []
+    monkeypatch.setattr(training, 'get_distance',
+                        lambda: calls.append(training) or 0.0)
+    assert training.show_training_info() == info
+    assert not calls, 'Повторный вызов должен брать показатели из кэша.'
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_show_training_info_single_pass(monkeypatch, workout_type, data):
+    training = homework.read_package(workout_type, data)
+    expected = (training.get_distance(),
+                training.get_mean_speed(),
+                training.get_spent_calories())
+    calls = []
+    for name in homework.KERNEL_METHODS:
+        monkeypatch.setattr(training, name,
+                            lambda: calls.append(training) or 0.0)
+    info = training.show_training_info()
+    assert (info.distance, info.speed, info.calories) == expected
+    assert not calls, (
+        'Первый вызов должен считать показатели ядром за один проход.'
+    )
+
+
+def test_show_training_info_invalidated():
+    training = homework.Running(15000, 1, 75)
+    first = training.show_training_info()
+    training.weiht = 80
+    assert training.show_training_info().calories == (
+        homework.Running(15000, 1, 80).get_spent_calories())
+    training.action = 9000
+    assert training.show_training_info().distance == 5.85
+    assert training.show_training_info() != first
+
+
+def test_show_training_info_class_constant(monkeypatch):
+    training = homework.Running(15000, 1, 75)
+    training.show_training_info()
+    monkeypatch.setattr(homework.Running, 'LEN_STEP', 1.0)
+    assert training.show_training_info().distance == 15.0
+
+
+def test_kernel_rebuilt_on_constant_override(monkeypatch):
+    running = homework.Running.kernel
+    walking = homework.SportsWalking.kernel
+    monkeypatch.setattr(homework.Running, 'CALORIES_MEAN_SPEED_SHIFT', 0)
+    assert homework.Running.kernel is not running
+    assert homework.SportsWalking.kernel is walking
+    assert homework.Running(9000, 1, 75).get_spent_calories() == (
+        pytest.approx(18 * 5.85 * 75 / 1000 * 60))
+    monkeypatch.setattr(homework.Training, 'M_IN_KM', 100)
+    assert homework.SportsWalking.kernel is not walking, (
+        'Изменение константы базового класса должно пересобирать '
+        'ядра подклассов.'
+    )
+    assert homework.SportsWalking(9000, 1, 75, 180).get_distance() == 58.5
+
+
+def test_kernel_for_subclass():
+    class Sprint(homework.Running):
+        CALORIES_MEAN_SPEED_MULTIPLIER = 20
+
+    class Rowing(homework.Running):
+        def get_spent_calories(self):
+            return self.weiht * self.duration
+
+    assert Sprint.kernel is not homework.Running.kernel
+    assert Sprint(9000, 1, 75).get_spent_calories() == pytest.approx(
+        (20 * 5.85 + 1.79) * 75 / 1000 * 60)
+    assert Sprint.kernel.columns(9000, 1, 75) == (
+        5.85, 5.85, Sprint(9000, 1, 75).get_spent_calories())
+    assert Rowing.kernel.columns is None, (
+        'Ядро не должно считать столбцы за класс, '
+        'переопределивший методы `get_*`.'
+    )
+
+
+def test_kernel_follows_replaced_methods(monkeypatch):
+    package = ('RUN', [15000, 1, 75])
+
+    def get_spent_calories(self):
+        return 1.0
+
+    monkeypatch.setattr(homework.Running, 'get_spent_calories',
+                        get_spent_calories)
+    assert homework.Running.kernel.columns is None, (
+        'Замена метода `get_*` во время работы должна отключать ядро.'
+    )
+    info = homework.read_package(*package).show_training_info()
+    assert info.calories == 1.0
+    monkeypatch.setattr(homework.Training, 'get_distance',
+                        lambda self: 2.0)
+    assert homework.Swimming.kernel.columns is None
+    monkeypatch.undo()
+    assert homework.Running.kernel.columns is not None
+    assert homework.Swimming.kernel.columns is not None
+    assert homework.read_package(*package).show_training_info() == (
+        homework.InfoMessage('Running', 1, 9.75, 9.75, 797.805))
+
+
+def test_read_package_with_profile(monkeypatch):
+    monkeypatch.setattr(homework, 'profiles', {})
+    profile = homework.add_profile(
+        'partner', {'RUN': {'CALORIES_MEAN_SPEED_MULTIPLIER': 20}})
+    training = homework.read_package('RUN', [9000, 1, 75], 'partner')
+    assert isinstance(training, homework.Running)
+    assert training.get_spent_calories() == pytest.approx(
+        (20 * 5.85 + 1.79) * 75 / 1000 * 60)
+    assert training.show_training_info().training_type == 'Running'
+    assert homework.Running.CALORIES_MEAN_SPEED_MULTIPLIER == 18, (
+        'Профиль не должен менять константы исходных классов.'
+    )
+    assert profile.get('RUN') is profile.get('RUN')
+    assert profile.get('WLK') is homework.SportsWalking
+    with pytest.raises(ValueError):
+        homework.read_package('RUN', [9000, 1, 75], 'missing')
+    with pytest.raises(ValueError):
+        homework.Profile('bad', {'RUN': {'COEF_9': 1}}).get('RUN')
+
+
+def test_profile_keeps_caches():
+    cache = homework.PackageCache()
+    info = cache.get('RUN', [15000, 1, 75])
+    training = homework.Running(15000, 1, 75)
+    training.show_training_info()
+    metrics = training._metrics
+    version = homework.TrainingMeta.version
+    homework.Profile(
+        'partner', {'RUN': {'CALORIES_MEAN_SPEED_SHIFT': 2}}).get('RUN')
+    assert homework.TrainingMeta.version == version, (
+        'Создание классов профиля не должно сбрасывать кэши результатов.'
+    )
+    assert cache.get('RUN', [15000, 1, 75]) is info
+    training.show_training_info()
+    assert training._metrics is metrics
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import homework
+from index import HistoryIndex
+from storage import StorageReader, StorageWriter
+
+
+@pytest.fixture
+def history(tmp_path):
+    rng = np.random.default_rng(1)
+    path = tmp_path / 'history.ftrk'
+    with StorageWriter(path) as writer:
+        for workout_type, fields in (('RUN', 3), ('SWM', 5)):
+            size = 500
+            data = rng.integers(1, 100, size=(size, fields))
+            writer.write(workout_type, data,
+                         users=rng.integers(0, 20, size),
+                         timestamps=rng.integers(0, 10000, size))
+    reader = StorageReader(path)
+    yield reader
+    reader.close()
+
+
+def brute_force(reader, user, start, end, workout_type):
+    rows = []
+    for group in reader.iter_groups(workout_type):
+        for index in range(len(group)):
+            timestamp = int(group.column('timestamp')[index])
+            if (group.column('user')[index] == user
+                    and start <= timestamp < end):
+                data = [group.column(name)[index]
+                        for name in group.names[2:-3]]
+                info = homework.read_package(group.workout_type,
+                                             data).show_training_info()
+                rows.append((timestamp, info))
+    return rows
+
+
+@pytest.mark.parametrize('workout_type', [None, 'SWM'])
+def test_sessions_match_full_scan(history, workout_type):
+    index = HistoryIndex(history, block_size=32)
+    result = index.sessions(7, 2000, 5000, workout_type)
+    expected = brute_force(history, 7, 2000, 5000, workout_type)
+    assert len(result) == len(expected)
+    assert list(result.timestamp) == [row[0] for row in expected]
+    for info, (_, reference) in zip(result.messages(), expected):
+        assert info.get_message() == reference.get_message()
+    assert index.blocks_scanned < len(index.blocks), (
+        'Индекс должен читать только подходящие блоки.'
+    )
+
+
+def test_totals(history):
+    index = HistoryIndex(history, block_size=32)
+    sessions = index.sessions(3, 0, 10000, 'RUN')
+    totals = index.totals(3, 0, 10000, 'RUN')
+    assert totals['count'] == len(sessions)
+    assert totals['calories'] == pytest.approx(sessions.calories.sum())
+    assert index.totals(999, 0, 10000) == {
+        'count': 0, 'duration': 0.0, 'distance': 0.0, 'speed': 0.0,
+        'calories': 0.0}
+    assert len(index.sessions(999, 0, 10000)) == 0
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+import batch
+import frames
+import homework
+import table
+from instrument import Instrumentation
+
+
+def run_packages():
+    for package in [('SWM', [720, 1, 80, 25, 40]),
+                    ('RUN', [15000, 1, 75]),
+                    ('RUN', [1206, 12, 6])]:
+        homework.read_package(*package).show_training_info().get_message()
+
+
+def test_counts_per_stage_and_type():
+    with Instrumentation() as metrics:
+        run_packages()
+        homework.Running(15000, 1, 75).get_spent_calories()
+        homework.Swimming(720, 1, 80, 25, 40).get_distance()
+    snapshot = metrics.snapshot()
+    assert snapshot['dispatch']['Running']['count'] == 2
+    assert snapshot['show_training_info']['Swimming']['count'] == 1
+    assert snapshot['get_message']['Running']['count'] == 2
+    assert snapshot['get_spent_calories']['Running']['count'] == 1
+    assert snapshot['get_distance']['Swimming']['count'] == 1
+    assert snapshot['kernel']['Running']['count'] == 2, (
+        'Расчёт показателей ядром класса должен попадать в этап kernel.'
+    )
+    buckets = snapshot['dispatch']['Running']['buckets']
+    assert buckets['+Inf'] == 2
+    assert json.loads(metrics.to_json()) == snapshot
+
+
+def test_batch_stage():
+    packages = [('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [15000, 1, 75]),
+                ('RUN', [1206, 12, 6])]
+    with Instrumentation() as metrics:
+        batch.compute_batch(packages)
+        batch.compute_profiles((None, *package) for package in packages)
+        table.TrainingTable(packages).compute()
+        frames.compute_frames(frames.pack_frames(packages))
+    snapshot = metrics.snapshot()
+    assert snapshot['batch']['Running']['count'] == 4, (
+        'Пакетный расчёт каждой группы должен попадать в этап batch.'
+    )
+    assert snapshot['batch']['Swimming']['count'] == 4
+    assert frames.compute_group is batch.compute_group, (
+        'После выхода из блока обёртки этапа batch должны быть сняты.'
+    )
+
+
+def test_uninstall_restores_methods():
+    originals = (homework.Running.get_spent_calories,
+                 homework.InfoMessage.get_message,
+                 homework.WorkoutRegistry.get)
+    version = homework.TrainingMeta.version
+    kernel = homework.Running.kernel
+    with Instrumentation():
+        assert homework.Running.get_spent_calories is not originals[0]
+        assert homework.Running.kernel.columns is not kernel.columns
+    assert (homework.Running.get_spent_calories,
+            homework.InfoMessage.get_message,
+            homework.WorkoutRegistry.get) == originals, (
+        'После выхода из блока методы должны быть восстановлены.'
+    )
+    assert homework.TrainingMeta.version == version, (
+        'Инструментирование не должно сбрасывать кэши результатов.'
+    )
+    assert homework.Running.kernel.columns(15000, 1, 75) == (
+        kernel.columns(15000, 1, 75))
+    with Instrumentation() as metrics:
+        pass
+    run_packages()
+    assert metrics.snapshot() == {}
+
+
+def test_nested_instrumentation_rejected():
+    with Instrumentation():
+        with pytest.raises(RuntimeError):
+            Instrumentation().install()
+
+
+def test_prometheus_format():
+    with Instrumentation() as metrics:
+        run_packages()
+    text = metrics.to_prometheus()
+    assert '# TYPE tracker_stage_seconds histogram' in text
+    assert ('tracker_stage_seconds_count{stage="dispatch",'
+            'training_type="Running"} 2') in text
+    assert 'le="+Inf"' in text
+
+
+def test_prometheus_unknown_codes(monkeypatch):
+    monkeypatch.setattr(homework.registry, 'policy', 'skip')
+    with Instrumentation() as metrics:
+        homework.read_package('X"}\n', [1])
+        homework.read_package('YYY', [1])
+    assert metrics.snapshot()['dispatch']['unknown']['count'] == 2, (
+        'Неизвестные коды должны учитываться под одной меткой.'
+    )
+    metrics.stages['dispatch']['a\\"\n'].observe(1e-6)
+    text = metrics.to_prometheus()
+    assert 'training_type="a\\\\\\"\\n"' in text
+    for line in text.splitlines()[2:]:
+        assert line.startswith('tracker_stage_seconds_'), (
+            'Значения меток должны экранироваться.'
+        )
+
+
+def test_profile_window():
+    with Instrumentation(profile_window=10) as metrics:
+        run_packages()
+        run_packages()
+    assert 'show_training_info' in metrics.profile_report()
@@ -0,0 +1,112 @@
+import gzip
+import importlib.util
+import io
+import threading
+
+import pytest
+
+import homework
+import output
+import stream
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def messages(count):
+    infos = [homework.read_package(*package).show_training_info()
+             for package in PACKAGES]
+    return [infos[index % len(infos)] for index in range(count)]
+
+
+class CountingSink(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.threads = set()
+
+    def write(self, text):
+        self.writes += 1
+        self.threads.add(threading.get_ident())
+        return super().write(text)
+
+
+@pytest.mark.parametrize('background', [False, True])
+def test_buffered_writer_matches_print(background):
+    infos = messages(1000)
+    expected = ''.join(info.get_message() + '\n' for info in infos)
+    sink = CountingSink()
+    with output.BufferedWriter(sink, buffer_size=10_000,
+                               background=background) as writer:
+        writer.write_messages(infos)
+    assert sink.getvalue() == expected
+    assert sink.writes < len(expected) // 10_000 + 2, (
+        '`BufferedWriter` должен писать в приёмник крупными блоками.'
+    )
+    assert (threading.get_ident() not in sink.threads) == background
+
+
+def test_flush_and_close():
+    sink = CountingSink()
+    writer = output.BufferedWriter(sink, background=True)
+    writer.write('первая строка\n')
+    assert sink.getvalue() == ''
+    writer.flush()
+    assert sink.getvalue() == 'первая строка\n'
+    writer.close()
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write('после закрытия\n')
+        writer.flush()
+    assert not sink.closed, 'Приёмник закрывает тот, кто его открыл.'
+
+
+def test_background_error_is_raised():
+    class BrokenSink(io.StringIO):
+        def write(self, text):
+            raise OSError('диск заполнен')
+
+    writer = output.BufferedWriter(BrokenSink(), buffer_size=1,
+                                   background=True)
+    writer.write('строка\n')
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()
+
+
+def test_rotating_gzip_file(tmp_path):
+    path = tmp_path / 'result.log.gz'
+    with output.open_output(path, 'gzip', max_bytes=100,
+                            backup_count=2) as sink:
+        for number in range(5):
+            sink.write(f'{number}' * 60 + '\n')
+    assert sorted(item.name for item in tmp_path.iterdir()) == [
+        'result.log.gz', 'result.log.gz.1', 'result.log.gz.2']
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        assert file.read() == '4' * 60 + '\n'
+    with gzip.open(tmp_path / 'result.log.gz.2', 'rt',
+                   encoding='utf-8') as file:
+        assert file.read() == '0' * 60 + '\n' + '1' * 60 + '\n'
+
+
+def test_zstd_requires_package(tmp_path):
+    if importlib.util.find_spec('zstandard') is None:
+        with pytest.raises(RuntimeError):
+            output.open_text(tmp_path / 'result.zst', 'zstd')
+    else:
+        with output.open_text(tmp_path / 'result.zst', 'zstd') as file:
+            file.write('текст\n')
+
+
+def test_cli_gzip_background(tmp_path):
+    source = tmp_path / 'packages.csv'
+    source.write_text('RUN,15000,1,75\n' * 3, encoding='utf-8')
+    target = tmp_path / 'result.txt.gz'
+    stream.main([str(source), '-o', str(target), '--input-format', 'csv',
+                 '--compression', 'gzip', '--background-writer'])
+    info = homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    with gzip.open(target, 'rt', encoding='utf-8') as file:
+        assert file.read() == (info.get_message() + '\n') * 3
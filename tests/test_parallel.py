@@ -0,0 +1,76 @@
+import io
+import multiprocessing
+from collections import Counter
+
+import pytest
+
+import homework
+import parallel
+import stream
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+] * 7
+
+
+def test_compute_parallel_keeps_order():
+    expected = list(stream.compute(PACKAGES))
+    result = list(parallel.compute_parallel(PACKAGES, workers=2,
+                                            chunk_size=3))
+    assert result == expected, (
+        'Параллельный расчёт должен совпадать с последовательным '
+        'и сохранять порядок пакетов.'
+    )
+
+
+def test_process_with_workers():
+    sequential, pooled = io.StringIO(), io.StringIO()
+    stream.process(PACKAGES, sequential, chunk_size=4)
+    stream.process(PACKAGES, pooled, chunk_size=4, workers=2)
+    assert pooled.getvalue() == sequential.getvalue()
+
+
+def test_workers_see_runtime_coefficients(monkeypatch):
+    monkeypatch.setattr(homework.Running,
+                        'CALORIES_MEAN_SPEED_MULTIPLIER', 20)
+    expected = list(stream.compute(PACKAGES))
+    result = list(parallel.compute_parallel(
+        PACKAGES, workers=2, chunk_size=8,
+        mp_context=multiprocessing.get_context('spawn')))
+    assert result == expected, (
+        'Исполнители, запущенные через spawn, должны считать '
+        'с изменёнными в родительском процессе коэффициентами.'
+    )
+
+
+def test_compute_parallel_with_profile():
+    profile = homework.Profile('partner', {
+        'RUN': {'CALORIES_MEAN_SPEED_MULTIPLIER': 20},
+        'SWM': {'COEF_1': 1.5},
+    })
+    expected = [homework.read_package(*package, profile).show_training_info()
+                for package in PACKAGES]
+    result = list(parallel.compute_parallel(PACKAGES, workers=2,
+                                            chunk_size=4, profile=profile))
+    assert result == expected
+    assert result != list(stream.compute(PACKAGES))
+
+
+def test_unknown_codes_follow_parent_policy(monkeypatch):
+    packages = [*PACKAGES[:3], ('XXX', [1, 1, 1]), *PACKAGES[3:5]]
+    monkeypatch.setattr(homework.registry, 'policy', 'count')
+    monkeypatch.setattr(homework.registry, 'unknown', Counter())
+    result = list(parallel.compute_parallel(packages, workers=2,
+                                            chunk_size=2))
+    assert result == list(stream.compute(PACKAGES[:5]))
+    assert homework.registry.unknown == {'XXX': 1}, (
+        'Неизвестные коды должны учитываться в реестре '
+        'родительского процесса.'
+    )
+    monkeypatch.setattr(homework.registry, 'policy', 'raise')
+    with pytest.raises(ValueError):
+        list(parallel.compute_parallel(packages, workers=2, chunk_size=2))
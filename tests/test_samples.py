@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import homework
+import samples
+
+STEPS = np.random.default_rng(7).integers(0, 4, 3600)
+
+
+def test_compute_samples_matches_read_package():
+    result, info = samples.compute_samples('RUN', action=STEPS, weight=75)
+    expected = homework.read_package(
+        'RUN', [int(STEPS.sum()), 1.0, 75]).show_training_info()
+    assert info == expected, (
+        'Расчёт по отсчётам должен совпадать с расчётом по сумме отсчётов.'
+    )
+    assert len(result) == len(STEPS)
+    assert result.distance[-1] == expected.distance
+    assert np.all(np.diff(result.distance) >= 0)
+
+
+def test_walking_and_swimming_samples():
+    _, info = samples.compute_samples(
+        'WLK', interval=2.0, action=STEPS[:1800], weight=75, height=180)
+    assert info == homework.read_package(
+        'WLK', [int(STEPS[:1800].sum()), 1.0, 75, 180]).show_training_info()
+
+    laps = np.zeros(1800)
+    laps[44::45] = 1
+    result, info = samples.compute_samples(
+        'SWM', action=np.ones(1800), count_pool=laps,
+        weight=80, length_pool=25)
+    assert info == homework.read_package(
+        'SWM', [1800, 0.5, 80, 25, 40]).show_training_info()
+    assert result.splits.tolist() == pytest.approx([45 / 3600] * 40), (
+        'Для плавания отрезки считаются по бассейнам.'
+    )
+
+
+def test_kilometre_splits():
+    steps = np.full(3600, 2)
+    result, info = samples.compute_samples('RUN', action=steps, weight=75)
+    metres_per_second = 2 * homework.Running.LEN_STEP
+    assert len(result.splits) == int(info.distance)
+    assert result.splits[0] * 3600 == np.ceil(1000 / metres_per_second)
+    assert sum(result.splits) <= info.duration
+
+
+@pytest.mark.parametrize('parts', [1, 7, 3600])
+def test_incremental_session_matches_full(parts):
+    full, expected = samples.compute_samples('RUN', action=STEPS, weight=75)
+    session = samples.SampleSession('RUN', weight=75)
+    curves = [session.update(action=chunk)
+              for chunk in np.array_split(STEPS, parts)]
+    assert session.show_training_info() == expected
+    assert session.splits == full.splits.tolist()
+    assert np.concatenate([curve.calories for curve in curves]).tolist() == (
+        full.calories.tolist()), (
+        'Обновление по частям не должно менять накопленные показатели.'
+    )
+
+
+def test_session_rejects_bad_input():
+    with pytest.raises(ValueError):
+        samples.SampleSession('XXX', weight=75)
+    with pytest.raises(TypeError):
+        samples.SampleSession('WLK', weight=75)
+    session = samples.SampleSession('SWM', weight=80, length_pool=25)
+    with pytest.raises(TypeError):
+        session.update(action=[1, 2])
+    with pytest.raises(ValueError):
+        session.update(action=[1, 2], count_pool=[1])
+    assert session.show_training_info().duration == 0
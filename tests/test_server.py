@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import homework
+import server
+from server import TrackerServer
+
+PACKAGES = [
+    {'workout_type': 'SWM', 'data': [720, 1, 80, 25, 40], 'id': 1},
+    {'workout_type': 'XXX', 'data': [1, 1, 1], 'id': 2},
+    {'workout_type': 'RUN', 'data': [15000, 1], 'id': 3},
+    {'workout_type': 'WLK', 'data': [9000, 1, 75, 180], 'id': 4},
+]
+
+
+async def exchange(server, lines, path=None):
+    if path is None:
+        host, port = server.address[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(b''.join(lines))
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in lines]
+    writer.close()
+    return responses
+
+
+def test_responses_in_order():
+    async def scenario():
+        server = TrackerServer(window=0.01)
+        await server.start()
+        lines = [json.dumps(package).encode() + b'\n'
+                 for package in PACKAGES]
+        responses = await exchange(server, lines)
+        await server.stop()
+        return server, responses
+
+    server, responses = asyncio.run(scenario())
+    assert [response.get('id') for response in responses] == [1, None,
+                                                              None, 4]
+    assert 'error' in responses[1] and 'error' in responses[2], (
+        'На некорректные пакеты сервер должен отвечать ошибкой.'
+    )
+    expected = homework.read_package('SWM', [720, 1, 80, 25, 40])
+    assert responses[0]['message'] == expected.show_training_info(
+    ).get_message()
+    assert server.batches == 1, (
+        'Пакеты, пришедшие в одно окно, должны считаться одним расчётом.'
+    )
+
+
+def test_unix_socket_and_backpressure(tmp_path):
+    path = str(tmp_path / 'tracker.sock')
+
+    async def scenario():
+        server = TrackerServer(window=0, max_batch=2, max_in_flight=2)
+        await server.start(path=path)
+        lines = [b'["RUN", [15000, 1, 75]]\n'] * 10
+        responses = await exchange(server, lines, path)
+        await server.stop()
+        return server, responses
+
+    server, responses = asyncio.run(scenario())
+    assert len(responses) == 10
+    assert all(response['training_type'] == 'Running'
+               for response in responses)
+    assert server.packages == 10
+
+
+def test_stop_finishes_accepted_packages():
+    async def scenario():
+        server = TrackerServer(window=0.05)
+        await server.start()
+        host, port = server.address[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'["RUN", [15000, 1, 75]]\n')
+        await writer.drain()
+        await asyncio.sleep(0.01)
+        await server.stop()
+        response = await reader.readline()
+        writer.close()
+        return response
+
+    assert json.loads(asyncio.run(scenario()))['training_type'] == 'Running'
+
+
+async def run_clients(server, lines):
+    await server.start()
+    responses = await asyncio.gather(*(
+        exchange(server, [line]) for line in lines))
+    await server.stop()
+    return [response for response, in responses]
+
+
+def test_bad_package_does_not_fail_window():
+    lines = [b'["RUN", ["x", 1, 75]]\n',
+             b'{"workout_type": "RUN", "data": [15000, 1, 75], "id": 7}\n',
+             b'["WLK", [9000, 0, 75, 180]]\n',
+             b'["SWM", [720, 1, true, 25, 40]]\n']
+    responses = asyncio.run(run_clients(TrackerServer(window=0.05), lines))
+    assert 'error' in responses[0]
+    assert responses[1]['id'] == 7
+    assert responses[1]['message'] == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info().get_message(), (
+        'Ошибка в одном пакете не должна мешать остальным пакетам окна.'
+    )
+    assert 'duration' in responses[2]['error']
+    assert 'weight' in responses[3]['error']
+
+
+def test_failed_batch_falls_back_to_packages(monkeypatch):
+    def broken(packages):
+        raise RuntimeError('сбой пакетного расчёта')
+
+    monkeypatch.setattr(server, 'compute_batch', broken)
+    lines = [b'["RUN", [15000, 1, 75]]\n',
+             b'["RUN", [1e308, 1e-300, 75]]\n']
+    responses = asyncio.run(run_clients(TrackerServer(window=0.05), lines))
+    assert responses[0]['training_type'] == 'Running'
+    assert 'error' in responses[1], (
+        'Бесконечные показатели не должны попадать в ответ JSON.'
+    )
@@ -0,0 +1,96 @@
+import threading
+from collections import Counter
+
+import pytest
+
+import homework
+from service import ComputeService
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+def expected(workout_type, data, profile=None):
+    return homework.read_package(workout_type, data,
+                                 profile).show_training_info()
+
+
+def test_results_from_many_threads():
+    futures = {}
+
+    def submit(number):
+        futures[number] = [service.submit(*package)
+                           for package in PACKAGES * 50]
+
+    with ComputeService(max_batch=64, max_wait=0.01) as service:
+        threads = [threading.Thread(target=submit, args=(number,))
+                   for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for results in futures.values():
+            assert [future.result(5) for future in results] == [
+                expected(*package) for package in PACKAGES * 50]
+        metrics = service.metrics()
+    assert metrics['packages'] == 8 * 50 * len(PACKAGES)
+    assert metrics['batches'] < metrics['packages'], (
+        'Пакеты из разных потоков должны собираться в пачки.'
+    )
+    assert 0 < metrics['fill_ratio'] <= 1
+    assert metrics['peak_queue_depth'] >= 1
+
+
+def test_max_wait_flushes_partial_batch():
+    with ComputeService(max_batch=1000, max_wait=0.001) as service:
+        assert service.compute('RUN', [15000, 1, 75], timeout=5) == (
+            expected('RUN', [15000, 1, 75]))
+        assert service.fill_ratio == pytest.approx(0.001)
+        assert service.queue_depth == 0
+
+
+def test_profiles_and_errors(monkeypatch):
+    profile = homework.Profile(
+        'partner', {'RUN': {'CALORIES_MEAN_SPEED_SHIFT': 1.0}})
+    monkeypatch.setattr(homework.registry, 'policy', 'count')
+    monkeypatch.setattr(homework.registry, 'unknown', Counter())
+    with ComputeService() as service:
+        assert service.compute('RUN', [15000, 1, 75], profile) == (
+            expected('RUN', [15000, 1, 75], profile))
+        assert service.compute('XXX', [1]) is None
+        assert homework.registry.unknown['XXX'] == 1
+        with pytest.raises(ValueError):
+            service.compute('RUN', [1, 2])
+        bad = service.submit('RUN', [1, 'x', 75])
+        good = service.submit('RUN', [15000, 1, 75])
+        assert isinstance(bad.exception(5), TypeError)
+        assert good.result(5) == expected('RUN', [15000, 1, 75]), (
+            'Ошибка в одном пакете не должна ломать остальные в пачке.'
+        )
+
+
+def test_invalid_values_fail_like_read_package(recwarn):
+    with ComputeService(max_batch=8, max_wait=0.05) as service:
+        bad = service.submit('RUN', [15000, 0, 75])
+        good = service.submit('RUN', [15000, 1, 75])
+        assert isinstance(bad.exception(5), ZeroDivisionError), (
+            'Пакет, на котором падает `read_package`, '
+            'должен получить ошибку, а не бесконечность.'
+        )
+        assert good.result(5) == expected('RUN', [15000, 1, 75])
+    assert not [warning for warning in recwarn
+                if issubclass(warning.category, RuntimeWarning)]
+
+
+def test_close_finishes_accepted_packages():
+    service = ComputeService(max_batch=8, max_wait=1)
+    futures = [service.submit(*package) for package in PACKAGES]
+    service.close()
+    assert [future.result(0) for future in futures] == [
+        expected(*package) for package in PACKAGES]
+    with pytest.raises(RuntimeError):
+        service.submit(*PACKAGES[0])
@@ -0,0 +1,111 @@
+import json
+from collections import Counter
+from datetime import date
+
+import numpy as np
+import pytest
+
+import batch
+import homework
+from sketches import HeavyHitters, QuantileSketch, SessionStats
+
+QUANTILES = np.array([0.01, 0.5, 0.9, 0.99])
+VALUES = np.random.default_rng(3).lognormal(size=200_000)
+
+
+def rank_error(sketch, values):
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(QUANTILES))
+    return np.abs(ranks / len(values) - QUANTILES).max()
+
+
+@pytest.mark.parametrize('k', [50, 200, 1000])
+def test_quantile_accuracy_and_memory(k):
+    sketch = QuantileSketch(k, seed=0)
+    for chunk in np.array_split(VALUES, 37):
+        sketch.update(chunk)
+    assert len(sketch) == len(VALUES)
+    assert rank_error(sketch, VALUES) < 1.7 / k, (
+        'Ошибка квантилей по рангу должна быть порядка 1.7 / k.'
+    )
+    assert sum(map(len, sketch.levels)) <= 3 * k + 64
+    assert sketch.quantile(0) == VALUES.min()
+    assert sketch.quantile(1) == VALUES.max()
+
+
+def test_quantile_add_merge_and_serialize():
+    parts = [QuantileSketch(200, seed=number) for number in range(4)]
+    for sketch, chunk in zip(parts, np.array_split(VALUES, 4)):
+        for value in chunk[:1000].tolist():
+            sketch.add(value)
+        sketch.update(chunk[1000:])
+    merged = QuantileSketch.from_dict(json.loads(json.dumps(
+        parts[0].to_dict())))
+    for sketch in parts[1:]:
+        merged.merge(QuantileSketch.from_dict(sketch.to_dict()))
+    assert len(merged) == len(VALUES)
+    assert rank_error(merged, VALUES) < 1.7 / 200
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(100))
+    with pytest.raises(ValueError):
+        QuantileSketch().quantile(0.5)
+
+
+def test_heavy_hitters_find_top_keys():
+    keys = np.random.default_rng(5).zipf(1.3, 100_000).tolist()
+    expected = [key for key, _ in Counter(keys).most_common(5)]
+    sketch = HeavyHitters(100)
+    for key in keys:
+        sketch.add(key)
+    assert [key for key, _, _ in sketch.top(5)] == expected
+    for key, value, error in sketch.top(100):
+        assert value - error <= keys.count(key) <= value, (
+            'Space-Saving должен давать оценку суммы сверху с известной '
+            'ошибкой.'
+        )
+
+    left, right = HeavyHitters(100), HeavyHitters(100)
+    left.update(keys[:50_000])
+    right.update(keys[50_000:])
+    left.merge(HeavyHitters.from_dict(json.loads(json.dumps(
+        right.to_dict()))))
+    assert [key for key, _, _ in left.top(5)] == expected
+    assert left.total == len(keys)
+    assert len(left) <= 100
+
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+def test_session_stats_batch_matches_messages():
+    users = ['ann', 'bob', 'ann', 'bob']
+    days = [date(2024, 1, 29), date(2024, 1, 30),
+            date(2024, 2, 1), date(2024, 2, 5)]
+    from_messages = SessionStats()
+    for (workout_type, data), user, day in zip(PACKAGES, users, days):
+        info = homework.read_package(workout_type, data).show_training_info()
+        from_messages.add(info, user, day)
+    from_batch = SessionStats()
+    from_batch.add_batch(batch.compute_batch(PACKAGES), users, days)
+
+    for stats in (from_messages, from_batch):
+        assert stats.quantile('Running', 'speed', 0.5) == pytest.approx(
+            0.0653, abs=1e-3)
+        assert stats.top_users('2024-W05') == [
+            ('bob', pytest.approx(9.75), 0.0),
+            ('ann', pytest.approx(0.9936 + 5.85), 0.0)]
+        assert stats.top_users(date(2024, 2, 5)) == [
+            ('bob', pytest.approx(0.7839), 0.0)]
+
+    restored = SessionStats.from_dict(json.loads(json.dumps(
+        from_batch.to_dict())))
+    restored.merge(from_messages)
+    assert len(restored.quantiles['Running', 'calories']) == 4
+    assert restored.top_users('2024-W05')[0] == (
+        'bob', pytest.approx(19.5), 0.0)
+    with pytest.raises(KeyError):
+        restored.quantile('Rowing', 'speed')
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+from conftest import BASE_DIR
+
+import homework
+
+IMPORT_BUDGET_MS = 100
+HEAVY_MODULES = ('numpy', 'asyncio', 'mmap', 'multiprocessing',
+                 'concurrent.futures', 'cProfile', 'batch', 'storage')
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=BASE_DIR,
+                          capture_output=True, text=True, check=True)
+
+
+def import_time_ms() -> float:
+    """Получить суммарное время импорта homework по -X importtime."""
+    stderr = run_python('-X', 'importtime', '-c', 'import homework').stderr
+    for line in stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in
+                                  line.replace(':', '|', 1).split('|'))
+        if name == 'homework':
+            return int(cumulative) / 1000
+    raise AssertionError('В выводе -X importtime нет модуля homework.')
+
+
+def test_import_time_budget():
+    best = min(import_time_ms() for _ in range(3))
+    assert best < IMPORT_BUDGET_MS, (
+        f'Импорт `homework` занимает {best:.1f} мс, '
+        f'бюджет — {IMPORT_BUDGET_MS} мс.'
+    )
+
+
+def test_simple_path_skips_heavy_modules():
+    code = ('import sys, homework\n'
+            'homework.main(homework.read_package("RUN", [15000, 1, 75]))\n'
+            f'print(*(name for name in {HEAVY_MODULES!r} '
+            'if name in sys.modules))\n')
+    output = run_python('-c', code).stdout.splitlines()
+    assert output[0].startswith('Тип тренировки: Running;')
+    assert output[1] == '', (
+        f'Расчёт одного пакета не должен импортировать {output[1]}.'
+    )
+
+
+def test_lazy_attributes():
+    import batch
+    assert homework.compute_batch is batch.compute_batch
+    assert 'TrainingTable' in dir(homework)
+    with pytest.raises(AttributeError):
+        homework.missing
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+import homework
+from storage import StorageReader, StorageWriter
+
+RUNS = [[15000, 1, 75], [1206, 12, 6]]
+SWIMS = [[720, 1, 80, 25, 40]]
+
+
+def write_history(path):
+    with StorageWriter(path) as writer:
+        writer.write('RUN', RUNS, users=[1, 2], timestamps=[100, 200])
+        writer.write('SWM', SWIMS, users=[1], timestamps=[300])
+        writer.write('RUN', [[9000, 1, 75]], users=[1], timestamps=[400])
+
+
+def test_roundtrip(tmp_path):
+    path = tmp_path / 'history.ftrk'
+    write_history(path)
+    reader = StorageReader(path)
+    assert len(reader) == 4
+    assert [group.training_type for group in reader.groups] == [
+        'Running', 'Swimming', 'Running']
+    first = reader.groups[0]
+    assert first.names == ['user', 'timestamp', 'action', 'duration',
+                           'weight', 'distance', 'speed', 'calories']
+    for index, data in enumerate(RUNS):
+        info = homework.read_package('RUN', data).show_training_info()
+        assert first.column('calories')[index] == info.calories
+        assert first.column('speed')[index] == info.speed
+    swim = reader.groups[1]
+    assert swim.column('count_pool')[0] == 40
+    assert swim.column('user').dtype == np.dtype('<u8')
+    assert list(reader.column('RUN', 'timestamp')) == [100, 200, 400]
+    assert len(reader.column('WLK', 'calories')) == 0
+    del first, swim
+    reader.close()
+
+
+def test_columns_are_zero_copy(tmp_path):
+    path = tmp_path / 'history.ftrk'
+    write_history(path)
+    with StorageReader(path) as reader:
+        column = reader.groups[0].column('weight')
+        assert not column.flags.owndata, (
+            'Столбцы должны читаться поверх mmap без копирования.'
+        )
+        assert not column.flags.writeable
+        assert column.ctypes.data % 8 == 0
+        del column
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'history.ftrk'
+    path.write_bytes(b'not a history file at all')
+    with pytest.raises(ValueError):
+        StorageReader(path)
+
+
+def test_rejects_mismatched_columns(tmp_path):
+    with StorageWriter(tmp_path / 'history.ftrk') as writer:
+        with pytest.raises(ValueError):
+            writer.write('RUN', RUNS, users=[1], timestamps=[100, 200])
@@ -0,0 +1,72 @@
+import io
+import json
+
+import pytest
+from conftest import Capturing
+
+import homework
+import stream
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+]
+
+
+def expected_messages():
+    with Capturing() as output:
+        for workout_type, data in PACKAGES:
+            homework.main(homework.read_package(workout_type, data))
+    return output
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 1000])
+def test_process_jsonl_matches_main(chunk_size):
+    lines = [json.dumps({'workout_type': workout_type, 'data': data})
+             for workout_type, data in PACKAGES]
+    sink = io.StringIO()
+    count = stream.process(stream.read_jsonl(lines), sink,
+                           chunk_size=chunk_size)
+    assert count == len(PACKAGES)
+    assert sink.getvalue().splitlines() == expected_messages(), (
+        'Потоковая обработка должна печатать те же сообщения, что и `main`.'
+    )
+
+
+def test_read_csv():
+    lines = ['SWM,720,1,80,25,40\n', '\n', 'WLK,9000,1.5,75,180\n']
+    assert list(stream.read_csv(lines)) == [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('WLK', [9000, 1.5, 75, 180]),
+    ]
+
+
+def test_chunked_is_lazy():
+    def packages():
+        yield from PACKAGES
+        raise AssertionError('Поток прочитан дальше нужного.')
+    chunks = stream.chunked(packages(), 2)
+    assert next(chunks) == PACKAGES[:2]
+
+
+def test_cli_jsonl_output(tmp_path):
+    source = tmp_path / 'packages.csv'
+    source.write_text('RUN,15000,1,75\n', encoding='utf-8')
+    target = tmp_path / 'result.jsonl'
+    stream.main([str(source), '-o', str(target),
+                 '--input-format', 'csv', '--output-format', 'jsonl',
+                 '--chunk-size', '10'])
+    record = json.loads(target.read_text(encoding='utf-8'))
+    info = homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    assert record == {'training_type': 'Running',
+                      'duration': info.duration,
+                      'distance': info.distance,
+                      'speed': info.speed,
+                      'calories': info.calories}
+
+
+def test_process_unknown_workout(monkeypatch):
+    monkeypatch.setattr(homework.registry, 'policy', 'raise')
+    with pytest.raises(ValueError):
+        stream.process([('XXX', [1, 1, 1])], io.StringIO())
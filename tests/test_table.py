@@ -0,0 +1,88 @@
+import pytest
+
+import homework
+import table
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def test_info_message_is_slotted():
+    info = homework.InfoMessage('Running', 1, 2, 3, 4)
+    assert not hasattr(info, '__dict__'), (
+        '`InfoMessage` не должен хранить поля в `__dict__`.'
+    )
+    assert 'message' not in vars(homework.InfoMessage)['__slots__']
+
+
+def test_rows_keep_training_attributes():
+    trainings = table.TrainingTable(PACKAGES)
+    assert len(trainings) == len(PACKAGES)
+    for row, (workout_type, data) in zip(trainings, PACKAGES):
+        training = homework.read_package(workout_type, data)
+        assert row.workout_type == workout_type
+        assert row.data == data
+        for name in ('action', 'duration', 'weiht'):
+            assert getattr(row, name) == getattr(training, name)
+        assert row.show_training_info() == training.show_training_info()
+        assert type(row.training()) is type(training)
+    assert trainings[-1].height == 180
+    assert trainings[0].count_pool == 40
+
+
+def test_compute_matches_rows():
+    trainings = table.TrainingTable(PACKAGES)
+    result = trainings.compute()
+    assert list(result.messages()) == [
+        row.show_training_info() for row in trainings
+    ]
+
+
+def test_column_is_zero_copy():
+    trainings = table.TrainingTable(PACKAGES)
+    column = trainings.column('weiht')
+    trainings.columns['weiht'][0] = 99
+    assert column[0] == 99
+
+
+@pytest.mark.parametrize('package', [
+    ('XXX', [1, 1, 1]),
+    ('RUN', [1, 1]),
+])
+def test_append_rejects_bad_package(package):
+    with pytest.raises(ValueError):
+        table.TrainingTable([package])
+
+
+def test_table_follows_registry(monkeypatch):
+    registry = homework.registry
+    for name in ('types', 'fields', 'arity'):
+        monkeypatch.setattr(registry, name, dict(getattr(registry, name)))
+    trainings = table.TrainingTable(PACKAGES)
+
+    @registry.register('CYC')
+    class Cycling(homework.Training):
+        def __init__(self, action, duration, weight, cadence):
+            super().__init__(action, duration, weight)
+            self.cadence = cadence
+
+        def get_spent_calories(self):
+            return self.cadence * self.weiht * self.duration
+
+    trainings.append('CYC', [3000, 2, 70, 90])
+    row = trainings[-1]
+    assert row.workout_type == 'CYC'
+    assert row.data == [3000, 2, 70, 90]
+    assert row.cadence == 90
+    assert trainings[0].cadence == 0
+    expected = [homework.read_package(*package).show_training_info()
+                for package in [*PACKAGES, ('CYC', [3000, 2, 70, 90])]]
+    assert list(trainings.compute().messages()) == expected
+    assert [row.show_training_info() for row in trainings] == expected, (
+        'Строка таблицы должна считать и типы без ядра столбцов.'
+    )
+    with pytest.raises(AttributeError):
+        row.gears
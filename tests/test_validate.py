@@ -0,0 +1,138 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+import batch
+import stream
+import validate
+
+GOOD = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+]
+
+
+@pytest.mark.parametrize('package, reason, field', [
+    (('XXX', [1, 1, 1]), validate.UNKNOWN_TYPE, None),
+    (('RUN', [15000, 1]), validate.ARITY, None),
+    (('RUN', 15000), validate.ARITY, None),
+    (('RUN', [15000, '1', 75]), validate.TYPE, 'duration'),
+    (('RUN', [15000, True, 75]), validate.TYPE, 'duration'),
+    (('RUN', [15000, 0, 75]), validate.RANGE, 'duration'),
+    (('RUN', [-1, 0, 75]), validate.RANGE, 'action'),
+    (('RUN', [15000, 1, float('nan')]), validate.RANGE, 'weight'),
+    (('RUN', [10 ** 400, 1, 75]), validate.RANGE, 'action'),
+    (('WLK', [9000, 1, 75, 0]), validate.RANGE, 'height'),
+    (('SWM', [720, 1, 80, 0, 40]), validate.RANGE, 'length_pool'),
+])
+def test_validate_rejects(package, reason, field):
+    rejects = []
+    valid = validate.validate([*GOOD, package], rejects.append, start=10)
+    assert valid == GOOD, (
+        'Корректные пакеты должны проходить проверку в исходном порядке.'
+    )
+    assert rejects == [validate.Reject(13, *package, reason, field)], (
+        'Некорректный пакет должен уйти в dead-letter с кодом причины.'
+    )
+
+
+def test_validate_keeps_order_and_accepts_numpy_numbers():
+    packages = [('RUN', [np.int64(15000), np.float64(1), 75]),
+                ('RUN', [1, 0, 1]),
+                *GOOD]
+    rejects = []
+    assert validate.validate(packages, rejects.append) == [
+        packages[0], *GOOD]
+    assert [reject.position for reject in rejects] == [1]
+
+
+def test_validated_packages_compute_without_errors():
+    packages = [*GOOD, ('RUN', [1, 0, 1]), ('WLK', [1, 1, 1, 0])] * 100
+    valid = validate.validate(packages, validate.DeadLetter())
+    with np.errstate(all='raise'):
+        result = batch.compute_batch(valid)
+    assert len(result) == len(GOOD) * 100
+
+
+def test_dead_letter_sink():
+    buffer = io.StringIO()
+    dead_letter = validate.DeadLetter(buffer)
+    packages = [('RUN', [1, 0, 1]), ('XXX', [1]), ('RUN', [1, 0, 1])]
+    validate.validate(packages, dead_letter)
+    assert dead_letter.reasons == {validate.RANGE: 2,
+                                   validate.UNKNOWN_TYPE: 1}
+    record = json.loads(buffer.getvalue().splitlines()[0])
+    assert record == {'position': 0, 'workout_type': 'RUN',
+                      'data': [1, 0, 1], 'reason': validate.RANGE,
+                      'field': 'duration'}
+
+
+def test_process_with_dead_letter():
+    packages = [('RUN', [1, 0, 1]), *GOOD, ('RUN', ['x', 1, 1])]
+    dead_letter = validate.DeadLetter()
+    sink = io.StringIO()
+    count = stream.process(packages, sink, chunk_size=2,
+                           dead_letter=dead_letter)
+    assert count == len(GOOD)
+    assert dead_letter.reasons == {validate.RANGE: 1, validate.TYPE: 1}
+
+
+def test_cli_dead_letter(tmp_path):
+    source = tmp_path / 'packages.csv'
+    source.write_text('RUN,15000,1,75\nRUN,abc,1,75\nWLK,9000,1,75,0\n',
+                      encoding='utf-8')
+    target = tmp_path / 'result.txt'
+    rejects = tmp_path / 'rejects.jsonl'
+    stream.main([str(source), '-o', str(target), '--input-format', 'csv',
+                 '--dead-letter', str(rejects)])
+    assert len(target.read_text(encoding='utf-8').splitlines()) == 1
+    records = [json.loads(line) for line in
+               rejects.read_text(encoding='utf-8').splitlines()]
+    assert [(record['position'], record['reason'], record['field'])
+            for record in records] == [(1, 'type', 'action'),
+                                       (2, 'range', 'height')]
+
+
+@pytest.mark.parametrize('package', [
+    ('RUN',),
+    None,
+    ('RUN', [15000, 1, 75], 'extra'),
+    42,
+    validate.Malformed('{"workout_type": "RUN"'),
+])
+def test_validate_rejects_malformed(package):
+    rejects = []
+    assert validate.validate([*GOOD, package], rejects.append) == GOOD
+    assert [(reject.position, reject.reason) for reject in rejects] == [
+        (3, validate.MALFORMED)], (
+        'Пакет неверной формы должен уйти в dead-letter, а не вызвать '
+        'исключение.'
+    )
+    if isinstance(package, validate.Malformed):
+        assert rejects[0].data == package.record
+
+
+def test_cli_dead_letter_parse_errors(tmp_path):
+    source = tmp_path / 'packages.jsonl'
+    source.write_text('["RUN", [15000, 1, 75]]\n'
+                      'not json\n'
+                      '{"workout_type": "RUN"}\n'
+                      '["RUN"]\n'
+                      '{"workout_type": "WLK", "data": [9000, 1, 75, 180]}\n',
+                      encoding='utf-8')
+    target = tmp_path / 'result.txt'
+    rejects = tmp_path / 'rejects.jsonl'
+    stream.main([str(source), '-o', str(target),
+                 '--dead-letter', str(rejects)])
+    assert len(target.read_text(encoding='utf-8').splitlines()) == 2
+    records = [json.loads(line) for line in
+               rejects.read_text(encoding='utf-8').splitlines()]
+    assert [(record['position'], record['reason'])
+            for record in records] == [(1, 'malformed'), (2, 'malformed'),
+                                       (3, 'malformed')]
+    assert records[0]['data'] == 'not json'
+    with pytest.raises(json.JSONDecodeError):
+        list(stream.read_jsonl(['not json']))
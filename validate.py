@@ -0,0 +1,184 @@
+import json
+from collections import Counter
+from itertools import chain
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, NamedTuple,
+                    Optional, Sequence, TextIO, Tuple)
+
+import numpy as np
+
+from homework import registry
+
+Package = Tuple[str, Sequence[Any]]
+
+MALFORMED = 'malformed'
+UNKNOWN_TYPE = 'unknown_type'
+ARITY = 'arity'
+TYPE = 'type'
+RANGE = 'range'
+
+NUMBER_TYPES = frozenset({int, float})
+RULES: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'action': lambda values: values >= 0,
+    'duration': lambda values: values > 0,
+    'weight': lambda values: values >= 0,
+    'height': lambda values: values > 0,
+    'length_pool': lambda values: values > 0,
+    'count_pool': lambda values: values >= 0,
+}
+
+
+class Reject(NamedTuple):
+    """Отбракованный пакет с кодом причины и полем, где она найдена."""
+    position: int
+    workout_type: Any
+    data: Any
+    reason: str
+    field: Optional[str] = None
+
+
+class Malformed(NamedTuple):
+    """Запись входа, которую не удалось прочитать как пакет.
+
+    Читатели потока отдают её вместо пакета, когда ошибки разбора
+    нужно отправить в dead-letter: так у записи остаётся позиция.
+    """
+    record: Any
+
+
+class DeadLetter:
+    """Приёмник отбракованных пакетов.
+
+    Считает причины и, если задан buffer, пишет пакеты в него
+    строками JSON.
+    """
+
+    def __init__(self, buffer: Optional[TextIO] = None) -> None:
+        self.buffer = buffer
+        self.reasons: Counter = Counter()
+
+    def __call__(self, reject: Reject) -> None:
+        self.reasons[reject.reason] += 1
+        if self.buffer is not None:
+            self.buffer.write(json.dumps(reject._asdict(),
+                                         ensure_ascii=False, default=repr))
+            self.buffer.write('\n')
+
+
+def is_number(value: Any) -> bool:
+    """Проверить, что значение поля — число, но не bool."""
+    return (isinstance(value, (int, float, np.integer, np.floating))
+            and not isinstance(value, (bool, np.bool_)))
+
+
+def as_float(value: Any) -> float:
+    """Перевести число в float, заменив слишком большие на бесконечность."""
+    try:
+        return float(value)
+    except OverflowError:
+        return float('inf') if value > 0 else float('-inf')
+
+
+def check_columns(workout_type: str, data: np.ndarray) -> np.ndarray:
+    """Найти для каждой строки матрицы первое поле вне допустимых значений.
+
+    Возвращает номера полей; -1 — строка корректна. Все поля должны
+    быть конечными, а поля из RULES — удовлетворять своим правилам.
+    """
+    fields = registry.fields[workout_type]
+    failed = np.full(len(data), -1, dtype=np.intp)
+    for index in reversed(range(len(fields))):
+        column = data[:, index]
+        valid = np.isfinite(column)
+        rule = RULES.get(fields[index])
+        if rule is not None:
+            valid &= rule(column)
+        failed[~valid] = index
+    return failed
+
+
+def check_group(workout_type: str,
+                positions: List[int],
+                rows: List[Sequence[Any]],
+                ) -> Iterator[Tuple[int, str, str]]:
+    """Проверить типы и диапазоны пакетов одного типа тренировки.
+
+    Возвращает позиции некорректных пакетов с причиной и полем.
+    """
+    fields = registry.fields[workout_type]
+    if not set(map(type, chain.from_iterable(rows))) <= NUMBER_TYPES:
+        numeric = []
+        for position, row in zip(positions, rows):
+            field = next((name for name, value in zip(fields, row)
+                          if not is_number(value)), None)
+            if field is None:
+                numeric.append((position, row))
+            else:
+                yield position, TYPE, field
+        positions = [position for position, _ in numeric]
+        rows = [row for _, row in numeric]
+    if not rows:
+        return
+    try:
+        data = np.array(rows, dtype=np.float64)
+    except OverflowError:
+        data = np.array([[as_float(value) for value in row] for row in rows],
+                        dtype=np.float64)
+    failed = check_columns(workout_type, data)
+    for index in np.flatnonzero(failed >= 0).tolist():
+        yield positions[index], RANGE, fields[failed[index]]
+
+
+def make_reject(position: int, package: Any, reason: str,
+                field: Optional[str]) -> Reject:
+    """Собрать запись для dead-letter; пакет неверной формы не разбирается."""
+    if reason != MALFORMED:
+        return Reject(position, *package, reason, field)
+    if isinstance(package, Malformed):
+        return Reject(position, None, package.record, reason)
+    return Reject(position, None, package, reason)
+
+
+def validate(packages: Iterable[Package],
+             reject: Callable[[Reject], None],
+             start: int = 0,
+             ) -> List[Package]:
+    """Отобрать корректные пакеты, отправив остальные в reject.
+
+    Форма, код и длина проверяются для каждого пакета, типы значений —
+    одним проходом по группе пакетов одного типа, диапазоны — по
+    столбцам группы. Порядок пакетов сохраняется; position в Reject
+    считается от start. Исключений нет: всё, что не является парой
+    (код, данные), уходит в reject с причиной MALFORMED.
+    """
+    packages = list(packages)
+    rejects: Dict[int, Tuple[str, Optional[str]]] = {}
+    groups: Dict[str, Tuple[List[int], list]] = {}
+    arities = registry.arity
+    for position, package in enumerate(packages):
+        try:
+            workout_type, data = package
+        except (TypeError, ValueError):
+            rejects[position] = MALFORMED, None
+            continue
+        arity = (arities.get(workout_type)
+                 if isinstance(workout_type, str) else None)
+        if arity is None:
+            rejects[position] = UNKNOWN_TYPE, None
+        elif not isinstance(data, (list, tuple)) or len(data) != arity:
+            rejects[position] = ARITY, None
+        else:
+            positions, rows = groups.setdefault(workout_type, ([], []))
+            positions.append(position)
+            rows.append(data)
+    for workout_type, (positions, rows) in groups.items():
+        for position, reason, field in check_group(workout_type, positions,
+                                                   rows):
+            rejects[position] = reason, field
+
+    if not rejects:
+        return packages
+    for position in sorted(rejects):
+        reject(make_reject(start + position, packages[position],
+                           *rejects[position]))
+    return [package for position, package in enumerate(packages)
+            if position not in rejects]